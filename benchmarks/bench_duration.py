@@ -0,0 +1,46 @@
+'''
+Micro-benchmark of the MPD duration parsing: the former match_duration
+against parse_iso_duration, with and without its cache.
+
+    python benchmarks/bench_duration.py
+'''
+from pathlib import Path
+import re
+import sys
+import timeit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pynoovo.common.duration import parse_iso_duration
+
+VALUES = ['PT634.56S', 'P0Y0M0DT0H3M30.000S', 'PT0H42M10.5S', 'PT1M30S', 'P1DT2H']
+NUMBER = 200000
+
+
+def legacy_match_duration(_duration):
+    if isinstance(_duration, str) is False:
+        return
+
+    duration = re.match(r"PT(\d+)(\.?\d+)S", _duration)
+    if duration is not None:
+        return float(duration.group(1)) if duration else 0.0
+    # P0Y0M0DT0H3M30.000S
+    duration = re.match(r"PT(\d+)H(\d+)M(\d+)(\.?\d+)S",
+                        _duration.replace('0Y0M0D', ''))
+    if duration is not None:
+        _h, _m, _s, _ss = duration.groups()
+        return int(_h) * 60 * 60 + int(_m) * 60 + int(_s) + float("0" + _ss)
+
+
+def bench(name, func):
+    seconds = timeit.timeit(lambda: [func(value) for value in VALUES], number=NUMBER // len(VALUES))
+    print(f'{name:<28}{seconds / NUMBER * 1e9:8.0f} ns/call')
+
+
+if __name__ == '__main__':
+    for value in VALUES:
+        print(f'{value:<24}legacy={legacy_match_duration(value)!s:<10}new={parse_iso_duration(value)}')
+    print()
+    bench('legacy match_duration', legacy_match_duration)
+    bench('parse_iso_duration', parse_iso_duration.__wrapped__)
+    bench('parse_iso_duration (cached)', parse_iso_duration)
@@ -0,0 +1,83 @@
+'''
+Benchmark of the episode duration parsing over a synthetic 5,000 episode
+season: the former per-episode index/slice loop against content_durations,
+with and without durationSecs in the response. The cold runs clear the
+parse_duration cache before each season.
+
+    python benchmarks/bench_episode_durations.py
+'''
+from pathlib import Path
+import random
+import sys
+import timeit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pynoovo.common.duration import content_durations, parse_duration
+
+EPISODES = 5000
+NUMBER = 20
+
+
+def make_season(with_seconds: bool):
+    rng = random.Random(0)
+    episodes = []
+    for _ in range(EPISODES):
+        seconds = rng.randrange(60, 2 * 3600)
+        hours, rest = divmod(seconds, 3600)
+        text = '{}m {}s'.format(rest // 60, rest % 60)
+        if hours > 0:
+            text = '{}h {}'.format(hours, text)
+        episode = {'duration': text}
+        if with_seconds:
+            episode['durationSecs'] = seconds
+        episodes.append(episode)
+    return episodes
+
+
+def legacy_durations(episodes):
+    durations = []
+    for episode in episodes:
+        try:
+            duration_str = episode['duration']
+            duration = 0
+            if 'h' in duration_str:
+                index = duration_str.index('h')
+                value = duration_str[:index]
+                duration_str = duration_str[index+1:]
+                duration += int(value.strip()) * 3600
+            if 'm' in duration_str:
+                index = duration_str.index('m')
+                value = duration_str[:index]
+                duration_str = duration_str[index+1:]
+                duration += int(value.strip()) * 60
+            if 's' in duration_str:
+                index = duration_str.index('s')
+                value = duration_str[:index]
+                duration_str = duration_str[index+1:]
+                duration += int(value.strip())
+            durations.append(duration)
+        except:
+            durations.append(None)
+    return durations
+
+
+def bench(name, func, episodes):
+    seconds = timeit.timeit(lambda: func(episodes), number=NUMBER) / NUMBER
+    print('{:<40}{:8.2f} ms/season'.format(name, seconds * 1e3))
+
+
+if __name__ == '__main__':
+    text_season = make_season(False)
+    seconds_season = make_season(True)
+    assert legacy_durations(text_season) == content_durations(text_season) == content_durations(seconds_season)
+
+    bench('legacy loop', legacy_durations, text_season)
+    bench('content_durations (durationSecs)', content_durations, seconds_season)
+
+    def cold_durations(episodes):
+        parse_duration.cache_clear()
+        return content_durations(episodes)
+
+    bench('content_durations (strings, cold)', cold_durations, text_season)
+    bench('content_durations (strings, cached)', content_durations, text_season)
@@ -0,0 +1,77 @@
+'''
+Benchmark of the response decoding: json.loads(response.text), as the
+clients used to do, against json_backend.loads(response.content) with the
+stdlib and orjson backends. The responses are the anonymized recordings of
+fixtures/ (see record_fixtures.py), or synthetic ones built from the GraphQL
+documents (see bench_query_profiles.py) when there are none. A screen
+response is decoded twice by the former screen parser. Times are the best
+of REPEAT runs.
+
+    python benchmarks/bench_json_decoding.py
+'''
+from pathlib import Path
+import json
+import sys
+import timeit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_query_profiles import make_response
+from pynoovo.common import json_backend
+from pynoovo.lib.graphql.consts import MEDIA_PAYLOADS, SEASON_PAYLOADS
+
+NUMBER = 200
+REPEAT = 5
+FIXTURES = Path(__file__).resolve().parent / 'fixtures'
+
+
+def make_screen():
+    links = [{'linkLabel': 'Écran {}'.format(i), 'internalContent': {
+        'id': 'contentid/axis-screen-{}'.format(i), 'containerType': 'SCREEN'}} for i in range(20)]
+    collections = [{'__typename': 'Grid' if i % 2 else 'Rotator', 'id': 'contentid/axis-collection-{}'.format(i),
+                    'title': 'Collection {}'.format(i), 'config': {'displayTitle': True, 'style': 'POSTER'}}
+                   for i in range(60)]
+    return json.dumps({'data': {'screen': {'secondaryNavigation': {'links': links},
+                                           'collections': collections}}}).encode('utf-8')
+
+
+def load_fixtures():
+    # (name, content, decodes), recorded when available
+    synthetic = {
+        'screen': make_screen,
+        'media-full': lambda: make_response(MEDIA_PAYLOADS['full']),
+        'season-full': lambda: make_response(SEASON_PAYLOADS['full']),
+        'season-playback': lambda: make_response(SEASON_PAYLOADS['playback']),
+    }
+    fixtures = []
+    for name, make in synthetic.items():
+        path = FIXTURES / (name + '.json')
+        if path.is_file():
+            content = path.read_bytes()
+        else:
+            content, name = make(), name + ' *'
+        fixtures.append((name, content, 2 if name.startswith('screen') else 1))
+    return fixtures
+
+
+def bench(func):
+    return min(timeit.repeat(func, number=NUMBER, repeat=REPEAT)) / NUMBER * 1e6
+
+
+if __name__ == '__main__':
+    fixtures = load_fixtures()
+    orjson = json_backend.orjson
+    print('{:<20}{:>10}{:>16}{:>16}{:>16}'.format('response', 'bytes', 'text (former)', 'stdlib bytes', 'orjson bytes'))
+    for name, content, decodes in fixtures:
+        def former():
+            for _ in range(decodes):
+                json.loads(content.decode('utf-8'))
+
+        json_backend.orjson = None
+        stdlib_time = bench(lambda: json_backend.loads(content))
+        json_backend.orjson = orjson
+        orjson_time = bench(lambda: json_backend.loads(content)) if orjson is not None else float('nan')
+        print('{:<20}{:>10,}{:>13.1f} us{:>13.1f} us{:>13.1f} us'.format(
+            name, len(content), bench(former), stdlib_time, orjson_time))
+    if any(name.endswith(' *') for name, _, _ in fixtures):
+        print('* synthetic, run record_fixtures.py to record the responses')
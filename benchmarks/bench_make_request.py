@@ -0,0 +1,112 @@
+'''
+Benchmark of GraphQL._make_request: the former deepcopy of the payload posted
+with json= against the pre-serialized query templates, through a local stub
+server, plus the request body construction alone.
+
+    python benchmarks/bench_make_request.py
+'''
+from copy import deepcopy
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import sys
+import threading
+import time
+import timeit
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pynoovo.lib.graphql.consts import HEADERS, SEASON_PAYLOADS
+from pynoovo.lib.graphql.graphql import GraphQL
+from pynoovo.lib.graphql.templates import SEASON_TEMPLATES
+
+REQUESTS = 2000
+NUMBER = 20000
+RESPONSE = b'{"data":{"axisSeason":{"episodes":[]}}}'
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(RESPONSE)))
+        self.end_headers()
+        self.wfile.write(RESPONSE)
+
+    def log_message(self, *args):
+        pass
+
+
+class LegacyGraphQL(GraphQL):
+
+    def _make_request(self, partial_data, playback_language='FRENCH'):
+        data = self._build_request_data(partial_data, playback_language)
+        with self._request_slots:
+            return self.session.post(url=self.url, headers=HEADERS, json=data)
+
+    def _build_request_data(self, partial_data, playback_language='FRENCH'):
+        data = deepcopy(partial_data)
+        data['variables']['subscriptions'] = self.subscriptions
+        data['variables']['language'] = self.metadata_language
+        data['variables']['playbackLanguage'] = playback_language
+        return data
+
+
+def legacy_request(graphql):
+    payload = deepcopy(SEASON_PAYLOADS['full'])
+    payload['variables']['id'] = 'contentid/axis-season-1234'
+    return graphql._make_request(payload, playback_language='FRENCH')
+
+
+def template_request(graphql):
+    return graphql._make_request(
+        SEASON_TEMPLATES['full'], {'id': 'contentid/axis-season-1234'}, playback_language='FRENCH')
+
+
+def legacy_body(graphql):
+    payload = deepcopy(SEASON_PAYLOADS['full'])
+    payload['variables']['id'] = 'contentid/axis-season-1234'
+    data = graphql._build_request_data(payload)
+    return requests.models.complexjson.dumps(data, allow_nan=False).encode('utf-8')
+
+
+def template_body(graphql):
+    template = SEASON_TEMPLATES['full']
+    data = graphql._build_request_data(template, {'id': 'contentid/axis-season-1234'})
+    return template.body(data['variables'])
+
+
+def bench_requests(name, graphql, func):
+    func(graphql)
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        assert func(graphql).status_code == 200
+    elapsed = time.perf_counter() - start
+    print('{:<30}{:10,.0f} requests/s'.format(name, REQUESTS / elapsed))
+
+
+def bench_body(name, graphql, func):
+    seconds = timeit.timeit(lambda: func(graphql), number=NUMBER) / NUMBER
+    print('{:<30}{:10.1f} us/body ({:,} bytes)'.format(name, seconds * 1e6, len(func(graphql))))
+
+
+if __name__ == '__main__':
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = 'http://127.0.0.1:{}/graphql'.format(server.server_port)
+
+    with requests.Session() as session:
+        legacy = LegacyGraphQL(session, url, '')
+        graphql = GraphQL(session, url, '')
+        bench_body('legacy body', legacy, legacy_body)
+        bench_body('template body', graphql, template_body)
+        bench_requests('legacy _make_request', legacy, legacy_request)
+        bench_requests('template _make_request', graphql, template_request)
+        graphql.persisted_queries = True
+        bench_requests('persisted _make_request', graphql, template_request)
+    server.shutdown()
@@ -0,0 +1,125 @@
+'''
+Benchmark of the AxisMedia/axisSeason query profiles: size of a synthetic
+response shaped after each profile's selection set, and the time spent
+decoding and parsing it.
+
+    python benchmarks/bench_query_profiles.py
+'''
+from pathlib import Path
+import json
+import re
+import sys
+import timeit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pynoovo.common.result_info import SerieResultInfo
+from pynoovo.lib.graphql.consts import MEDIA_PAYLOADS, SEASON_PAYLOADS, QUERY_PROFILES
+from pynoovo.lib.graphql.graphql import GraphQL
+
+NUMBER = 50
+TOKEN = re.compile(r'\.\.\.|[A-Za-z_$][A-Za-z0-9_]*|"[^"]*"|[{}():,!\[\]@=]|\d+')
+
+# Number of elements of the list fields, everything else is an object
+LISTS = {'images': 3, 'items': 5, 'seasons': 5, 'episodes': 50, 'axisPlaybackLanguages': 2,
+         'authConstraints': 2, 'genres': 2, 'cast': 2, 'castMembers': 5, 'relatedCollections': 3,
+         'normalizedRatingCodes': 2}
+SAMPLES = {
+    '__typename': 'AxisContent', 'id': 'contentid/axis-content-1234567', 'axisId': 1234567,
+    'title': 'Un titre assez long pour un épisode', 'summary': 'Résumé ' * 20, 'description': 'Description ' * 35,
+    'url': 'https://images2.9c9media.com/image_asset/2021_1_1_00000000-0000-0000-0000-000000000000_png_1920x1080.jpg',
+    'format': 'THUMBNAIL', 'duration': '22m 10s', 'durationSecs': 1330, 'seasonNumber': 1, 'episodeNumber': 1,
+    'broadcastDate': '2021-01-01T00:00:00Z', 'language': 'FRENCH', 'destinationCode': 'noovo_hub',
+    'packageName': 'noovo', 'mediaType': 'SERIES', 'ratingCodes': ['13+'], 'resourceCodes': ['CTV_NOOVO'],
+    'languages': ['FRENCH'], 'firstAirYear': 2021, 'label': 'Nouveau', 'allowed': True, 'authRequired': True,
+    'userIsSubscribed': False, 'hasConstraintsNow': False,
+}
+
+
+def parse_selection(tokens, i):
+    # tokens[i] is '{', returns the fields and spreads of the selection set
+    selection = []
+    i += 1
+    while tokens[i] != '}':
+        if tokens[i] == '...':
+            selection.append(('...', tokens[i + 1], None))
+            i += 2
+            continue
+        name = tokens[i]
+        i += 1
+        if tokens[i] == ':':
+            name = tokens[i + 1]
+            i += 2
+        while tokens[i] in ('(', '@'):
+            if tokens[i] == '@':
+                i += 2
+                continue
+            depth = 0
+            while True:
+                depth += {'(': 1, ')': -1}.get(tokens[i], 0)
+                i += 1
+                if depth == 0:
+                    break
+        children = None
+        if tokens[i] == '{':
+            children, i = parse_selection(tokens, i)
+        selection.append((name, name, children))
+    return selection, i + 1
+
+
+def parse_document(query):
+    tokens = TOKEN.findall(query)
+    operation, fragments = None, {}
+    i = 0
+    while i < len(tokens):
+        if tokens[i] == 'fragment':
+            name = tokens[i + 1]
+            i = tokens.index('{', i)
+            fragments[name], i = parse_selection(tokens, i)
+        elif tokens[i] == 'query':
+            depth, i = 0, i + 1
+            while not (tokens[i] == '{' and depth == 0):
+                depth += {'(': 1, ')': -1}.get(tokens[i], 0)
+                i += 1
+            operation, i = parse_selection(tokens, i)
+        else:
+            i += 1
+    return operation, fragments
+
+
+def build(selection, fragments):
+    value = {}
+    for name, alias, children in selection:
+        if name == '...':
+            value.update(build(fragments[alias], fragments))
+        elif children is None:
+            value[alias] = SAMPLES.get(name, 'value')
+        elif name in LISTS:
+            value[alias] = [build(children, fragments) for _ in range(LISTS[name])]
+        else:
+            value[alias] = build(children, fragments)
+    return value
+
+
+def make_response(payload):
+    return json.dumps({'data': build(*parse_document(payload['query']))}).encode('utf-8')
+
+
+if __name__ == '__main__':
+    graphql = GraphQL(None, '', '')
+    print('{:<10}{:>14}{:>16}{:>14}{:>16}'.format('profile', 'media bytes', 'media parse', 'season bytes', 'season parse'))
+    for profile in QUERY_PROFILES:
+        media = make_response(MEDIA_PAYLOADS[profile])
+        season = make_response(SEASON_PAYLOADS[profile])
+
+        def parse_media():
+            graphql._parse_serie_infos(json.loads(media)['data']['axisMedia'])
+
+        def parse_season():
+            episodes = json.loads(season)['data']['axisSeason']['episodes']
+            graphql._parse_season_episodes(SerieResultInfo(), episodes, 1, 'fr')
+
+        media_time = timeit.timeit(parse_media, number=NUMBER) / NUMBER
+        season_time = timeit.timeit(parse_season, number=NUMBER) / NUMBER
+        print('{:<10}{:>14,}{:>13.1f} us{:>14,}{:>13.1f} us'.format(
+            profile, len(media), media_time * 1e6, len(season), season_time * 1e6))
@@ -0,0 +1,61 @@
+'''
+Benchmark of the session persistence cost added to each Platform._make_request
+call: the former unconditional rewrite of session.pck against the
+change-detecting, debounced save, with a typical cookie jar.
+
+    python benchmarks/bench_session_save.py
+'''
+from pathlib import Path
+import os
+import pickle
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pynoovo.common.platform import Platform
+
+NUMBER = 2000
+COOKIES = 12
+
+
+class BenchPlatform(Platform):
+    name = 'bench'
+    tag = 'bench'
+    login = logout = ensure_login = get_account_infos = lambda *args: None
+    search = get_result_infos = get_play_infos = lambda *args: None
+
+
+def legacy_save(platform):
+    session_file = os.path.join(platform.cache_dir, 'session.pck')
+    if os.path.isfile(session_file):
+        os.remove(session_file)
+    with open(session_file, 'wb') as file:
+        pickle.dump(platform.session.cookies, file)
+
+
+def bench(name, func):
+    seconds = timeit.timeit(func, number=NUMBER) / NUMBER
+    print('{:<34}{:9.1f} us/request'.format(name, seconds * 1e6))
+
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as directory:
+        platform = BenchPlatform(directory)
+        for index in range(COOKIES):
+            platform.session.cookies.set('cookie{}'.format(index), 'x' * 64, domain='.noovo.ca')
+        platform._save_session()
+
+        bench('rewrite every request', lambda: legacy_save(platform))
+        bench('debounced, cookies unchanged', platform._schedule_session_save)
+
+        def changed():
+            platform.session.cookies.set('cookie0', str(os.urandom(8).hex()), domain='.noovo.ca')
+            platform._schedule_session_save()
+
+        platform.session_save_delay = 0
+        bench('cookies changed, no debounce', changed)
+        platform.session_save_delay = 1.0
+        bench('cookies changed, 1 s debounce', changed)
+        platform._save_session()
@@ -0,0 +1,79 @@
+'''
+Benchmark of the play infos request latency: a module-level requests.get,
+as CAPI used to do (new TCP + TLS connection each time), against the
+platform session from create_session (kept-alive connection), through a
+local HTTPS stub server. Requires the openssl command for the certificate.
+
+    python benchmarks/bench_transport.py
+'''
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import os
+import ssl
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pynoovo.common.transport import create_session
+from pynoovo.lib.capi.capi import HEADERS
+
+REQUESTS = 300
+RESPONSE = b'{"ContentPackages":[{"Id":1234567}]}'
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(RESPONSE)))
+        self.end_headers()
+        self.wfile.write(RESPONSE)
+
+    def log_message(self, *args):
+        pass
+
+
+def make_certificate(directory):
+    cert, key = os.path.join(directory, 'cert.pem'), os.path.join(directory, 'key.pem')
+    subprocess.run(['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1',
+                    '-keyout', key, '-out', cert, '-subj', '/CN=127.0.0.1',
+                    '-addext', 'subjectAltName=IP:127.0.0.1'], check=True, capture_output=True)
+    return cert, key
+
+
+def bench(name, get):
+    get()
+    latencies = []
+    for _ in range(REQUESTS):
+        start = time.perf_counter()
+        assert get().status_code == 200
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    print('{:<24}{:9.2f} ms median{:9.2f} ms p95'.format(
+        name, statistics.median(latencies) * 1e3, latencies[int(len(latencies) * 0.95)] * 1e3))
+
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as directory:
+        cert, key = make_certificate(directory)
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cert, key)
+        server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        server.socket = context.wrap_socket(server.socket, server_side=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = 'https://127.0.0.1:{}/content'.format(server.server_port)
+
+        bench('requests.get', lambda: requests.get(url=url, headers=HEADERS, verify=cert))
+        with create_session() as session:
+            bench('platform session', lambda: session.get(url=url, headers=HEADERS, verify=cert))
+        server.shutdown()
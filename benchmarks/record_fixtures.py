@@ -0,0 +1,60 @@
+'''
+Records the GraphQL responses used by bench_json_decoding.py: the root
+screen, a media and its first season with the full and playback profiles.
+Free text (titles, summaries, names, image urls) is anonymized, with its
+length and non-ASCII characters kept so decoding costs stay the same.
+
+    python benchmarks/record_fixtures.py contentid/axis-media-XXXXXX
+'''
+from pathlib import Path
+import json
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pynoovo.common.transport import create_session
+from pynoovo.lib.graphql.consts import PLAYBACK_LANGUAGES
+from pynoovo.lib.graphql.graphql import GraphQL
+from pynoovo.lib.graphql.templates import MEDIA_TEMPLATES, ROOT_SCREEN_TEMPLATE, SEASON_TEMPLATES
+
+FIXTURES = Path(__file__).resolve().parent / 'fixtures'
+URL = 'https://api-entpay.noovo.ca/graace/graphql/'
+ANONYMIZED = {'title', 'summary', 'description', 'shortDescription', 'name', 'fullName', 'label',
+              'linkLabel', 'url', 'agvotDisplayCode', 'qfrCode'}
+
+
+def anonymize_text(value):
+    return ''.join('é' if ord(char) > 127 else 'x' if char.isalpha() else char for char in value)
+
+
+def anonymize(value, key=None):
+    if isinstance(value, dict):
+        return {name: anonymize(item, name) for name, item in value.items()}
+    if isinstance(value, list):
+        return [anonymize(item, key) for item in value]
+    if isinstance(value, str) and key in ANONYMIZED:
+        return anonymize_text(value)
+    return value
+
+
+def record(graphql, name, template, variables=None):
+    response = graphql._make_request(template, variables, playback_language=PLAYBACK_LANGUAGES['fr'])
+    response.raise_for_status()
+    document = response.json()
+    # compact, as sent by the API
+    content = json.dumps(anonymize(document), ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    (FIXTURES / (name + '.json')).write_bytes(content)
+    print('{:<20}{:>10,} bytes'.format(name, len(content)))
+    return document
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 2:
+        sys.exit(__doc__)
+    FIXTURES.mkdir(exist_ok=True)
+    graphql = GraphQL(create_session(), URL, 'noovo')
+    record(graphql, 'screen', ROOT_SCREEN_TEMPLATE)
+    media = record(graphql, 'media-full', MEDIA_TEMPLATES['full'], {'id': sys.argv[1]})
+    season_id = media['data']['axisMedia']['seasons'][0]['id']
+    for profile in ('full', 'playback'):
+        record(graphql, 'season-' + profile, SEASON_TEMPLATES[profile], {'id': season_id})
@@ -1 +1,7 @@
-from .noovo import Noovo
\ No newline at end of file
+from .noovo import Noovo
+from .crawler import CatalogueCrawler, load_snapshot
+try:
+    from .async_noovo import AsyncNoovo
+except ImportError:
+    # httpx is only required by the asyncio client
+    pass
\ No newline at end of file
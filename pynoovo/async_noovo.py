@@ -0,0 +1,374 @@
+# External stuff
+from copy import copy
+import asyncio
+import logging
+import httpx
+from pynoovo.common.category import Category
+
+from pynoovo.common.media import Media
+
+# Common
+from .common.play_infos import PlayInfos
+from .common.result_info import ResultInfo
+from .common.result_info import SerieResultInfo, MovieResultInfo
+from .common.search_result import SearchResult
+from .common.account import Account
+from .common.platform import Platform
+from .common.search_index import SearchIndex
+from .common.utils import format_episode_number
+from .common.json_backend import response_json
+
+# Crave stuff
+from .login_handler import NoovoLoginHandler
+from .consts import *
+from typing import Any, Dict, List, Union
+
+# Internal libs
+from .lib.graphql.async_graphql import AsyncGraphQL
+from .common.cache import ResponseCache
+from .lib.graphql.cache import StaleWhileRevalidateCache
+from .lib.capi.async_capi import AsyncCAPI
+from .crawler import load_snapshot
+
+# Logger
+logger = logging.getLogger(__name__)
+
+
+class AsyncNoovo(Platform):
+    '''
+    asyncio twin of Noovo. Must be opened before use, either with
+    "await client.open()" or "async with AsyncNoovo(...) as client".
+    '''
+    name = 'Noovo'
+    tag = 'noovo'
+
+    # ================================================================
+    #   __init__()
+    # ================================================================
+
+    def __init__(self, cache_dir: str, username: str = None, password: str = None, site: str = 'bell', max_concurrency: int = 64, max_connections: int = 100, response_cache: ResponseCache = None, disk_cache: bool = False, browse_max_age: float = None):
+        '''
+        Initialises the client.
+            Args:
+                cache_dir (str): Directory to store cache files
+                username (str): Account username
+                password (str): Account password
+                site (str): Login site
+                max_concurrency (int): Maximum number of concurrent GraphQL requests
+                max_connections (int): Size of the HTTP connection pool
+                response_cache (ResponseCache): GraphQL response cache (None to disable, the default)
+                disk_cache (bool): Without response_cache, caches the responses in memory and in files in cache_dir
+                browse_max_age (float): Age (seconds) after which cached category trees are refreshed in the background (None to disable, the default)
+        '''
+        super().__init__(cache_dir)
+        if response_cache is None and disk_cache:
+            response_cache = self._create_response_cache(disk_cache)
+        browse_cache = None
+        if browse_max_age is not None:
+            browse_cache = StaleWhileRevalidateCache(max_age=browse_max_age)
+        self.client = httpx.AsyncClient(limits=httpx.Limits(
+            max_connections=max_connections, max_keepalive_connections=max_connections))
+        self.graphql = AsyncGraphQL(self.client, 'https://api-entpay.noovo.ca/graace/graphql/',
+                                    self.tag, metadata_language='fr', max_concurrency=max_concurrency,
+                                    cache=response_cache, browse_cache=browse_cache)
+        self.login_handler: NoovoLoginHandler = None
+        self.account_infos: Account = None
+        self._credentials = (username, password, site)
+        self._login_lock = asyncio.Lock()
+
+    async def __aenter__(self) -> 'AsyncNoovo':
+        await self.open()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    # ================================================================
+    #   open()
+    # ================================================================
+
+    async def open(self) -> bool:
+        '''
+        Logs in and fetches the account infos.
+            Returns:
+                bool: Whether the login succeeded
+        '''
+        # The login handler is blocking, but only runs once per token lifetime
+        username, password, site = self._credentials
+        self.login_handler = await asyncio.to_thread(
+            NoovoLoginHandler, self.cache_dir, self.session, username, password, site=site)
+        if await self.get_account_infos() is None:
+            logger.info('Unable to login')
+            return False
+        return True
+
+    # ================================================================
+    #   close()
+    # ================================================================
+
+    async def close(self) -> None:
+        await self.client.aclose()
+        # writes the pending cookie changes, if any
+        self._save_session()
+        self.session.close()
+
+    # ===================================================================
+    #
+    #   CATEGORIES
+    #
+    # ===================================================================
+
+    # ================================================================
+    #   get_root_categories()
+    # ================================================================
+
+    async def get_root_categories(self) -> List[Category]:
+        '''
+        List home page categories
+            Returns:
+                List[Category]: A list of all categories.
+        '''
+        logger.debug('Listing root categories...')
+        return await self.graphql.get_root_categories()
+
+    # ================================================================
+    #   get_elements()
+    # ================================================================
+
+    async def get_elements(self, category: Category) -> List[Union[Category, ResultInfo]]:
+        '''
+        List all category elements
+            Returns:
+                List[Union[Category, ResultInfo]]: A list of elements in category
+        '''
+        return await self.graphql.get_elements(category)
+
+    # ================================================================
+    #   get_browse_stats()
+    # ================================================================
+
+    def get_browse_stats(self) -> Dict[str, int]:
+        '''
+        Returns the category tree cache counters
+            Returns:
+                Dict[str, int]: The hits, misses, refreshes, refresh_errors and entries counters
+        '''
+        return self.graphql.get_browse_stats()
+
+    # ===================================================================
+    #
+    #   SEARCH
+    #
+    # ===================================================================
+
+    # ================================================================
+    #   search()
+    # ================================================================
+
+    async def search(self, input: str) -> List[SearchResult]:
+        '''
+        Search a title.
+            Args:
+                input (str): The search terms
+            Returns:
+                List[SearchResult]: A list of all the search results. First element is the most relevent one.
+        '''
+        logger.debug('Making a search for "{}"...'.format(input))
+        return await self.graphql.search(input)
+
+    # ================================================================
+    #   load_search_index()
+    # ================================================================
+
+    def load_search_index(self, snapshot: Union[str, Dict[str, Any]], max_age: float = 86400) -> None:
+        '''
+        Answers searches from a local index of a catalogue snapshot. searchMedia
+        is only used when the index misses or is older than max_age.
+            Args:
+                snapshot (Union[str, Dict[str, Any]]): The snapshot, or the file it was saved to
+                max_age (float): Age (seconds) after which the index is considered stale
+        '''
+        if isinstance(snapshot, str):
+            snapshot = load_snapshot(snapshot)
+        self.graphql.search_index = SearchIndex.from_snapshot(snapshot)
+        self.graphql.search_index_max_age = max_age
+        logger.debug('Indexed {} titles'.format(len(self.graphql.search_index)))
+
+    # ===================================================================
+    #
+    #   RESULT INFOS
+    #
+    # ===================================================================
+
+    # ================================================================
+    #   get_result_infos()
+    # ================================================================
+
+    async def get_result_infos(self, result: SearchResult, profile: str = None) -> Dict[str, Union[MovieResultInfo, SerieResultInfo]]:
+        '''
+        Get more infos about a specific search result
+            Args:
+                result (SearchResult): The search result
+                profile (str): The query profile (minimal, playback or full), defaults to the GraphQL query_profile
+            Returns:
+                Dict[str, Union[MovieResultInfo, SerieResultInfo]]: A dictionary of all the versions available (french/english) and corresponding infos
+        '''
+        logger.debug('Getting infos for "{}"...'.format(result.title))
+        return await self.graphql.get_result_infos(result, profile)
+
+    # ================================================================
+    #   get_result_infos_id()
+    # ================================================================
+
+    async def get_result_infos_id(self, content_id: str, profile: str = None) -> Dict[str, Union[MovieResultInfo, SerieResultInfo]]:
+        '''
+        Get more infos about a specific search result
+            Args:
+                id (str): The Content ID
+                profile (str): The query profile (minimal, playback or full), defaults to the GraphQL query_profile
+            Returns:
+                Dict[str, Union[MovieResultInfo, SerieResultInfo]]: A dictionary of all the versions available (french/english) and corresponding infos
+        '''
+        logger.debug('Getting infos for "{}"...'.format(content_id))
+        return await self.graphql.get_result_infos_id(content_id, profile)
+
+    # ================================================================
+    #   get_results_infos_ids()
+    # ================================================================
+
+    async def get_results_infos_ids(self, content_ids: List[str], profile: str = None) -> Dict[str, Dict[str, Union[MovieResultInfo, SerieResultInfo]]]:
+        '''
+        Get more infos about several search results, in batched requests
+            Args:
+                content_ids (List[str]): The Content IDs
+                profile (str): The query profile (minimal, playback or full), defaults to the GraphQL query_profile
+            Returns:
+                Dict[str, Dict[str, Union[MovieResultInfo, SerieResultInfo]]]: The versions of each result, as returned by get_result_infos_id()
+        '''
+        logger.debug('Getting infos for {} results...'.format(len(content_ids)))
+        return await self.graphql.get_results_infos_ids(content_ids, profile)
+
+    # ===================================================================
+    #
+    #   PLAY INFOS
+    #
+    # ===================================================================
+
+    # ================================================================
+    #   get_play_infos()
+    # ================================================================
+
+    async def get_play_infos(self, result_infos: ResultInfo, season: int = None, episode: int = None) -> PlayInfos:
+        '''
+        Returns play infos for the provided result infos
+            Args:
+                result_infos (ResultInfo): The result infos
+                season (int): The season number (only for series)
+                episode (int): The episode number (only for series)
+            Returns:
+                PlayInfos: The play infos
+        '''
+        if result_infos.type == 'movie':
+            return await self._get_play_infos_media(result_infos.medias['default'])
+        elif result_infos.type == 'serie':
+            if season is None or episode is None:
+                logger.error('No season or episode provided')
+                return None
+            logger.debug('Getting play infos for "{} {}"...'.format(
+                result_infos.title, format_episode_number(season, episode)))
+            for media in result_infos.medias.values():
+                if media.season == season and media.episode == episode:
+                    return await self._get_play_infos_media(media)
+            logger.debug('Episode {} not found'.format(
+                format_episode_number(season, episode)))
+        return None
+
+    # ================================================================
+    #   _get_play_infos_media()
+    # ================================================================
+
+    async def _get_play_infos_media(self, media: Media) -> PlayInfos:
+        '''
+        Returns play infos for the provided media
+            Args:
+                media (Media): The media
+            Returns:
+                PlayInfos: The play infos
+        '''
+        if not media.has_access:
+            logger.error('You don\'t have access to this content')
+            return None
+        if not await self.ensure_login():
+            return None
+        return await AsyncCAPI.get_play_infos(
+            self.client,
+            media.additionnal_infos['destination'],
+            media.play_id,
+            media.playback_languages[0],
+            token=self.login_handler.access_token,
+            filter='0x14')
+
+    # ===================================================================
+    #
+    #   ACCOUNT
+    #
+    # ===================================================================
+
+    # ================================================================
+    #   login()
+    # ================================================================
+
+    async def login(self, username: str, password: str) -> bool:
+        self.account_infos = None
+        async with self._login_lock:
+            if not await asyncio.to_thread(self.login_handler.login, username, password):
+                return False
+        if await self.get_account_infos() is None:
+            return False
+        return True
+
+    # ================================================================
+    #   logout()
+    # ================================================================
+
+    async def logout(self) -> None:
+        self.account_infos = None
+        async with self._login_lock:
+            await asyncio.to_thread(self.login_handler.logout)
+
+    # ================================================================
+    #   ensure_login()
+    # ================================================================
+
+    async def ensure_login(self) -> bool:
+        if self.login_handler is None:
+            logger.error('Client is not opened')
+            return False
+        async with self._login_lock:
+            if not self.login_handler._check_expiry():
+                return True
+            return await asyncio.to_thread(self.login_handler.ensure_login)
+
+    # ================================================================
+    #   get_account_infos()
+    # ================================================================
+
+    async def get_account_infos(self) -> Account:
+        if not await self.ensure_login():
+            self.account_infos = None
+            return None
+        try:
+            self.graphql.subscriptions = self.login_handler.subscriptions
+            self.graphql.scopes = self.login_handler.scopes
+            self.graphql.packages = self.login_handler.packages
+            self.account_infos = Account()
+            headers = copy(BASE_HEADERS)
+            headers['authorization'] = 'Bearer {}'.format(self.login_handler.access_token)
+            response = await self.client.get(PROFILE_URL, headers=headers)
+            response_parsed = response_json(response)
+            self.account_infos.name = response_parsed[0]['nickname']
+            self.account_infos.picture = response_parsed[0]['avatarUrl']
+            return self.account_infos
+        except:
+            self.account_infos = None
+            return None
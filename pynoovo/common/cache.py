@@ -0,0 +1,173 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Tuple
+import logging
+import os
+import tempfile
+import threading
+import time
+
+# Logger
+logger = logging.getLogger(__name__)
+
+
+# ===================================================================
+#
+#   BACKENDS
+#
+# ===================================================================
+
+class ResponseCache(ABC):
+    # True if get_entry()/set() do I/O, async clients call them from a worker thread
+    blocking: bool = False
+
+    def get(self, key: str) -> bytes:
+        entry = self.get_entry(key)
+        return None if entry is None else entry[1]
+
+    @abstractmethod
+    def get_entry(self, key: str) -> Tuple[float, bytes]:
+        '''
+        Returns the (expiry, content) of a valid entry, None otherwise
+        '''
+        pass
+
+    @abstractmethod
+    def set(self, key: str, content: bytes, ttl: float) -> None:
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        pass
+
+
+class MemoryResponseCache(ResponseCache):
+    '''
+    In-memory LRU cache, bounded in entries and bytes. Misses can be
+    forwarded to a slower backend (e.g. DiskResponseCache).
+    '''
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 32 * 1024 * 1024, backend: ResponseCache = None):
+        self.max_entries: int = max_entries
+        self.max_bytes: int = max_bytes
+        self.backend: ResponseCache = backend
+        self.size: int = 0
+        self._entries: 'OrderedDict[str, Tuple[float, bytes]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def blocking(self) -> bool:
+        return self.backend is not None and self.backend.blocking
+
+    def get_entry(self, key: str) -> Tuple[float, bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > time.time():
+                    self._entries.move_to_end(key)
+                    return entry
+                self._pop(key)
+        if self.backend is None:
+            return None
+        entry = self.backend.get_entry(key)
+        if entry is not None:
+            with self._lock:
+                self._put(key, entry[1], entry[0])
+        return entry
+
+    def set(self, key: str, content: bytes, ttl: float) -> None:
+        with self._lock:
+            self._put(key, content, time.time() + ttl)
+        if self.backend is not None:
+            self.backend.set(key, content, ttl)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+        if self.backend is not None:
+            self.backend.clear()
+
+    def _put(self, key: str, content: bytes, expiry: float) -> None:
+        if len(content) > self.max_bytes:
+            return
+        self._pop(key)
+        self._entries[key] = (expiry, content)
+        self.size += len(content)
+        while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+
+    def _pop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= len(entry[1])
+
+
+class DiskResponseCache(ResponseCache):
+    '''
+    On-disk cache, one file per entry. Files are written atomically so
+    several processes can share the same directory.
+    '''
+    blocking = True
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir: str = cache_dir
+        if not os.path.isdir(self.cache_dir):
+            os.makedirs(self.cache_dir)
+        self.prune()
+
+    def get_entry(self, key: str) -> Tuple[float, bytes]:
+        path = self._get_path(key)
+        try:
+            with open(path, 'rb') as file:
+                expiry = float(file.readline())
+                content = file.read()
+        except (OSError, ValueError):
+            return None
+        if expiry <= time.time():
+            self._remove(path)
+            return None
+        return expiry, content
+
+    def set(self, key: str, content: bytes, ttl: float) -> None:
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as file:
+                file.write('{}\n'.format(time.time() + ttl).encode('ascii'))
+                file.write(content)
+            os.replace(tmp_path, self._get_path(key))
+        except OSError:
+            logger.warning('Unable to write cache entry {}'.format(key))
+
+    def clear(self) -> None:
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.cache'):
+                self._remove(os.path.join(self.cache_dir, name))
+
+    def prune(self) -> None:
+        '''
+        Removes the expired entries
+        '''
+        now = time.time()
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.cache'):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                with open(path, 'rb') as file:
+                    expired = float(file.readline()) <= now
+            except (OSError, ValueError):
+                expired = True
+            if expired:
+                self._remove(path)
+
+    def _get_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + '.cache')
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
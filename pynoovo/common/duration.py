@@ -0,0 +1,118 @@
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional
+import re
+
+# ISO 8601 durations (xs:duration), e.g. PT1M30S, P1DT2H, PT0.5S, P0Y0M0DT0H3M30.000S
+# A year is 365 days and a month 30 days, manifests almost only use the time part
+_NUMBER = r'(\d+(?:[.,]\d*)?|[.,]\d+)'
+ISO_DURATION = re.compile(
+    r'([-+])?P(?=\d|[.,]|T\d|T[.,])'
+    r'(?:' + _NUMBER + r'Y)?(?:' + _NUMBER + r'M)?(?:' + _NUMBER + r'W)?(?:' + _NUMBER + r'D)?'
+    r'(?:T(?=\d|[.,])(?:' + _NUMBER + r'H)?(?:' + _NUMBER + r'M)?(?:' + _NUMBER + r'S)?)?')
+ISO_UNITS = (365 * 86400, 30 * 86400, 7 * 86400, 86400, 3600, 60, 1)
+
+
+# ================================================================
+#   parse_iso_duration()
+# ================================================================
+
+@lru_cache(maxsize=1024)
+def parse_iso_duration(value: str) -> Optional[float]:
+    '''
+    Parses an ISO 8601 duration
+        Args:
+            value (str): The duration, e.g. PT1H2M3.5S
+        Returns:
+            Optional[float]: The duration in seconds, None if the value is not a duration
+    '''
+    match = ISO_DURATION.fullmatch(value.strip())
+    if match is None:
+        return None
+    sign, *fields = match.groups()
+    seconds = 0.0
+    for field, unit in zip(fields, ISO_UNITS):
+        if field is not None:
+            seconds += float(field.replace(',', '.')) * unit
+    return -seconds if sign == '-' else seconds
+
+
+# Durations as written by the API, e.g. 1h 32m 10s, 45m
+TEXT_DURATION = re.compile(r'(?:(\d+)h)? *(?:(\d+)m)? *(?:(\d+)s)?')
+
+
+# ================================================================
+#   parse_duration()
+# ================================================================
+
+# Episode lengths repeat across seasons and catalogue crawls
+@lru_cache(maxsize=8192)
+def parse_duration(value: str) -> Optional[int]:
+    '''
+    Parses a duration string (1h 32m 10s) or an ISO 8601 duration
+        Args:
+            value (str): The duration
+        Returns:
+            Optional[int]: The duration in seconds, None if the value is not a duration
+    '''
+    match = TEXT_DURATION.fullmatch(value)
+    # lastindex is None when no unit matched (empty string)
+    if match is not None and match.lastindex:
+        hours, minutes, seconds = match.groups()
+        return ((int(hours) * 3600 if hours else 0) + (int(minutes) * 60 if minutes else 0)
+                + (int(seconds) if seconds else 0))
+    if value[:1] == 'P':
+        seconds = parse_iso_duration(value)
+        return None if seconds is None else int(round(seconds))
+    return None
+
+
+# ================================================================
+#   content_duration()
+# ================================================================
+
+def content_duration(content: Dict[str, Any]) -> Optional[int]:
+    '''
+    Returns the duration of an AxisContent, from durationSecs when the API sent it
+        Args:
+            content (Dict): The content as a Dict
+        Returns:
+            Optional[int]: The duration in seconds, None if unknown
+    '''
+    if not isinstance(content, dict):
+        return None
+    seconds = content.get('durationSecs')
+    if isinstance(seconds, (int, float)) and not isinstance(seconds, bool):
+        return int(seconds)
+    value = content.get('duration')
+    if isinstance(value, str):
+        return parse_duration(value)
+    return None
+
+
+# ================================================================
+#   content_durations()
+# ================================================================
+
+def content_durations(contents: Iterable[Dict[str, Any]]) -> List[Optional[int]]:
+    '''
+    Returns the durations of a list of AxisContent (e.g. a season's episodes)
+        Args:
+            contents (Iterable[Dict]): The contents
+        Returns:
+            List[Optional[int]]: The durations in seconds, in the same order
+    '''
+    durations = []
+    for content in contents:
+        # most episodes have durationSecs or a duration string, skip content_duration() for them
+        if type(content) is dict:
+            seconds = content.get('durationSecs')
+            if type(seconds) is int:
+                durations.append(seconds)
+                continue
+            if seconds is None:
+                value = content.get('duration')
+                if type(value) is str:
+                    durations.append(parse_duration(value))
+                    continue
+        durations.append(content_duration(content))
+    return durations
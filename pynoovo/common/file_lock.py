@@ -0,0 +1,52 @@
+from typing import BinaryIO
+import logging
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+# Logger
+logger = logging.getLogger(__name__)
+
+
+class FileLock():
+    '''
+    Exclusive lock held through a lock file, shared by every process using
+    the same cache directory (flock on POSIX, msvcrt.locking on Windows).
+    Without either module the lock only opens the file.
+    '''
+
+    def __init__(self, path: str) -> None:
+        self.path: str = path
+        self._file: BinaryIO = None
+
+    def __enter__(self) -> 'FileLock':
+        self._file = open(self.path, 'a+b')
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        elif msvcrt is not None:
+            self._file.seek(0)
+            while True:
+                # LK_LOCK gives up after 10 attempts
+                try:
+                    msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    logger.debug('Waiting for {}...'.format(self.path))
+        return self
+
+    def __exit__(self, *args) -> None:
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            elif msvcrt is not None:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._file.close()
+            self._file = None
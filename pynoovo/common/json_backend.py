@@ -0,0 +1,47 @@
+from typing import Any, Union
+import json
+
+try:
+    # Parses straight from bytes, several times faster than the stdlib
+    import orjson
+except ImportError:
+    orjson = None
+
+# Name of the backend in use, for logs and benchmarks
+BACKEND = 'stdlib' if orjson is None else 'orjson'
+
+
+# ================================================================
+#   loads()
+# ================================================================
+
+def loads(data: Union[bytes, str]) -> Any:
+    '''
+    Parses a JSON document with the fastest available backend
+        Args:
+            data (Union[bytes, str]): The document, preferably the raw response bytes
+        Returns:
+            Any: The parsed document
+    '''
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, bytes):
+        # JSON over HTTP is UTF-8, skips the encoding detection of json.loads
+        data = data.decode('utf-8')
+    return json.loads(data)
+
+
+# ================================================================
+#   response_json()
+# ================================================================
+
+def response_json(response: Any) -> Any:
+    '''
+    Parses the body of a response (requests, httpx or a cached one)
+    from its bytes, skipping the decode to str of response.text
+        Args:
+            response (Response): The response
+        Returns:
+            Any: The parsed body
+    '''
+    return loads(response.content)
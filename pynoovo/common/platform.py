@@ -3,11 +3,17 @@ from .result_info import ResultInfo, SerieResultInfo, MovieResultInfo
 from .account import Account
 from .search_result import SearchResult
 from .play_infos import PlayInfos
+from .cache import ResponseCache, MemoryResponseCache, DiskResponseCache
+from .transport import create_session, DEFAULT_POOL_SIZE, DEFAULT_MAX_RETRIES, DEFAULT_BACKOFF_FACTOR, DEFAULT_TIMEOUT
+from .file_lock import FileLock
 from typing import Any, Dict, List, Tuple, Union
 import requests
 import os
 import pickle
 import logging
+import tempfile
+import threading
+import time
 
 # Logger
 logger = logging.getLogger(__name__)
@@ -18,10 +24,19 @@ class Platform(ABC):
     tag: str
     session: requests.Session
 
-    def __init__(self, cache_dir: str) -> None:
+    def __init__(self, cache_dir: str, pool_size: int = DEFAULT_POOL_SIZE, pool_sizes: Dict[str, int] = None, max_retries: int = DEFAULT_MAX_RETRIES, backoff_factor: float = DEFAULT_BACKOFF_FACTOR, timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT, retry_post_hosts: List[str] = None) -> None:
         self.cache_dir = cache_dir
         if not os.path.isdir(self.cache_dir):
             os.makedirs(self.cache_dir)
+        self._transport = {'pool_size': pool_size, 'pool_sizes': pool_sizes, 'max_retries': max_retries,
+                           'backoff_factor': backoff_factor, 'timeout': timeout, 'retry_post_hosts': retry_post_hosts}
+        # Cookie changes are written at most once per session_save_delay seconds
+        self.session_save_delay: float = 1.0
+        self._session_file = os.path.join(self.cache_dir, 'session.pck')
+        self._session_state: Tuple = None
+        self._session_saved_at: float = 0
+        self._session_timer: threading.Timer = None
+        self._session_lock = threading.Lock()
         self._load_session()
 
     # ===================================================================
@@ -74,29 +89,101 @@ class Platform(ABC):
 
     def _load_session(self) -> None:
         logger.debug('Loading session...')
-        self.session = requests.Session()
-        session_file = os.path.join(self.cache_dir, 'session.pck')
-        if os.path.isfile(session_file):
+        # GraphQL, CAPI, login and license requests all share its connections
+        self.session = create_session(**self._transport)
+        if os.path.isfile(self._session_file):
             logger.debug('Trying to load session from file...')
             try:
-                with open(session_file, 'rb') as file:
+                with open(self._session_file, 'rb') as file:
                     self.session.cookies.update(pickle.load(file))
                 logger.debug('Session loaded succesfully')
             except:
                 logger.debug('File corrupted, creating a new one...')
-                os.remove(session_file)
+                with FileLock(self._session_file + '.lock'):
+                    self._remove_session_file()
                 self.session.cookies.clear()
-        self._save_session()
+        # the file is only written once the cookies change
+        self._session_state = self._get_cookies_state()
 
     def _save_session(self) -> None:
-        logger.debug('Saving session...')
-        session_file = os.path.join(self.cache_dir, 'session.pck')
-        if os.path.isfile(session_file):
-            os.remove(session_file)
-        with open(session_file, 'wb') as file:
-            pickle.dump(self.session.cookies, file)
+        '''
+        Writes the cookies if they changed since the last save. The file is
+        replaced atomically, under a lock shared with the other processes.
+        '''
+        with self._session_lock:
+            if self._session_timer is not None:
+                self._session_timer.cancel()
+                self._session_timer = None
+            state = self._get_cookies_state()
+            if state is not None and state == self._session_state:
+                return
+            logger.debug('Saving session...')
+            try:
+                content = pickle.dumps(self.session.cookies)
+            except RuntimeError:
+                # the jar was modified by another thread, retried on the next change
+                logger.debug('Cookies changed while saving the session')
+                return
+            try:
+                with FileLock(self._session_file + '.lock'):
+                    fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+                    try:
+                        with os.fdopen(fd, 'wb') as file:
+                            file.write(content)
+                        os.replace(tmp_path, self._session_file)
+                    except:
+                        os.remove(tmp_path)
+                        raise
+            except OSError:
+                logger.warning('Unable to save session')
+                return
+            self._session_state = state
+            self._session_saved_at = time.monotonic()
         logger.debug('Session saved')
 
+    def _schedule_session_save(self) -> None:
+        '''
+        Saves the cookies if they changed, changes made within
+        session_save_delay of the last save are written together
+        '''
+        state = self._get_cookies_state()
+        with self._session_lock:
+            if state is not None and state == self._session_state:
+                return
+            if self._session_timer is not None:
+                return
+            delay = self._session_saved_at + self.session_save_delay - time.monotonic()
+            if delay > 0:
+                # not a daemon thread, pending changes are written before exiting
+                self._session_timer = threading.Timer(delay, self._save_session)
+                self._session_timer.start()
+                return
+        self._save_session()
+
+    def _get_cookies_state(self) -> Tuple:
+        try:
+            return tuple(sorted((cookie.domain, cookie.path, cookie.name, cookie.value, cookie.expires or 0)
+                                for cookie in self.session.cookies))
+        except RuntimeError:
+            # modified by another thread, considered changed
+            return None
+
+    def _remove_session_file(self) -> None:
+        try:
+            os.remove(self._session_file)
+        except OSError:
+            pass
+
+    # ===================================================================
+    #   CACHE
+    # ===================================================================
+
+    def _create_response_cache(self, disk_cache: bool = False) -> ResponseCache:
+        backend = None
+        if disk_cache:
+            backend = DiskResponseCache(os.path.join(self.cache_dir, 'responses'))
+        return MemoryResponseCache(backend=backend)
+
     # ===================================================================
     #   REQUESTS
     # ===================================================================
@@ -108,5 +195,5 @@ class Platform(ABC):
             response = self.session.post(url=url, data=data, headers=headers)
         else:
             response = self.session.get(url=url, headers=headers)
-        self._save_session()
+        self._schedule_session_save()
         return response
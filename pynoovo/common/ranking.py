@@ -0,0 +1,54 @@
+from typing import List, Sequence
+import heapq
+
+from fuzzywuzzy import fuzz
+
+from .search_result import SearchResult
+
+try:
+    # Scores a whole candidate list in a single native call
+    from rapidfuzz import fuzz as rapid_fuzz
+    from rapidfuzz.process import cdist
+except ImportError:
+    cdist = None
+
+
+# ================================================================
+#   score_titles()
+# ================================================================
+
+def score_titles(input: str, titles: Sequence[str]) -> List[float]:
+    '''
+    Scores titles against search terms (partial ratio, 0 to 100)
+        Args:
+            input (str): The search terms
+            titles (Sequence[str]): The titles
+        Returns:
+            List[float]: The score of each title
+    '''
+    if len(titles) == 0:
+        return []
+    if cdist is not None:
+        return cdist([input], titles, scorer=rapid_fuzz.partial_ratio, workers=-1)[0].tolist()
+    return [fuzz.partial_ratio(title, input) for title in titles]
+
+
+# ================================================================
+#   rank_results()
+# ================================================================
+
+def rank_results(input: str, results: List[SearchResult], limit: int = 50) -> List[SearchResult]:
+    '''
+    Ranks search results by title similarity. Only the top results are
+    selected, ties are broken by title then ID so the order is stable.
+        Args:
+            input (str): The search terms
+            results (List[SearchResult]): The candidates
+            limit (int): Maximum number of results
+        Returns:
+            List[SearchResult]: The best results. First element is the most relevent one.
+    '''
+    scores = score_titles(input, [x.title for x in results])
+    best = heapq.nsmallest(limit, range(len(results)), key=lambda i: (
+        -scores[i], results[i].title, results[i].id))
+    return [results[i] for i in best]
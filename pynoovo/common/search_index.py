@@ -0,0 +1,194 @@
+from bisect import bisect_left
+from calendar import timegm
+from copy import copy
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Tuple
+import heapq
+import re
+import time
+import unicodedata
+
+from .search_result import SearchResult
+
+NON_ALNUM = re.compile(r'[^0-9a-z]+')
+
+
+# ===================================================================
+#
+#   NORMALIZATION
+#
+# ===================================================================
+
+def normalize(text: str) -> str:
+    '''
+    Folds accents and case, and keeps only alphanumeric words
+        Args:
+            text (str): The text
+        Returns:
+            str: The normalized text, e.g. "Les Émotifs!" -> "les emotifs"
+    '''
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return NON_ALNUM.sub(' ', text.casefold()).strip()
+
+
+def trigrams(text: str) -> List[str]:
+    '''
+    Returns the distinct trigrams of a normalized text, padded so short
+    words and word starts get their own trigrams
+    '''
+    padded = ' {} '.format(text)
+    return list(dict.fromkeys(padded[i:i + 3] for i in range(len(padded) - 2)))
+
+
+# ===================================================================
+#
+#   INDEX
+#
+# ===================================================================
+
+class SearchIndex():
+    '''
+    In-process title index. Answers prefix queries with a sorted list of
+    word-aligned title suffixes, and fuzzy queries with trigram postings.
+    '''
+
+    def __init__(self, results: Iterable[Tuple[SearchResult, Iterable[str]]], created: float = None):
+        '''
+        Builds the index.
+            Args:
+                results (Iterable[Tuple[SearchResult, Iterable[str]]]): The results and the titles they can be found with
+                created (float): Timestamp of the indexed data (defaults to now)
+        '''
+        self.created: float = time.time() if created is None else created
+        self.results: List[SearchResult] = []
+        self._titles: List[str] = []
+        self._doc_results: List[int] = []
+        self._doc_trigrams: List[int] = []
+        self._prefixes: List[Tuple[str, int]] = []
+        self._postings: Dict[str, List[int]] = {}
+        for result, titles in results:
+            result_index = len(self.results)
+            self.results.append(result)
+            for title in dict.fromkeys(normalize(x) for x in titles):
+                if title != '':
+                    self._add_title(title, result_index)
+        self._prefixes.sort()
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    # ================================================================
+    #   from_snapshot()
+    # ================================================================
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Dict[str, Any]) -> 'SearchIndex':
+        '''
+        Builds the index of a catalogue snapshot (see CatalogueCrawler)
+            Args:
+                snapshot (Dict[str, Any]): The snapshot
+            Returns:
+                SearchIndex: The index
+        '''
+        results = []
+        for id, infos in snapshot['results'].items():
+            result = SearchResult(
+                requirements=infos['requirements'],
+                title=infos['title'],
+                search_title=infos['title'],
+                id=id,
+                image=infos['image'],
+                platform_tag=snapshot['platform'])
+            titles = [infos['title']] + [
+                x['title'] for x in snapshot['titles'].get(id, {}).values()]
+            results.append((result, titles))
+        created = timegm(datetime.strptime(
+            snapshot['created'], '%Y-%m-%dT%H:%M:%SZ').timetuple())
+        return cls(results, created=created)
+
+    # ================================================================
+    #   is_stale()
+    # ================================================================
+
+    def is_stale(self, max_age: float) -> bool:
+        return time.time() - self.created > max_age
+
+    # ================================================================
+    #   search()
+    # ================================================================
+
+    def search(self, input: str, limit: int = 50, min_score: float = 0.6) -> List[SearchResult]:
+        '''
+        Search a title. Prefix matches come first, then fuzzy matches.
+            Args:
+                input (str): The search terms
+                limit (int): Maximum number of results
+                min_score (float): Minimum share of the query trigrams a fuzzy match must contain
+            Returns:
+                List[SearchResult]: Copies of the matching results. First element is the most relevent one.
+        '''
+        query = normalize(input)
+        if query == '':
+            return []
+        scores: Dict[int, Tuple[float, int]] = {}
+        for result_index, score in self._search_prefix(query) + self._search_fuzzy(query, min_score):
+            if result_index not in scores or scores[result_index] < score:
+                scores[result_index] = score
+        # Ties are broken by insertion order so the order is stable
+        ranked = heapq.nsmallest(limit, scores, key=lambda x: (
+            -scores[x][0], -scores[x][1], x))
+        return [copy(self.results[x]) for x in ranked]
+
+    # ================================================================
+    #   _search_prefix()
+    # ================================================================
+
+    def _search_prefix(self, query: str) -> List[Tuple[int, Tuple[float, int]]]:
+        matches = []
+        position = bisect_left(self._prefixes, (query, -1))
+        while position < len(self._prefixes) and self._prefixes[position][0].startswith(query):
+            doc = self._prefixes[position][1]
+            title = self._titles[doc]
+            # Titles starting with the query rank above inner word matches
+            score = 3.0 if title.startswith(query) else 2.0
+            matches.append((self._doc_results[doc], (score, -len(title))))
+            position += 1
+        return matches
+
+    # ================================================================
+    #   _search_fuzzy()
+    # ================================================================
+
+    def _search_fuzzy(self, query: str, min_score: float) -> List[Tuple[int, Tuple[float, int]]]:
+        query_trigrams = trigrams(query)
+        counts: Dict[int, int] = {}
+        for trigram in query_trigrams:
+            for doc in self._postings.get(trigram, ()):
+                counts[doc] = counts.get(doc, 0) + 1
+        matches = []
+        for doc, count in counts.items():
+            # Share of the query found in the title, with a small penalty
+            # for titles much longer than the query
+            score = count / len(query_trigrams)
+            if score < min_score:
+                continue
+            score -= 0.01 * (self._doc_trigrams[doc] - count) / self._doc_trigrams[doc]
+            matches.append((self._doc_results[doc], (score, -len(self._titles[doc]))))
+        return matches
+
+    # ================================================================
+    #   _add_title()
+    # ================================================================
+
+    def _add_title(self, title: str, result_index: int) -> None:
+        doc = len(self._titles)
+        self._titles.append(title)
+        self._doc_results.append(result_index)
+        title_trigrams = trigrams(title)
+        self._doc_trigrams.append(len(title_trigrams))
+        for trigram in title_trigrams:
+            self._postings.setdefault(trigram, []).append(doc)
+        self._prefixes.append((title, doc))
+        for match in re.finditer(' ', title):
+            self._prefixes.append((title[match.end():], doc))
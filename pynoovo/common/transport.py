@@ -0,0 +1,81 @@
+from typing import Dict, Iterable, Tuple, Union
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import requests
+import logging
+
+# Logger
+logger = logging.getLogger(__name__)
+
+# (connect, read) timeouts in seconds, used when a request does not set its own
+DEFAULT_TIMEOUT = (5, 30)
+# Connections kept alive per host
+DEFAULT_POOL_SIZE = 10
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5
+# Transient errors worth retrying, the last response is returned once retries are exhausted
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Idempotent methods only, login, token refresh and license POSTs must not be replayed
+RETRY_METHODS = Retry.DEFAULT_ALLOWED_METHODS
+# GraphQL queries are read-only POST requests, retried on the hosts of retry_post_hosts only
+RETRY_POST_METHODS = RETRY_METHODS | frozenset(['POST'])
+
+
+# ===================================================================
+#
+#   ADAPTER
+#
+# ===================================================================
+
+class TransportAdapter(HTTPAdapter):
+    '''
+    HTTPAdapter with a default timeout, requests made without one
+    would otherwise wait forever on a stalled connection
+    '''
+
+    def __init__(self, timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT, **kwargs) -> None:
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        return super().send(request, **kwargs)
+
+
+# ================================================================
+#   create_session()
+# ================================================================
+
+def create_session(pool_size: int = DEFAULT_POOL_SIZE, pool_sizes: Dict[str, int] = None, max_retries: int = DEFAULT_MAX_RETRIES, backoff_factor: float = DEFAULT_BACKOFF_FACTOR, timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT, retry_post_hosts: Iterable[str] = None) -> requests.Session:
+    '''
+    Creates the session shared by every request of a platform, its
+    connections are kept alive and reused across requests
+        Args:
+            pool_size (int): Connections kept alive per host
+            pool_sizes (Dict[str, int]): Pool size of specific hosts (e.g. {'api-entpay.noovo.ca': 16})
+            max_retries (int): Retries of failed connections and transient errors (0 to disable)
+            backoff_factor (float): Delay between retries, doubled after each retry
+            timeout (Union[float, Tuple[float, float]]): Default (connect, read) timeouts in seconds
+            retry_post_hosts (Iterable[str]): Hosts whose POST requests are safe to retry (e.g. a GraphQL API)
+        Returns:
+            requests.Session: The session
+    '''
+    def make_adapter(size: int, methods: frozenset) -> TransportAdapter:
+        retries = Retry(total=max_retries, backoff_factor=backoff_factor, status_forcelist=RETRY_STATUSES,
+                        allowed_methods=methods, respect_retry_after_header=True, raise_on_status=False)
+        return TransportAdapter(timeout=timeout, pool_connections=size, pool_maxsize=size,
+                                max_retries=retries)
+
+    session = requests.Session()
+    adapter = make_adapter(pool_size, RETRY_METHODS)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    pool_sizes = pool_sizes or {}
+    retry_post_hosts = set(retry_post_hosts or [])
+    for host in set(pool_sizes) | retry_post_hosts:
+        # the longest matching prefix wins, the host gets its own pools
+        methods = RETRY_POST_METHODS if host in retry_post_hosts else RETRY_METHODS
+        session.mount('https://{}/'.format(host), make_adapter(max(pool_sizes.get(host, pool_size), 1), methods))
+    logger.debug('Session created (pool size {}, {} retries)'.format(pool_size, max_retries))
+    return session
@@ -0,0 +1,316 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from datetime import datetime, timezone
+from typing import Any, Callable, Deque, Dict, List, Union
+import json
+import logging
+import os
+import tempfile
+
+from .common.category import Category
+from .common.media import MediaEpisode
+from .common.platform import Platform
+from .common.result_info import ResultInfo, MovieResultInfo, SerieResultInfo
+from .common.search_result import SearchResult
+
+# Logger
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+
+
+class CatalogueCrawler():
+    '''
+    Walks the whole catalogue of a platform: screens, rotators and grids
+    are explored breadth-first, then the infos of every title found are
+    fetched. Progress is checkpointed to disk so an interrupted crawl
+    resumes where it stopped.
+    '''
+
+    # ================================================================
+    #   __init__()
+    # ================================================================
+
+    def __init__(self, platform: Platform, checkpoint_file: str = None, max_workers: int = 8, checkpoint_interval: int = 50):
+        '''
+        Initialises the crawler.
+            Args:
+                platform (Platform): The client used to fetch the catalogue
+                checkpoint_file (str): File storing the crawl progress (defaults to <cache_dir>/crawl.json)
+                max_workers (int): Maximum number of categories/titles fetched at the same time
+                checkpoint_interval (int): Number of fetched elements between two checkpoints
+        '''
+        self.platform: Platform = platform
+        self.checkpoint_file: str = checkpoint_file or os.path.join(
+            platform.cache_dir, 'crawl.json')
+        self.max_workers: int = max(1, max_workers)
+        self.checkpoint_interval: int = max(1, checkpoint_interval)
+        self._reset_state()
+
+    # ================================================================
+    #   _reset_state()
+    # ================================================================
+
+    def _reset_state(self) -> None:
+        self.frontier: Deque[Dict[str, str]] = deque()
+        self.visited = set()
+        self.categories: Dict[str, Dict[str, Any]] = {}
+        self.pending_titles: Deque[str] = deque()
+        self.titles: Dict[str, Dict[str, Any]] = {}
+        self.results: Dict[str, Dict[str, Any]] = {}
+        self.failed: List[Any] = []
+        self._seen_titles = set()
+        self._running: Dict[Future, Any] = {}
+        self._completed: int = 0
+
+    # ===================================================================
+    #
+    #   CRAWL
+    #
+    # ===================================================================
+
+    # ================================================================
+    #   crawl()
+    # ================================================================
+
+    def crawl(self) -> Dict[str, Any]:
+        '''
+        Crawls the catalogue, resuming from the checkpoint if there is one
+            Returns:
+                Dict[str, Any]: The catalogue snapshot
+        '''
+        if not self._load_checkpoint():
+            self._enqueue_category({'type': 'root', 'id': '', 'title': ''})
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                logger.info('Walking categories...')
+                self._run(executor, self.frontier, self._fetch_category, self._add_category)
+                logger.info('Fetching {} titles...'.format(len(self.pending_titles)))
+                self._run(executor, self.pending_titles, self._fetch_title, self._add_title)
+        finally:
+            self._save_checkpoint()
+        snapshot = self.get_snapshot()
+        if len(self.failed) == 0:
+            os.remove(self.checkpoint_file)
+        else:
+            logger.warning('{} elements could not be fetched, they will be retried on the next crawl'.format(
+                len(self.failed)))
+        logger.info('Crawl done: {} categories, {} titles'.format(
+            len(self.categories), len(self.titles)))
+        return snapshot
+
+    # ================================================================
+    #   get_snapshot()
+    # ================================================================
+
+    def get_snapshot(self) -> Dict[str, Any]:
+        return {
+            'version': SNAPSHOT_VERSION,
+            'platform': self.platform.tag,
+            'created': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'categories': self.categories,
+            'results': self.results,
+            'titles': self.titles
+        }
+
+    # ================================================================
+    #   _run()
+    # ================================================================
+
+    def _run(self, executor: ThreadPoolExecutor, queue: Deque[Any], fetch: Callable[[Any], Any], add: Callable[[Any, Any], None]) -> None:
+        '''
+        Fetches every element of a queue with the worker pool. The queue
+        may grow while elements are added.
+        '''
+        while len(queue) > 0 or len(self._running) > 0:
+            while len(queue) > 0 and len(self._running) < self.max_workers:
+                element = queue.popleft()
+                self._running[executor.submit(fetch, element)] = element
+            done, _ = wait(list(self._running), return_when=FIRST_COMPLETED)
+            for future in done:
+                element = self._running[future]
+                try:
+                    add(element, future.result())
+                except Exception as e:
+                    logger.error('Unable to fetch {}: {}'.format(element, e))
+                    self.failed.append(element)
+                # Removed last, an interrupted element is checkpointed as not fetched
+                del self._running[future]
+                self._completed += 1
+                if self._completed % self.checkpoint_interval == 0:
+                    self._save_checkpoint()
+
+    # ===================================================================
+    #
+    #   CATEGORIES
+    #
+    # ===================================================================
+
+    def _fetch_category(self, category: Dict[str, str]) -> List[Union[Category, SearchResult]]:
+        if category['type'] == 'root':
+            return self.platform.get_root_categories()
+        return self.platform.get_elements(Category(
+            type=category['type'], title=category['title'], id=category['id']))
+
+    def _add_category(self, category: Dict[str, str], elements: List[Union[Category, SearchResult]]) -> None:
+        if elements is None:
+            raise ValueError('no elements returned')
+        children = []
+        titles = []
+        for element in elements:
+            if isinstance(element, Category):
+                children.append(self._enqueue_category(
+                    {'type': element.type, 'id': element.id, 'title': element.title}))
+            elif isinstance(element, SearchResult):
+                titles.append(element.id)
+                self.results[element.id] = {
+                    'title': element.title,
+                    'image': element.image,
+                    'requirements': element.requirements
+                }
+                if element.id not in self._seen_titles:
+                    self._seen_titles.add(element.id)
+                    self.pending_titles.append(element.id)
+        self.categories[self._get_key(category)] = {
+            'type': category['type'],
+            'id': category['id'],
+            'title': category['title'],
+            'children': children,
+            'titles': titles
+        }
+
+    def _enqueue_category(self, category: Dict[str, str]) -> str:
+        key = self._get_key(category)
+        if key not in self.visited:
+            self.visited.add(key)
+            self.frontier.append(category)
+        return key
+
+    @staticmethod
+    def _get_key(category: Dict[str, str]) -> str:
+        return '{}:{}'.format(category['type'], category['id'])
+
+    # ===================================================================
+    #
+    #   TITLES
+    #
+    # ===================================================================
+
+    def _fetch_title(self, content_id: str) -> Dict[str, Union[MovieResultInfo, SerieResultInfo]]:
+        # the snapshot only keeps the fields of the playback profile
+        return self.platform.get_result_infos_id(content_id, profile='playback')
+
+    def _add_title(self, content_id: str, infos: Dict[str, Union[MovieResultInfo, SerieResultInfo]]) -> None:
+        if infos is None:
+            raise ValueError('no infos returned')
+        self.titles[content_id] = {
+            version: self._compact_infos(info) for version, info in infos.items()
+        }
+
+    @staticmethod
+    def _compact_infos(info: ResultInfo) -> Dict[str, Any]:
+        medias = []
+        for key, media in info.medias.items():
+            compact = {
+                'key': key,
+                'title': media.title,
+                'play_id': media.play_id,
+                'destination': media.additionnal_infos.get('destination'),
+                'duration': media.duration,
+                'has_access': media.has_access
+            }
+            if isinstance(media, MediaEpisode):
+                compact['season'] = media.season
+                compact['episode'] = media.episode
+            medias.append(compact)
+        compact = {
+            'type': info.type,
+            'title': info.title,
+            'summary': info.summary,
+            'description': info.description,
+            'image': info.image,
+            'medias': medias
+        }
+        if isinstance(info, MovieResultInfo):
+            compact['year'] = info.year
+        return compact
+
+    # ===================================================================
+    #
+    #   CHECKPOINT
+    #
+    # ===================================================================
+
+    def _load_checkpoint(self) -> bool:
+        if not os.path.isfile(self.checkpoint_file):
+            return False
+        try:
+            with open(self.checkpoint_file, 'r', encoding='utf-8') as file:
+                checkpoint = json.load(file)
+            self.visited = set(checkpoint['visited'])
+            self.frontier = deque(checkpoint['frontier'])
+            self.categories = checkpoint['categories']
+            self.pending_titles = deque(checkpoint['pending_titles'])
+            self.titles = checkpoint['titles']
+            # checkpoints written before the results were crawled have none
+            self.results = checkpoint.get('results', {})
+            self._seen_titles = set(self.titles) | set(self.pending_titles)
+        except:
+            logger.warning('Checkpoint corrupted, starting a new crawl...')
+            self._reset_state()
+            return False
+        # Retry what failed during the previous crawl
+        for element in checkpoint.get('failed', []):
+            if isinstance(element, dict):
+                self.frontier.append(element)
+            else:
+                self._seen_titles.add(element)
+                self.pending_titles.append(element)
+        logger.info('Resuming crawl: {} categories and {} titles left'.format(
+            len(self.frontier), len(self.pending_titles)))
+        return True
+
+    def _save_checkpoint(self) -> None:
+        # Elements being fetched are saved as not fetched yet
+        running = list(self._running.values())
+        checkpoint = {
+            'visited': list(self.visited),
+            'frontier': list(self.frontier) + [x for x in running if isinstance(x, dict)],
+            'categories': self.categories,
+            'pending_titles': list(self.pending_titles) + [x for x in running if not isinstance(x, dict)],
+            'results': self.results,
+            'titles': self.titles,
+            'failed': self.failed
+        }
+        save_json(self.checkpoint_file, checkpoint)
+        logger.debug('Checkpoint saved ({} categories, {} titles)'.format(
+            len(self.categories), len(self.titles)))
+
+
+# ===================================================================
+#
+#   SNAPSHOTS
+#
+# ===================================================================
+
+def save_json(path: str, obj: Any) -> None:
+    '''
+    Writes a JSON file atomically
+    '''
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as file:
+            json.dump(obj, file, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, path)
+    except:
+        os.remove(tmp_path)
+        raise
+
+
+def load_snapshot(path: str) -> Dict[str, Any]:
+    with open(path, 'r', encoding='utf-8') as file:
+        snapshot = json.load(file)
+    if snapshot.get('version') != SNAPSHOT_VERSION:
+        raise ValueError('Unsupported snapshot version: {}'.format(snapshot.get('version')))
+    return snapshot
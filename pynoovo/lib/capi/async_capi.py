@@ -0,0 +1,16 @@
+from ...common.play_infos import PlayInfos
+from .capi import CAPI, HEADERS
+import httpx
+import logging
+
+# Logger
+logger = logging.getLogger(__name__)
+
+
+class AsyncCAPI():
+  @staticmethod
+  async def get_play_infos(client: httpx.AsyncClient, destination: str, content_id: str, language: str, token: str = None, filter: str = None) -> PlayInfos:
+    logger.debug('Making CAPI request...')
+    url = CAPI.get_play_infos_url(destination, content_id, language)
+    response = await client.get(url, headers=HEADERS)
+    return CAPI.parse_play_infos(response, destination, content_id, token=token, filter=filter)
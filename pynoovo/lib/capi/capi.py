@@ -1,5 +1,5 @@
-import json
 from ...common.play_infos import PlayInfos
+from ...common.json_backend import response_json
 import requests
 import logging
 
@@ -18,16 +18,27 @@ HEADERS = {
 
 class CAPI():
   @staticmethod
-  def get_play_infos(destination: str, content_id: str, language: str, token: str = None, filter: str = None) -> PlayInfos:
+  def get_play_infos(destination: str, content_id: str, language: str, token: str = None, filter: str = None, session: requests.Session = None) -> PlayInfos:
     # get package id
     logger.debug('Making CAPI request...')
+    url = CAPI.get_play_infos_url(destination, content_id, language)
+    # the platform session keeps the connection to capi alive between calls
+    requester = requests if session is None else session
+    response = requester.get(url=url, headers=HEADERS)
+    return CAPI.parse_play_infos(response, destination, content_id, token=token, filter=filter)
+
+  @staticmethod
+  def get_play_infos_url(destination: str, content_id: str, language: str) -> str:
     url = CAPI.get_content_url(destination, content_id)
     url += '?$lang={}&$include=[Images,Authentication,AdTarget,Season,ContentPackages,Media,Owner,Omniture,Tags,ChannelAffiliate]'.format(language)
-    response = requests.get(url=url, headers=HEADERS)
+    return url
+
+  @staticmethod
+  def parse_play_infos(response: requests.Response, destination: str, content_id: str, token: str = None, filter: str = None) -> PlayInfos:
     if response.status_code != 200:
       logger.error('Bad response ({})'.format(str(response.status_code)))
       return None
-    package_id = str(json.loads(response.text)['ContentPackages'][0]['Id'])
+    package_id = str(response_json(response)['ContentPackages'][0]['Id'])
     logger.debug('Package ID: {}'.format(package_id))
     # suffixes
     manifest_url_suffix = []
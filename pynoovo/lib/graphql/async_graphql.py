@@ -0,0 +1,462 @@
+import asyncio
+
+from pynoovo.common.category import Category
+
+from ...common.result_info import ResultInfo, SerieResultInfo, MovieResultInfo
+from ...common.search_result import SearchResult
+from ...common.cache import ResponseCache
+from ...common.json_backend import response_json
+
+import httpx
+import logging
+from .consts import HEADERS, PLAYBACK_LANGUAGES, DEFAULT_QUERY_PROFILE
+from .graphql import GraphQL, _revalidating
+from .cache import StaleWhileRevalidateCache
+from .batching import make_batch_template, batch_variables, split_batch_response
+from .templates import QueryTemplate, ROOT_SCREEN_TEMPLATE, SCREEN_TEMPLATE, COLLECTION_TEMPLATE, GRID_TEMPLATE, SEARCH_TEMPLATE, MEDIA_TEMPLATES, SEASON_TEMPLATES
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Tuple, Union
+
+# Logger
+logger = logging.getLogger(__name__)
+
+
+class AsyncGraphQL(GraphQL):
+    '''
+    asyncio twin of GraphQL. Requests are made with an httpx.AsyncClient,
+    response parsing is shared with the synchronous client.
+    '''
+
+    # ================================================================
+    #   __init__()
+    # ================================================================
+    def __init__(self, client: httpx.AsyncClient, url: str, tag: str, metadata_language: str = 'fr', max_concurrency: int = 64, cache: ResponseCache = None, cache_ttls: Dict[str, float] = None, browse_cache: StaleWhileRevalidateCache = None):
+        super().__init__(None, url, tag, metadata_language=metadata_language,
+                         max_workers=max_concurrency, cache=cache, cache_ttls=cache_ttls,
+                         browse_cache=browse_cache)
+        self.client: httpx.AsyncClient = client
+        self._request_slots = asyncio.Semaphore(self.max_workers)
+
+    # ===================================================================
+    #
+    #   CATEGORIES
+    #
+    # ===================================================================
+
+    # ================================================================
+    #   get_root_categories()
+    # ================================================================
+
+    async def get_root_categories(self) -> List[Category]:
+        '''
+        List home page categories
+            Returns:
+                List[Category]: A list of all categories.
+        '''
+        if self.browse_cache is not None:
+            return await self.browse_cache.get_async(
+                self._browse_key('root'),
+                lambda: self.get_elements_screen(id=None, root=True),
+                lambda: self._revalidate_async(self.get_elements_screen, None, True))
+        return await self.get_elements_screen(id=None, root=True)
+
+    # ================================================================
+    #   get_elements()
+    # ================================================================
+
+    async def get_elements(self, category: Category) -> List[Union[Category, ResultInfo]]:
+        '''
+        Returns category's elements
+            Args:
+                category (Category): The category
+            Returns:
+                List[Union[Category, ResultInfo]: A list of all the elements.
+        '''
+        if category is None:
+            logger.error('No category provided')
+            return None
+        if self.browse_cache is not None:
+            return await self.browse_cache.get_async(
+                self._browse_key(category.type, category.id),
+                lambda: self._get_elements(category),
+                lambda: self._revalidate_async(self._get_elements, category))
+        return await self._get_elements(category)
+
+    # ================================================================
+    #   _get_elements()
+    # ================================================================
+
+    async def _get_elements(self, category: Category) -> List[Union[Category, ResultInfo]]:
+        logger.debug(
+            'Listing elements of category "{}"'.format(category.title))
+        if category.type == 'screen':
+            return await self.get_elements_screen(category.id)
+        elif category.type == 'rotator':
+            return await self.get_elements_rotator(category.id)
+        elif category.type == 'grid':
+            return await self.get_elements_grid(category.id)
+
+    # ================================================================
+    #   _revalidate_async()
+    # ================================================================
+
+    async def _revalidate_async(self, func: Callable[..., Awaitable[Any]], *args) -> Any:
+        # Refreshes run in their own task, the context change does not leak
+        _revalidating.set(True)
+        return await func(*args)
+
+    # ================================================================
+    #   get_elements_screen()
+    # ================================================================
+
+    async def get_elements_screen(self, id: str, root: bool = False) -> List[Union[Category, ResultInfo]]:
+        '''
+        Returns screen category's elements
+            Args:
+                id (str): The screen ID
+            Returns:
+                List[Union[Category, ResultInfo]: A list of all the elements.
+        '''
+        if not root and (id is None or id.strip() == ''):
+            logger.error('No ID provided')
+            return None
+
+        # Request
+        # =========
+        if root:
+            template, variables = ROOT_SCREEN_TEMPLATE, None
+        else:
+            template, variables = SCREEN_TEMPLATE, {'id': id}
+        response = await self._make_request(
+            template, variables, playback_language=self.metadata_language)
+        if response.status_code != 200:
+            logger.error('Bad response received ({})'.format(
+                response.status_code))
+            return None
+
+        # Parse
+        # =======
+        elements, next_category = self._parse_screen(response, root)
+        if next_category is None:
+            return elements
+        next_elements = await self.get_elements(next_category)
+        if next_elements is None:
+            return elements if root else None
+        return elements + next_elements
+
+    # ================================================================
+    #   get_elements_grid()
+    # ================================================================
+
+    async def get_elements_grid(self, id: str) -> List[Union[Category, ResultInfo]]:
+        '''
+        Returns grid category's elements
+            Args:
+                id (str): The grid ID
+            Returns:
+                List[Union[Category, ResultInfo]: A list of all the elements.
+        '''
+        if id is None or id.strip() == '':
+            logger.error('No ID provided')
+            return None
+        response = await self._make_request(
+            GRID_TEMPLATE, {'id': id}, playback_language=self.metadata_language)
+        if response.status_code != 200:
+            logger.error('Bad response received ({})'.format(
+                response.status_code))
+            return None
+        return self._parse_collection(response, 'grid')
+
+    # ================================================================
+    #   get_elements_rotator()
+    # ================================================================
+
+    async def get_elements_rotator(self, id: str) -> List[Union[Category, ResultInfo]]:
+        '''
+        Returns rotator category's elements
+            Args:
+                id (str): The rotator ID
+            Returns:
+                List[Union[Category, ResultInfo]: A list of all the elements.
+        '''
+        if id is None or id.strip() == '':
+            logger.error('No ID provided')
+            return None
+        response = await self._make_request(
+            COLLECTION_TEMPLATE, {'id': id}, playback_language=self.metadata_language)
+        if response.status_code != 200:
+            logger.error('Bad response received ({})'.format(
+                response.status_code))
+            return None
+        return self._parse_collection(response, 'rotator')
+
+    # ===================================================================
+    #
+    #   SEARCH
+    #
+    # ===================================================================
+
+    # ================================================================
+    #   search()
+    # ================================================================
+
+    async def search(self, input: str) -> List[SearchResult]:
+        '''
+        Search a title.
+            Args:
+                input (str): The search terms
+            Returns:
+                List[SearchResult]: A list of all the search results. First element is the most relevent one.
+        '''
+        if input is None or len(input.strip()) == 0:
+            logger.info('No title provided')
+            return []
+        elif len(input.strip()) < 3:
+            logger.info('Title must be at least 3 characters long')
+            return []
+        results = self._search_index(input)
+        if results is not None:
+            return results
+        response = await self._make_request(
+            SEARCH_TEMPLATE, {'searchTerm': input.strip()})
+        if response.status_code != 200:
+            logger.error('Bad response received ({})'.format(
+                response.status_code))
+            return None
+        return self._parse_search(response, input)
+
+    # ===================================================================
+    #
+    #   RESULT INFOS
+    #
+    # ===================================================================
+
+    # ================================================================
+    #   get_result_infos()
+    # ================================================================
+
+    async def get_result_infos(self, result: SearchResult, profile: str = None) -> Dict[str, Union[MovieResultInfo, SerieResultInfo]]:
+        '''
+        Get more infos about a specific search result
+            Args:
+                result (SearchResult): The search result
+                profile (str): The query profile (minimal, playback or full), defaults to query_profile
+            Returns:
+                Dict[str, Union[MovieResultInfo, SerieResultInfo]]: A dictionary of all the versions available (french/english) and corresponding infos
+        '''
+        return await self.get_result_infos_id(result.id, profile)
+
+    # ================================================================
+    #   get_result_infos_id()
+    # ================================================================
+
+    async def get_result_infos_id(self, content_id: str, profile: str = None) -> Dict[str, Union[MovieResultInfo, SerieResultInfo]]:
+        '''
+        Get more infos about a specific search result
+            Args:
+                id (str): The result ID
+                profile (str): The query profile (minimal, playback or full), defaults to query_profile
+            Returns:
+                Dict[str, Union[MovieResultInfo, SerieResultInfo]]: A dictionary of all the versions available (french/english) and corresponding infos
+        '''
+        logger.debug('Getting infos for "{}"...'.format(content_id))
+        if content_id is None or len(content_id.strip()) == 0:
+            logger.info('No Content ID provided')
+            return []
+        profile = self._get_query_profile(profile)
+        infos = {}
+        versions = list(PLAYBACK_LANGUAGES.keys())
+        responses = await asyncio.gather(*[
+            self._get_result_infos_version(content_id, version, infos, profile) for version in versions])
+        return self._merge_versions(versions, responses, infos)
+
+    # ================================================================
+    #   get_results_infos_ids()
+    # ================================================================
+
+    async def get_results_infos_ids(self, content_ids: Iterable[str], profile: str = None) -> Dict[str, Dict[str, Union[MovieResultInfo, SerieResultInfo]]]:
+        '''
+        Get more infos about several results, max_batch_size results per request
+            Args:
+                content_ids (Iterable[str]): The result IDs
+                profile (str): The query profile (minimal, playback or full), defaults to query_profile
+            Returns:
+                Dict[str, Dict[str, Union[MovieResultInfo, SerieResultInfo]]]: The infos of each result, as returned by get_result_infos_id()
+        '''
+        content_ids = list(dict.fromkeys(
+            content_id for content_id in content_ids if content_id is not None and len(content_id.strip()) > 0))
+        logger.debug('Getting infos for {} results...'.format(len(content_ids)))
+        profile = self._get_query_profile(profile)
+        versions = list(PLAYBACK_LANGUAGES.keys())
+        infos = {content_id: {} for content_id in content_ids}
+        responses = {content_id: {} for content_id in content_ids}
+        size = max(1, self.max_batch_size)
+        await asyncio.gather(*[
+            self._get_media_batch(content_ids[index:index + size], version, infos, responses, profile)
+            for version in versions
+            for index in range(0, len(content_ids), size)])
+        return {content_id: self._merge_versions(
+                    versions, [responses[content_id][version] for version in versions], infos[content_id])
+                for content_id in content_ids}
+
+    # ================================================================
+    #   _get_media_batch()
+    # ================================================================
+
+    async def _get_media_batch(self, content_ids: List[str], version: str, infos: Dict[str, Dict[str, Union[MovieResultInfo, SerieResultInfo]]], responses: Dict[str, Dict[str, httpx.Response]], profile: str) -> None:
+        results = [None] * len(content_ids)
+        response = None
+        if len(content_ids) > 1:
+            logger.debug('Making a GraphQL request for {} results ({})...'.format(
+                len(content_ids), version))
+            template = make_batch_template(MEDIA_TEMPLATES[profile], 'axisMedia', len(content_ids))
+            try:
+                response = await self._make_request(
+                    template, batch_variables(content_ids), playback_language=PLAYBACK_LANGUAGES[version])
+                results = split_batch_response(
+                    response.status_code, response.content, len(content_ids))
+            except httpx.HTTPError as e:
+                logger.warning('Batch request failed ({}), requesting the results one by one'.format(e))
+        # the missing results are requested concurrently
+        missing = [content_id for content_id, result in zip(content_ids, results) if result is None]
+        missing_responses = await asyncio.gather(*[
+            self._get_result_infos_version(content_id, version, infos[content_id], profile) for content_id in missing])
+        for content_id, missing_response in zip(missing, missing_responses):
+            responses[content_id][version] = missing_response
+        for content_id, result in zip(content_ids, results):
+            if result is None:
+                continue
+            responses[content_id][version] = response
+            try:
+                await self._parse_media_result(result, version, infos[content_id], profile)
+            except:
+                logger.error('Failed to parse {} response of {}'.format(version, content_id))
+                infos[content_id].pop(version, None)
+
+    # ================================================================
+    #   _parse_media_result()
+    # ================================================================
+
+    async def _parse_media_result(self, result: Dict[str, Any], version: str, infos: Dict[str, Union[MovieResultInfo, SerieResultInfo]], profile: str = DEFAULT_QUERY_PROFILE) -> None:
+        if result['mediaType'] == 'SERIES':
+            infos[version] = await self._parse_serie_result(result, version, profile)
+        elif result['mediaType'] == 'MOVIE':
+            infos[version] = self._parse_movie_result(result, version)
+
+    # ================================================================
+    #   _get_result_infos_version()
+    # ================================================================
+
+    async def _get_result_infos_version(self, content_id: str, version: str, infos: Dict[str, Union[MovieResultInfo, SerieResultInfo]], profile: str = DEFAULT_QUERY_PROFILE) -> httpx.Response:
+        logger.debug('Making a GraphQL request for {} version...'.format(version))
+        response = await self._make_request(
+            MEDIA_TEMPLATES[profile], {'id': content_id}, playback_language=PLAYBACK_LANGUAGES[version])
+        if response.status_code != 200:
+            logger.debug('Skipping {} version because of a bad response ({})'.format(
+                version, response.status_code))
+            return response
+        try:
+            logger.debug('Parsing {} response...'.format(version))
+            response_parsed = response_json(response)['data']['axisMedia']
+            await self._parse_media_result(response_parsed, version, infos, profile)
+        except:
+            logger.error('Failed to parse {} response'.format(version))
+            infos.pop(version, None)
+        return response
+
+    # ================================================================
+    #   _parse_serie_result()
+    # ================================================================
+
+    async def _parse_serie_result(self, result: Dict[str, Any], version: str, profile: str = DEFAULT_QUERY_PROFILE) -> SerieResultInfo:
+        infos, seasons = self._parse_serie_infos(result)
+        seasons_episodes = await self._get_seasons_episodes(seasons, version, profile)
+        for (season_num, _), episodes in zip(seasons, seasons_episodes):
+            if episodes is None:
+                continue
+            self._parse_season_episodes(infos, episodes, season_num, version)
+        return infos
+
+    # ================================================================
+    #   _get_seasons_episodes()
+    # ================================================================
+
+    async def _get_seasons_episodes(self, seasons: List[Tuple[int, str]], version: str, profile: str = DEFAULT_QUERY_PROFILE) -> List[List[Dict[str, Any]]]:
+        if self.max_batch_size <= 1 or len(seasons) <= 1:
+            return await asyncio.gather(*[
+                self._get_season_episodes(season_id, season_num, version, profile) for season_num, season_id in seasons])
+        batches_episodes = await asyncio.gather(*[
+            self._get_season_batch(seasons[index:index + self.max_batch_size], version, profile)
+            for index in range(0, len(seasons), self.max_batch_size)])
+        return [episodes for batch_episodes in batches_episodes for episodes in batch_episodes]
+
+    # ================================================================
+    #   _get_season_batch()
+    # ================================================================
+
+    async def _get_season_batch(self, seasons: List[Tuple[int, str]], version: str, profile: str) -> List[List[Dict[str, Any]]]:
+        template = make_batch_template(SEASON_TEMPLATES[profile], 'axisSeason', len(seasons))
+        logger.debug('Making a GraphQL request for seasons {} ({})...'.format(
+            ', '.join(str(season_num) for season_num, _ in seasons), version))
+        try:
+            response = await self._make_request(
+                template, batch_variables([season_id for _, season_id in seasons]),
+                playback_language=PLAYBACK_LANGUAGES[version])
+            results = split_batch_response(response.status_code, response.content, len(seasons))
+        except httpx.HTTPError as e:
+            logger.warning('Batch request failed ({}), requesting the seasons one by one'.format(e))
+            results = [None] * len(seasons)
+        seasons_episodes = [None if result is None else result.get('episodes') for result in results]
+        # the missing seasons are requested concurrently
+        missing = [index for index, episodes in enumerate(seasons_episodes) if episodes is None]
+        missing_episodes = await asyncio.gather(*[
+            self._get_season_episodes(seasons[index][1], seasons[index][0], version, profile) for index in missing])
+        for index, episodes in zip(missing, missing_episodes):
+            seasons_episodes[index] = episodes
+        return seasons_episodes
+
+    # ================================================================
+    #   _get_season_episodes()
+    # ================================================================
+
+    async def _get_season_episodes(self, season_id: str, season_num: int, version: str, profile: str = DEFAULT_QUERY_PROFILE) -> List[Dict[str, Any]]:
+        logger.debug('Making a GraphQL request for season {} ({})...'.format(
+            str(season_num), version))
+        response = await self._make_request(
+            SEASON_TEMPLATES[profile], {'id': season_id}, playback_language=PLAYBACK_LANGUAGES[version])
+        return self._parse_season_response(response)
+
+    # ================================================================
+    #   _make_request()
+    # ================================================================
+
+    async def _make_request(self, template: QueryTemplate, variables: Dict[str, Any] = None, playback_language: str = 'FRENCH') -> httpx.Response:
+        data = self._build_request_data(template, variables, playback_language)
+        # a disk backend is read and written from a worker thread, not on the event loop
+        blocking = (self.cache is not None and self.cache.blocking
+                    and self.cache_ttls.get(data['operationName'], 0) > 0)
+        if blocking:
+            cache_key, response = await asyncio.to_thread(self._get_cached_response, data)
+        else:
+            cache_key, response = self._get_cached_response(data)
+        if response is not None:
+            return response
+        async with self._request_slots:
+            response = await self._post(template, data['variables'])
+        if blocking and cache_key is not None:
+            await asyncio.to_thread(self._cache_response, data, cache_key, response)
+        else:
+            self._cache_response(data, cache_key, response)
+        return response
+
+    # ================================================================
+    #   _post()
+    # ================================================================
+
+    async def _post(self, template: QueryTemplate, variables: Dict[str, Any]) -> httpx.Response:
+        if self.persisted_queries:
+            response = await self.client.post(
+                self.url, headers=HEADERS, content=template.body(variables, persisted=True))
+            if not self._check_persisted_query(response):
+                return response
+        return await self.client.post(
+            self.url, headers=HEADERS, content=template.body(variables, register=self.persisted_queries))
@@ -0,0 +1,112 @@
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+import logging
+
+from ...common.json_backend import loads
+from .templates import QueryTemplate
+
+# Logger
+logger = logging.getLogger(__name__)
+
+
+# ===================================================================
+#
+#   ALIASED BATCHES
+#
+#   N lookups of the same root field are merged in one document:
+#     query axisSeason(..., $id0: ID!, $id1: ID!) @uaContext(...) {
+#       b0: axisSeason(id: $id0) { ... }
+#       b1: axisSeason(id: $id1) { ... }
+#     }
+#
+# ===================================================================
+
+def batch_alias(index: int) -> str:
+    return 'b{}'.format(index)
+
+
+# ================================================================
+#   make_batch_query()
+# ================================================================
+
+@lru_cache(maxsize=64)
+def make_batch_query(query: str, field: str, count: int) -> str:
+    '''
+    Rewrites a single lookup query (field(id: $id)) into an aliased batch
+        Args:
+            query (str): The single lookup query
+            field (str): The looked up root field (e.g. axisSeason)
+            count (int): The number of lookups
+        Returns:
+            str: The batch query
+    '''
+    query = query.replace('$id: ID!', ', '.join(
+        '$id{}: ID!'.format(index) for index in range(count)), 1)
+    start = query.index('{}(id: $id)'.format(field))
+    # Selection set of the field, up to its matching brace
+    depth = 0
+    end = query.index('{', start)
+    while True:
+        if query[end] == '{':
+            depth += 1
+        elif query[end] == '}':
+            depth -= 1
+            if depth == 0:
+                break
+        end += 1
+    selection = query[query.index('{', start):end + 1]
+    lookups = ' '.join('{}: {}(id: $id{}) {}'.format(
+        batch_alias(index), field, index, selection) for index in range(count))
+    return query[:start] + lookups + query[end + 1:]
+
+
+# ================================================================
+#   make_batch_template()
+# ================================================================
+
+@lru_cache(maxsize=64)
+def make_batch_template(template: QueryTemplate, field: str, count: int) -> QueryTemplate:
+    '''
+    Builds the template of an aliased batch from a single lookup template
+        Args:
+            template (QueryTemplate): The single lookup template
+            field (str): The looked up root field (e.g. axisSeason)
+            count (int): The number of lookups
+        Returns:
+            QueryTemplate: The batch template, its IDs are given by batch_variables()
+    '''
+    variables = {key: value for key, value in template.variables.items() if key != 'id'}
+    return QueryTemplate(template.operation_name, make_batch_query(template.query, field, count), variables)
+
+
+# ================================================================
+#   batch_variables()
+# ================================================================
+
+def batch_variables(ids: List[str]) -> Dict[str, str]:
+    return {'id{}'.format(index): id for index, id in enumerate(ids)}
+
+
+# ================================================================
+#   split_batch_response()
+# ================================================================
+
+def split_batch_response(status_code: int, content: bytes, count: int) -> List[Optional[Dict[str, Any]]]:
+    '''
+    Splits an aliased batch response back into per-ID results
+        Args:
+            status_code (int): The response status code
+            content (bytes): The response body
+            count (int): The number of lookups
+        Returns:
+            List[Optional[Dict]]: The result of each lookup, None for the failed ones
+    '''
+    if status_code != 200:
+        logger.debug('Bad batch response ({})'.format(status_code))
+        return [None] * count
+    try:
+        data = loads(content).get('data') or {}
+    except:
+        logger.debug('Error while parsing batch response')
+        return [None] * count
+    return [data.get(batch_alias(index)) for index in range(count)]
@@ -0,0 +1,232 @@
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from copy import deepcopy
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+
+from ...common.json_backend import loads
+
+# Logger
+logger = logging.getLogger(__name__)
+
+
+# ===================================================================
+#
+#   KEYS
+#
+# ===================================================================
+
+def make_cache_key(data: Dict[str, Any]) -> str:
+    '''
+    Builds the cache key of a GraphQL request
+        Args:
+            data (Dict): The full request data (operationName, variables, query)
+        Returns:
+            str: The cache key
+    '''
+    # variables already hold subscriptions, language and playbackLanguage
+    raw = json.dumps([data['operationName'], data['variables'], data.get('query')],
+                     sort_keys=True, separators=(',', ':'))
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+# ===================================================================
+#
+#   RESPONSES
+#
+# ===================================================================
+
+class CachedResponse():
+    '''
+    Response replayed from the cache, exposes the parts of
+    requests.Response used by the clients
+    '''
+
+    def __init__(self, content: bytes, status_code: int = 200):
+        self.status_code: int = status_code
+        self.content: bytes = content
+
+    @property
+    def text(self) -> str:
+        return self.content.decode('utf-8')
+
+    def json(self) -> Any:
+        return loads(self.content)
+
+
+# ===================================================================
+#
+#   STALE-WHILE-REVALIDATE
+#
+# ===================================================================
+
+class StaleWhileRevalidateCache():
+    '''
+    Keeps the last known value of expensive lookups (e.g. category trees).
+    Values older than max_age are still returned immediately, and refreshed
+    in the background. Concurrent misses of a key share a single load, and
+    every caller gets its own copy of the value.
+    '''
+
+    def __init__(self, max_age: float = 900, max_entries: int = 512, max_workers: int = 2):
+        self.max_age: float = max_age
+        self.max_entries: int = max_entries
+        self.max_workers: int = max_workers
+        self.hits: int = 0
+        self.misses: int = 0
+        self.refreshes: int = 0
+        self.refresh_errors: int = 0
+        self._entries: 'OrderedDict[Hashable, Tuple[float, Any]]' = OrderedDict()
+        self._refreshing = set()
+        # in-flight loads, shared by the callers missing the same key
+        self._loading: Dict[Hashable, Future] = {}
+        self._loading_async: Dict[Hashable, asyncio.Task] = {}
+        # background refreshes of get_async(), referenced until they are done
+        self._tasks = set()
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor = None
+
+    def get(self, key: Hashable, loader: Callable[[], Any], refresher: Callable[[], Any] = None) -> Any:
+        '''
+        Returns the value of a key, loading it on a miss
+            Args:
+                key (Hashable): The key
+                loader (Callable): Loads the value, returns None on failure
+                refresher (Callable): Loads the value for background refreshes (defaults to loader)
+            Returns:
+                Any: The (possibly stale) value
+        '''
+        entry, stale = self._lookup(key)
+        if entry is None:
+            return deepcopy(self._load(key, loader))
+        if stale:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            self._executor.submit(self._refresh, key, refresher or loader)
+        return deepcopy(entry[1])
+
+    async def get_async(self, key: Hashable, loader: Callable[[], Awaitable[Any]], refresher: Callable[[], Awaitable[Any]] = None) -> Any:
+        '''
+        Coroutine version of get(), refreshes are scheduled on the running loop
+            Args:
+                key (Hashable): The key
+                loader (Callable): Coroutine function loading the value, returns None on failure
+                refresher (Callable): Coroutine function loading the value for background refreshes (defaults to loader)
+            Returns:
+                Any: The (possibly stale) value
+        '''
+        entry, stale = self._lookup(key)
+        if entry is None:
+            task = self._loading_async.get(key)
+            if task is None:
+                task = asyncio.ensure_future(self._load_async(key, loader))
+                self._loading_async[key] = task
+                task.add_done_callback(lambda _: self._loading_async.pop(key, None))
+            # a cancelled caller does not cancel the load shared with the others
+            return deepcopy(await asyncio.shield(task))
+        if stale:
+            task = asyncio.ensure_future(self._refresh_async(key, refresher or loader))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return deepcopy(entry[1])
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'refreshes': self.refreshes,
+            'refresh_errors': self.refresh_errors,
+            'entries': len(self._entries)
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _lookup(self, key: Hashable) -> Tuple[Tuple[float, Any], bool]:
+        '''
+        Returns the entry of a key and whether a refresh must be scheduled
+        '''
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None, False
+            self.hits += 1
+            self._entries.move_to_end(key)
+            if time.time() - entry[0] < self.max_age or key in self._refreshing:
+                return entry, False
+            self._refreshing.add(key)
+            return entry, True
+
+    def _load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        '''
+        Loads and stores the value of a missing key, or waits for the
+        thread already loading it
+        '''
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                # stored since the lookup
+                return entry[1]
+            future = self._loading.get(key)
+            loading = future is None
+            if loading:
+                future = self._loading[key] = Future()
+        if not loading:
+            return future.result()
+        try:
+            value = self._store(key, loader())
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        else:
+            future.set_result(value)
+        finally:
+            with self._lock:
+                self._loading.pop(key, None)
+        return value
+
+    async def _load_async(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        return self._store(key, await loader())
+
+    def _store(self, key: Hashable, value: Any) -> Any:
+        '''
+        Stores a value, the stored instance is never handed out
+        '''
+        if value is None:
+            return None
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def _refresh(self, key: Hashable, loader: Callable[[], Any]) -> None:
+        try:
+            self._refreshed(key, loader())
+        except Exception:
+            self._refreshed(key, None)
+
+    async def _refresh_async(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            self._refreshed(key, await loader())
+        except Exception:
+            self._refreshed(key, None)
+
+    def _refreshed(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._refreshing.discard(key)
+            if value is None:
+                self.refresh_errors += 1
+                logger.warning('Unable to refresh {}'.format(key))
+                return
+            self.refreshes += 1
+        self._store(key, value)
@@ -31,6 +31,43 @@ UNWANTED_SCREEN_IDS = []
 
 
 
+# ===================================================================
+#
+#   VERSIONS CONFIG
+#
+# ===================================================================
+
+PLAYBACK_LANGUAGES = {
+  'fr': 'FRENCH',
+  'en': 'ENGLISH'
+}
+
+
+
+
+
+# ===================================================================
+#
+#   CACHE CONFIG
+#
+# ===================================================================
+
+# Time to live (seconds) of cached responses, by operation name.
+# Operations not listed here are never cached.
+CACHE_TTLS = {
+  'applicationScreens': 6 * 3600,
+  'screen':             3600,
+  'posterRotator':      3600,
+  'grid':               3600,
+  'AxisMedia':          1800,
+  'axisSeason':         1800,
+  'searchMedia':        300
+}
+
+
+
+
+
 # ===================================================================
 #
 #   PAYLOADS
@@ -163,3 +200,53 @@ GRID_PAYLOAD = {
 
 
 
+
+
+
+
+
+# ===================================================================
+#
+#   QUERY PROFILES
+#
+# ===================================================================
+
+# Selectable AxisMedia/axisSeason documents:
+#   full     -> the queries of the official app
+#   playback -> only the fields read by the result parsers
+#   minimal  -> ids, numbers, titles, languages and access (no images, texts, dates or durations)
+QUERY_PROFILES = ['minimal', 'playback', 'full']
+DEFAULT_QUERY_PROFILE = 'full'
+
+_PROFILE_VARIABLES = '$subscriptions: [Subscription]!, $maturity: Maturity!, $language: Language!, $authenticationState: AuthenticationState!, $playbackLanguage: PlaybackLanguage!, $id: ID!'
+_PROFILE_CONTEXT = '@uaContext(maturity: $maturity language: $language subscriptions: $subscriptions authenticationState: $authenticationState playbackLanguage: $playbackLanguage )'
+_PLAYBACK_CONTENT_FRAGMENT = 'fragment AxisContentFragment on AxisContent { __typename id axisId title summary description seasonNumber episodeNumber broadcastDate images(formats: $imageFormat) { __typename format url } duration durationSecs axisPlaybackLanguages { __typename language destinationCode } authConstraints { __typename language packageName } }'
+_MINIMAL_CONTENT_FRAGMENT = 'fragment AxisContentFragment on AxisContent { __typename id axisId title seasonNumber episodeNumber axisPlaybackLanguages { __typename language destinationCode } authConstraints { __typename language packageName } }'
+
+MEDIA_PAYLOADS = {
+  'full': MEDIA_PAYLOAD,
+  'playback': {
+    "operationName": "AxisMedia",
+    "variables": MEDIA_PAYLOAD['variables'],
+    "query": 'query AxisMedia(' + _PROFILE_VARIABLES + ', $imageFormat: [ImageFormat]!) ' + _PROFILE_CONTEXT + ' { axisMedia(id: $id) { __typename id axisId title summary description mediaType images(formats: $imageFormat) { __typename format url } seasons { __typename id seasonNumber } mainContents { __typename page { __typename items { __typename ...AxisContentFragment } } } } } ' + _PLAYBACK_CONTENT_FRAGMENT
+  },
+  'minimal': {
+    "operationName": "AxisMedia",
+    "variables": {key: value for key, value in MEDIA_PAYLOAD['variables'].items() if key != 'imageFormat'},
+    "query": 'query AxisMedia(' + _PROFILE_VARIABLES + ') ' + _PROFILE_CONTEXT + ' { axisMedia(id: $id) { __typename id axisId title mediaType seasons { __typename id seasonNumber } mainContents { __typename page { __typename items { __typename ...AxisContentFragment } } } } } ' + _MINIMAL_CONTENT_FRAGMENT
+  }
+}
+
+SEASON_PAYLOADS = {
+  'full': SEASON_PAYLOAD,
+  'playback': {
+    "operationName": "axisSeason",
+    "variables": SEASON_PAYLOAD['variables'],
+    "query": 'query axisSeason(' + _PROFILE_VARIABLES + ', $imageFormat: [ImageFormat]!) ' + _PROFILE_CONTEXT + ' { axisSeason(id: $id) { __typename id seasonNumber episodes { __typename ...AxisContentFragment } } } ' + _PLAYBACK_CONTENT_FRAGMENT
+  },
+  'minimal': {
+    "operationName": "axisSeason",
+    "variables": {key: value for key, value in SEASON_PAYLOAD['variables'].items() if key != 'imageFormat'},
+    "query": 'query axisSeason(' + _PROFILE_VARIABLES + ') ' + _PROFILE_CONTEXT + ' { axisSeason(id: $id) { __typename id seasonNumber episodes { __typename ...AxisContentFragment } } } ' + _MINIMAL_CONTENT_FRAGMENT
+  }
+}
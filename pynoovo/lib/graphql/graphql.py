@@ -1,34 +1,58 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
 from copy import deepcopy
 from datetime import datetime
-import json
 import copy
+import threading
 
 from pynoovo.common.category import Category
 
 from ...common.media import MediaEpisode, MediaMovie
 from ...common.result_info import ResultInfo, SerieResultInfo, MovieResultInfo
 from ...common.search_result import SearchResult
+from ...common.search_index import SearchIndex
+from ...common.ranking import rank_results
+from ...common.duration import content_duration, content_durations
 from ...common.utils import format_episode_number
+from ...common.cache import ResponseCache
+from ...common.json_backend import response_json
 
 import requests
 import logging
-from .consts import ROOT_SCREEN_PAYLOAD, HEADERS, SEARCH_PAYLOAD, MEDIA_PAYLOAD, SEASON_PAYLOAD, SCREEN_PAYLOAD, ROOT_SCREENS, HOME_SCREEN, COLLECTION_PAYLOAD, GRID_PAYLOAD, UNWANTED_SCREEN_IDS
-from typing import Any, Dict, List, Tuple, Union
-from fuzzywuzzy import fuzz
+from .consts import HEADERS, ROOT_SCREENS, HOME_SCREEN, UNWANTED_SCREEN_IDS, PLAYBACK_LANGUAGES, CACHE_TTLS, QUERY_PROFILES, DEFAULT_QUERY_PROFILE
+from .cache import CachedResponse, StaleWhileRevalidateCache, make_cache_key
+from .batching import make_batch_template, batch_variables, split_batch_response
+from .templates import QueryTemplate, ROOT_SCREEN_TEMPLATE, SCREEN_TEMPLATE, COLLECTION_TEMPLATE, GRID_TEMPLATE, SEARCH_TEMPLATE, MEDIA_TEMPLATES, SEASON_TEMPLATES, is_persisted_query_missing, is_persisted_query_unsupported
+from typing import Any, Callable, Dict, Iterable, List, Tuple, Union
 
 # Logger
 logger = logging.getLogger(__name__)
 
+# Set while refreshing a stale category tree, bypasses cached responses
+_revalidating: ContextVar = ContextVar('revalidating', default=False)
+
 
 class GraphQL():
 
     # ================================================================
     #   __init__()
     # ================================================================
-    def __init__(self, session: requests.Session, url: str, tag: str, metadata_language: str = 'fr'):
+    def __init__(self, session: requests.Session, url: str, tag: str, metadata_language: str = 'fr', max_workers: int = 8, cache: ResponseCache = None, cache_ttls: Dict[str, float] = None, browse_cache: StaleWhileRevalidateCache = None):
         self.session: requests.Session = session
         self.url: str = url
         self.tag: str = tag
+        self.max_workers: int = max(1, max_workers)
+        self._request_slots = threading.BoundedSemaphore(self.max_workers)
+        self.cache: ResponseCache = cache
+        self.cache_ttls: Dict[str, float] = CACHE_TTLS if cache_ttls is None else cache_ttls
+        self.browse_cache: StaleWhileRevalidateCache = browse_cache
+        self.search_index: SearchIndex = None
+        self.search_index_max_age: float = 86400
+        self.query_profile: str = DEFAULT_QUERY_PROFILE
+        # Lookups merged in one aliased request (seasons, bulk media), 1 disables batching
+        self.max_batch_size: int = 10
+        # Send query hashes instead of query texts (automatic persisted queries)
+        self.persisted_queries: bool = False
         self.subscriptions: List[str] = []
         self.scopes: List[str] = []
         self.packages: List[str] = []
@@ -53,7 +77,11 @@ class GraphQL():
             Returns:
                 List[Category]: A list of all categories.
         '''
-
+        if self.browse_cache is not None:
+            return self.browse_cache.get(
+                self._browse_key('root'),
+                lambda: self.get_elements_screen(id=None, root=True),
+                lambda: self._revalidate(self.get_elements_screen, None, True))
         return self.get_elements_screen(id=None, root=True)
 
     # ================================================================
@@ -71,6 +99,18 @@ class GraphQL():
         if category is None:
             logger.error('No category provided')
             return None
+        if self.browse_cache is not None:
+            return self.browse_cache.get(
+                self._browse_key(category.type, category.id),
+                lambda: self._get_elements(category),
+                lambda: self._revalidate(self._get_elements, category))
+        return self._get_elements(category)
+
+    # ================================================================
+    #   _get_elements()
+    # ================================================================
+
+    def _get_elements(self, category: Category) -> List[Union[Category, ResultInfo]]:
         logger.debug(
             'Listing elements of category "{}"'.format(category.title))
         if category.type == 'screen':
@@ -80,6 +120,46 @@ class GraphQL():
         elif category.type == 'grid':
             return self.get_elements_grid(category.id)
 
+    # ================================================================
+    #   _browse_key()
+    # ================================================================
+
+    def _browse_key(self, *key: str) -> Tuple:
+        '''
+        Returns the category tree cache key, trees depend on the account
+        (has_access) and on the metadata language
+        '''
+        account = tuple(tuple(sorted(values or [])) for values in (self.subscriptions, self.scopes, self.packages))
+        return key + (self.metadata_language,) + account
+
+    # ================================================================
+    #   _revalidate()
+    # ================================================================
+
+    def _revalidate(self, func: Callable[..., Any], *args) -> Any:
+        '''
+        Calls a function without reading cached responses
+        '''
+        token = _revalidating.set(True)
+        try:
+            return func(*args)
+        finally:
+            _revalidating.reset(token)
+
+    # ================================================================
+    #   get_browse_stats()
+    # ================================================================
+
+    def get_browse_stats(self) -> Dict[str, int]:
+        '''
+        Returns the category tree cache counters
+            Returns:
+                Dict[str, int]: The hits, misses, refreshes, refresh_errors and entries counters
+        '''
+        if self.browse_cache is None:
+            return {}
+        return self.browse_cache.stats()
+
     # ================================================================
     #   get_elements_screen()
     # ================================================================
@@ -104,12 +184,11 @@ class GraphQL():
         # =========
         logger.debug('Making a GraphQL request')
         if root:
-            payload = deepcopy(ROOT_SCREEN_PAYLOAD)
+            template, variables = ROOT_SCREEN_TEMPLATE, None
         else:
-            payload = deepcopy(SCREEN_PAYLOAD)
-            payload['variables']['id'] = id
+            template, variables = SCREEN_TEMPLATE, {'id': id}
         response = self._make_request(
-            payload, playback_language=self.metadata_language)
+            template, variables, playback_language=self.metadata_language)
         if response.status_code != 200:
             logger.error('Bad response received ({})'.format(
                 response.status_code))
@@ -117,19 +196,41 @@ class GraphQL():
 
         # Parse
         # =======
+        elements, next_category = self._parse_screen(response, root)
+        if next_category is None:
+            return elements
+        next_elements = self.get_elements(next_category)
+        if next_elements is None:
+            return elements if root else None
+        return elements + next_elements
+
+    # ================================================================
+    #   _parse_screen()
+    # ================================================================
+
+    def _parse_screen(self, response: requests.Response, root: bool = False) -> Tuple[List[Category], Category]:
+        '''
+        Parses a screen response
+            Args:
+                response (Response): The screen response
+                root (bool): Whether the response is the root screen
+            Returns:
+                Tuple[List[Category], Category]: The screen elements and a category whose elements must be added, if any
+        '''
         logger.debug('Parsing response...')
         elements = []
 
         # Screens
         # =========
         home_id = None
+        response_parsed = None
         try:
+            # decoded once, the collections are read from the same document
+            response_parsed = response_json(response)
             if root:
-                screens = json.loads(response.text)[
-                    'data']['app']['navigationLinks']
+                screens = response_parsed['data']['app']['navigationLinks']
             else:
-                screens = json.loads(response.text)[
-                    'data']['screen']['secondaryNavigation']['links']
+                screens = response_parsed['data']['screen']['secondaryNavigation']['links']
             for screen in screens:
                 try:
                     if root and screen['internalContent']['containerType'] == HOME_SCREEN:
@@ -149,17 +250,16 @@ class GraphQL():
         # =============
         if root:
             if home_id is not None:
-                elements += self.get_elements_screen(home_id)
-            return elements
+                return elements, Category(type='screen', id=home_id)
+            return elements, None
         try:
-            collections = json.loads(response.text)[
-                'data']['screen']['collections']
+            collections = response_parsed['data']['screen']['collections']
             if len(elements) == 0 and len(collections) == 1:
                 if collections[0]['__typename'] == 'Grid':
-                    return self.get_elements_grid(collections[0]['id'])
+                    return elements, Category(type='grid', id=collections[0]['id'])
                 elif collections[0]['__typename'] == 'Rotator':
-                    return self.get_elements_rotator(collections[0]['id'])
-                return None
+                    return elements, Category(type='rotator', id=collections[0]['id'])
+                return None, None
             for collection in collections:
                 try:
                     if not 'config' in collection or not collection['config']['displayTitle']:
@@ -177,7 +277,7 @@ class GraphQL():
                     continue
         except:
             logger.error('Unable to parse collections response')
-        return elements
+        return elements, None
 
     # ================================================================
     #   get_elements_grid()
@@ -198,10 +298,8 @@ class GraphQL():
 
         # Request
         # =========
-        payload = deepcopy(GRID_PAYLOAD)
-        payload['variables']['id'] = id
         response = self._make_request(
-            payload, playback_language=self.metadata_language)
+            GRID_TEMPLATE, {'id': id}, playback_language=self.metadata_language)
         if response.status_code != 200:
             logger.error('Bad response received ({})'.format(
                 response.status_code))
@@ -209,20 +307,7 @@ class GraphQL():
 
         # Parse
         # =======
-        logger.debug('Parsing response...')
-        elements = []
-        try:
-            items = json.loads(response.text)[
-                'data']['grid']['collection']['page']['items']
-            for item in items:
-                try:
-                    elements.append(self.parse_search_result(item))
-                except:
-                    continue
-        except:
-            logger.error('Unable to parse response')
-            return None
-        return elements
+        return self._parse_collection(response, 'grid')
 
     # ================================================================
     #   get_elements_rotator()
@@ -243,10 +328,8 @@ class GraphQL():
 
         # Request
         # =========
-        payload = deepcopy(COLLECTION_PAYLOAD)
-        payload['variables']['id'] = id
         response = self._make_request(
-            payload, playback_language=self.metadata_language)
+            COLLECTION_TEMPLATE, {'id': id}, playback_language=self.metadata_language)
         if response.status_code != 200:
             logger.error('Bad response received ({})'.format(
                 response.status_code))
@@ -254,11 +337,26 @@ class GraphQL():
 
         # Parse
         # =======
+        return self._parse_collection(response, 'rotator')
+
+    # ================================================================
+    #   _parse_collection()
+    # ================================================================
+
+    def _parse_collection(self, response: requests.Response, collection_type: str) -> List[Union[Category, ResultInfo]]:
+        '''
+        Parses a grid or rotator response
+            Args:
+                response (Response): The collection response
+                collection_type (str): The collection type ('grid' or 'rotator')
+            Returns:
+                List[Union[Category, ResultInfo]: A list of all the elements.
+        '''
         logger.debug('Parsing response...')
         elements = []
         try:
-            items = json.loads(response.text)[
-                'data']['rotator']['collection']['page']['items']
+            items = response_json(response)[
+                'data'][collection_type]['collection']['page']['items']
             for item in items:
                 try:
                     elements.append(self.parse_search_result(item))
@@ -296,12 +394,17 @@ class GraphQL():
             logger.info('Title must be at least 3 characters long')
             return []
 
+        # Local index
+        # =============
+        results = self._search_index(input)
+        if results is not None:
+            return results
+
         # Request
         # =========
         logger.debug('Making a GraphQL request...')
-        payload = deepcopy(SEARCH_PAYLOAD)
-        payload['variables']['searchTerm'] = input.strip()
-        response = self._make_request(payload)
+        response = self._make_request(
+            SEARCH_TEMPLATE, {'searchTerm': input.strip()})
         if response.status_code != 200:
             logger.error('Bad response received ({})'.format(
                 response.status_code))
@@ -309,19 +412,55 @@ class GraphQL():
 
         # Parse
         # =======
+        return self._parse_search(response, input)
+
+    # ================================================================
+    #   _search_index()
+    # ================================================================
+
+    def _search_index(self, input: str) -> List[SearchResult]:
+        '''
+        Searches the local index, returns None when searchMedia must be used instead
+        '''
+        if self.search_index is None:
+            return None
+        if self.search_index.is_stale(self.search_index_max_age):
+            logger.debug('Search index is stale')
+            return None
+        results = self.search_index.search(input)
+        if len(results) == 0:
+            logger.debug('No match in search index')
+            return None
+        for result in results:
+            result.has_access = any(x in self.scopes for x in result.requirements)
+        logger.debug('Found {} matches in search index'.format(str(len(results))))
+        return results
+
+    # ================================================================
+    #   _parse_search()
+    # ================================================================
+
+    def _parse_search(self, response: requests.Response, input: str) -> List[SearchResult]:
+        '''
+        Parses and ranks a search response
+            Args:
+                response (Response): The search response
+                input (str): The search terms
+            Returns:
+                List[SearchResult]: A list of all the search results. First element is the most relevent one.
+        '''
         logger.debug('Parsing response...')
         try:
-            response_parsed = json.loads(response.text)
+            response_parsed = response_json(response)
             response_parsed = response_parsed['data']['searchMedia']['page']['items']
             suggestions = []
             for item in response_parsed:
                 result = self.parse_search_result(item)
                 if result is None:
                     continue
-                suggestions.append(
-                    (fuzz.partial_ratio(result.title, input), result))
+                suggestions.append(result)
             logger.debug('Found {} matches'.format(str(len(suggestions))))
-            return [x for _, x in sorted(suggestions, reverse=True)][:50]
+            return rank_results(input, suggestions)
         except:
             logger.error('An error occured while parsing response')
             return None
@@ -359,25 +498,27 @@ class GraphQL():
     #   get_result_infos()
     # ================================================================
 
-    def get_result_infos(self, result: SearchResult) -> List[Union[MovieResultInfo, SerieResultInfo]]:
+    def get_result_infos(self, result: SearchResult, profile: str = None) -> List[Union[MovieResultInfo, SerieResultInfo]]:
         '''
         Get more infos about a specific search result
             Args:
                 result (SearchResult): The search result
+                profile (str): The query profile (minimal, playback or full), defaults to query_profile
             Returns:
                 Dict[str, Union[MovieResultInfo, SerieResultInfo]]: A dictionary of all the versions available (french/english) and corresponding infos
         '''
-        return self.get_result_infos_id(result.id)
+        return self.get_result_infos_id(result.id, profile)
 
     # ================================================================
     #   get_result_infos_id()
     # ================================================================
 
-    def get_result_infos_id(self, content_id: str) -> List[Union[MovieResultInfo, SerieResultInfo]]:
+    def get_result_infos_id(self, content_id: str, profile: str = None) -> List[Union[MovieResultInfo, SerieResultInfo]]:
         '''
         Get more infos about a specific search result
             Args:
                 id (str): The result ID
+                profile (str): The query profile (minimal, playback or full), defaults to query_profile
             Returns:
                 Dict[str, Union[MovieResultInfo, SerieResultInfo]]: A dictionary of all the versions available (french/english) and corresponding infos
         '''
@@ -389,45 +530,146 @@ class GraphQL():
             logger.info('No Content ID provided')
             return []
 
-        # Request
-        # =========
-        payload = deepcopy(MEDIA_PAYLOAD)
-        payload['variables']['id'] = content_id
-        responses = {}
-        logger.debug('Making a GraphQL request for french version...')
-        responses['fr'] = self._make_request(
-            payload, playback_language='FRENCH')
-        logger.debug('Making a GraphQL request for english version...')
-        responses['en'] = self._make_request(
-            payload, playback_language='ENGLISH')
-        if responses['fr'].status_code != 200 and responses['en'].status_code != 200:
-            logger.error('Bad responses ({}) ({})'.format(
-                responses['fr'].status_code, responses['en'].status_code))
-            return None
-
-        # Parse
-        # =======
+        # Request + Parse
+        # =================
+        # Both versions are fetched concurrently, each one with its seasons
+        profile = self._get_query_profile(profile)
         infos = {}
-        logger.debug('Parsing responses...')
-        for lang, response in responses.items():
+        versions = list(PLAYBACK_LANGUAGES.keys())
+        responses = self._map_concurrent(
+            lambda version: self._get_result_infos_version(content_id, version, infos, profile), versions)
+        return self._merge_versions(versions, responses, infos)
+
+    # ================================================================
+    #   get_results_infos_ids()
+    # ================================================================
+
+    def get_results_infos_ids(self, content_ids: Iterable[str], profile: str = None) -> Dict[str, Dict[str, Union[MovieResultInfo, SerieResultInfo]]]:
+        '''
+        Get more infos about several results, max_batch_size results per request
+            Args:
+                content_ids (Iterable[str]): The result IDs
+                profile (str): The query profile (minimal, playback or full), defaults to query_profile
+            Returns:
+                Dict[str, Dict[str, Union[MovieResultInfo, SerieResultInfo]]]: The infos of each result, as returned by get_result_infos_id()
+        '''
+        content_ids = list(dict.fromkeys(
+            content_id for content_id in content_ids if content_id is not None and len(content_id.strip()) > 0))
+        logger.debug('Getting infos for {} results...'.format(len(content_ids)))
+        profile = self._get_query_profile(profile)
+        versions = list(PLAYBACK_LANGUAGES.keys())
+        infos = {content_id: {} for content_id in content_ids}
+        responses = {content_id: {} for content_id in content_ids}
+        size = max(1, self.max_batch_size)
+        batches = [(content_ids[index:index + size], version)
+                   for version in versions
+                   for index in range(0, len(content_ids), size)]
+        self._map_concurrent(
+            lambda batch: self._get_media_batch(batch[0], batch[1], infos, responses, profile), batches)
+        return {content_id: self._merge_versions(
+                    versions, [responses[content_id][version] for version in versions], infos[content_id])
+                for content_id in content_ids}
+
+    # ================================================================
+    #   _get_media_batch()
+    # ================================================================
+
+    def _get_media_batch(self, content_ids: List[str], version: str, infos: Dict[str, Dict[str, Union[MovieResultInfo, SerieResultInfo]]], responses: Dict[str, Dict[str, requests.Response]], profile: str) -> None:
+        '''
+        Fetches and parses one version of several results in one request,
+        the results missing from the response are requested one by one
+            Args:
+                content_ids (List[str]): The result IDs
+                version (str): The targeted version (french or english)
+                infos (Dict): Where to store the parsed infos of each result
+                responses (Dict): Where to store the response of each result
+                profile (str): The query profile
+        '''
+        results = [None] * len(content_ids)
+        response = None
+        if len(content_ids) > 1:
+            logger.debug('Making a GraphQL request for {} results ({})...'.format(
+                len(content_ids), version))
+            template = make_batch_template(MEDIA_TEMPLATES[profile], 'axisMedia', len(content_ids))
             try:
-                if response.status_code != 200:
-                    logger.debug('Skipping {} version because of a bad response ()'.format(
-                        response.status_code))
-                    continue
-                logger.debug('Parsing {} response...'.format(lang))
-                response_parsed = json.loads(response.text)[
-                    'data']['axisMedia']
-                if response_parsed['mediaType'] == 'SERIES':
-                    infos[lang] = self._parse_serie_result(
-                        response_parsed, lang)
-                elif response_parsed['mediaType'] == 'MOVIE':
-                    infos[lang] = self._parse_movie_result(
-                        response_parsed, lang)
-            except:
-                logger.error('Failed to parse {} response'.format(lang))
-                infos.pop(lang, None)
+                response = self._make_request(
+                    template, batch_variables(content_ids), playback_language=PLAYBACK_LANGUAGES[version])
+                results = split_batch_response(
+                    response.status_code, response.content, len(content_ids))
+            except requests.RequestException as e:
+                logger.warning('Batch request failed ({}), requesting the results one by one'.format(e))
+        # the missing results are requested concurrently
+        missing = [content_id for content_id, result in zip(content_ids, results) if result is None]
+        missing_responses = self._map_concurrent(
+            lambda content_id: self._get_result_infos_version(content_id, version, infos[content_id], profile), missing)
+        for content_id, missing_response in zip(missing, missing_responses):
+            responses[content_id][version] = missing_response
+        for content_id, result in zip(content_ids, results):
+            if result is None:
                 continue
+            responses[content_id][version] = response
+            try:
+                self._parse_media_result(result, version, infos[content_id], profile)
+            except:
+                logger.error('Failed to parse {} response of {}'.format(version, content_id))
+                infos[content_id].pop(version, None)
+
+    # ================================================================
+    #   _parse_media_result()
+    # ================================================================
+
+    def _parse_media_result(self, result: Dict[str, Any], version: str, infos: Dict[str, Union[MovieResultInfo, SerieResultInfo]], profile: str = DEFAULT_QUERY_PROFILE) -> None:
+        '''
+        Parses an axisMedia result according to its type
+            Args:
+                result (Dict): The axisMedia result
+                version (str): The targeted version (french or english)
+                infos (Dict): Where to store the parsed infos
+                profile (str): The query profile of the season requests
+        '''
+        if result['mediaType'] == 'SERIES':
+            infos[version] = self._parse_serie_result(result, version, profile)
+        elif result['mediaType'] == 'MOVIE':
+            infos[version] = self._parse_movie_result(result, version)
+
+    # ================================================================
+    #   _get_query_profile()
+    # ================================================================
+
+    def _get_query_profile(self, profile: str = None) -> str:
+        '''
+        Checks a query profile
+            Args:
+                profile (str): The requested profile, None for the default one
+            Returns:
+                str: The profile to use
+        '''
+        if profile is None:
+            profile = self.query_profile
+        if profile not in QUERY_PROFILES:
+            logger.warning('Unknown query profile "{}", using "{}"'.format(
+                profile, DEFAULT_QUERY_PROFILE))
+            return DEFAULT_QUERY_PROFILE
+        return profile
+
+    # ================================================================
+    #   _merge_versions()
+    # ================================================================
+
+    def _merge_versions(self, versions: List[str], responses: List[requests.Response], infos: Dict[str, Union[MovieResultInfo, SerieResultInfo]]) -> Dict[str, Union[MovieResultInfo, SerieResultInfo]]:
+        '''
+        Merges the parsed versions of a result
+            Args:
+                versions (List[str]): The requested versions, in order
+                responses (List[Response]): The media response of each version
+                infos (Dict): The parsed infos of each version
+            Returns:
+                Dict[str, Union[MovieResultInfo, SerieResultInfo]]: A dictionary of all the versions available (french/english) and corresponding infos
+        '''
+        if all(response.status_code != 200 for response in responses):
+            logger.error('Bad responses ({})'.format(
+                ') ('.join(str(response.status_code) for response in responses)))
+            return None
 
         # Handle parsing error
         # ======================
@@ -438,7 +680,8 @@ class GraphQL():
         # Manage versions
         # =================
         infos_formatted = {}
-        for version, info in infos.items():
+        for version in versions:
+            info = infos.get(version)
             if info is None or len(info.medias) == 0:
                 continue
             info.version = version
@@ -447,6 +690,37 @@ class GraphQL():
             str(len(infos_formatted)), ', '.join(infos_formatted.keys())))
         return infos_formatted
 
+    # ================================================================
+    #   _get_result_infos_version()
+    # ================================================================
+
+    def _get_result_infos_version(self, content_id: str, version: str, infos: Dict[str, Union[MovieResultInfo, SerieResultInfo]], profile: str = DEFAULT_QUERY_PROFILE) -> requests.Response:
+        '''
+        Fetches and parses one version (french or english) of a result
+            Args:
+                content_id (str): The result ID
+                version (str): The targeted version (french or english)
+                infos (Dict): Where to store the parsed infos
+                profile (str): The query profile of the season requests
+            Returns:
+                requests.Response: The media response
+        '''
+        logger.debug('Making a GraphQL request for {} version...'.format(version))
+        response = self._make_request(
+            MEDIA_TEMPLATES[profile], {'id': content_id}, playback_language=PLAYBACK_LANGUAGES[version])
+        if response.status_code != 200:
+            logger.debug('Skipping {} version because of a bad response ({})'.format(
+                version, response.status_code))
+            return response
+        try:
+            logger.debug('Parsing {} response...'.format(version))
+            response_parsed = response_json(response)['data']['axisMedia']
+            self._parse_media_result(response_parsed, version, infos, profile)
+        except:
+            logger.error('Failed to parse {} response'.format(version))
+            infos.pop(version, None)
+        return response
+
     # ================================================================
     #   _parse_movie_result()
     # ================================================================
@@ -461,7 +735,7 @@ class GraphQL():
                 MovieResultInfo: The detailed movie infos
         '''
         infos = MovieResultInfo()
-        infos.medias['default'] = MediaMovie()
+        infos.medias['default'] = MediaMovie(playback_languages=[])
         logger.debug(result)
         content = result['mainContents']['page']['items'][0]
         logger.debug(content)
@@ -492,17 +766,17 @@ class GraphQL():
         infos.title = result['title']
         infos.medias['default'].title = result['title']
         # Image
-        for image in result['images']:
+        for image in result.get('images', []):
             if image['format'] == 'POSTER':
                 infos.image = image['url']
                 infos.medias['default'].image = image['url']
                 break
         # Summary
-        infos.summary = result['summary']
-        infos.medias['default'].summary = result['summary']
+        infos.summary = result.get('summary', '')
+        infos.medias['default'].summary = infos.summary
         # Description
-        infos.description = result['description']
-        infos.medias['default'].description = result['summary']
+        infos.description = result.get('description', '')
+        infos.medias['default'].description = infos.summary
 
         # Play ID
         infos.medias['default'].play_id = str(content['axisId'])
@@ -514,192 +788,389 @@ class GraphQL():
         except:
             pass
         # Duration
-        try:
-            duration_str = content['duration']
-            duration = 0
-            if 'h' in duration_str:
-                index = duration_str.index('h')
-                value = duration_str[:index]
-                duration_str = duration_str[index+1:]
-                duration += int(value.strip()) * 3600
-            if 'm' in duration_str:
-                index = duration_str.index('m')
-                value = duration_str[:index]
-                duration_str = duration_str[index+1:]
-                duration += int(value.strip()) * 60
-            if 's' in duration_str:
-                index = duration_str.index('s')
-                value = duration_str[:index]
-                duration_str = duration_str[index+1:]
-                duration += int(value.strip())
+        duration = content_duration(content)
+        if duration is not None:
             infos.medias['default'].duration = duration
-        except:
-            pass
         return infos
 
     # ================================================================
     #   _parse_serie_result()
     # ================================================================
 
-    def _parse_serie_result(self, result: Dict[str, Any], version: str) -> SerieResultInfo:
+    def _parse_serie_result(self, result: Dict[str, Any], version: str, profile: str = DEFAULT_QUERY_PROFILE) -> SerieResultInfo:
         '''
         Parses a serie response
             Args:
                 result (Dict): The response as a Dict
                 version (Dict): The targeted version (french or english)
+                profile (str): The query profile of the season requests
             Returns:
                 MovieResultInfo: The detailed serie infos
         '''
+        infos, seasons = self._parse_serie_infos(result)
+
+        # Season Requests
+        # =================
+        seasons_episodes = self._get_seasons_episodes(seasons, version, profile)
+
+        # Parse episodes
+        # ================
+        for (season_num, _), episodes in zip(seasons, seasons_episodes):
+            if episodes is None:
+                continue
+            self._parse_season_episodes(infos, episodes, season_num, version)
+        return infos
+
+    # ================================================================
+    #   _parse_serie_infos()
+    # ================================================================
+
+    def _parse_serie_infos(self, result: Dict[str, Any]) -> Tuple[SerieResultInfo, List[Tuple[int, str]]]:
+        '''
+        Parses the show part of a serie response
+            Args:
+                result (Dict): The response as a Dict
+            Returns:
+                Tuple[SerieResultInfo, List[Tuple[int, str]]]: The serie infos without episodes and the (number, ID) of its seasons
+        '''
         # Show infos
         # ============
         infos = SerieResultInfo()
         # Title
         infos.title = result['title']
         # Image
-        for image in result['images']:
+        for image in result.get('images', []):
             if image['format'] == 'POSTER':
                 infos.image = image['url']
                 break
         infos.title = result['title']
         # Summary
-        infos.summary = result['summary']
+        infos.summary = result.get('summary', '')
         # Description
-        infos.description = result['description']
+        infos.description = result.get('description', '')
 
+        # Season metadata
+        # =================
+        seasons = []
         for season in result['seasons']:
-
-            # Season metadata
-            # =================
             try:
-                season_num = int(season['seasonNumber'])
+                seasons.append((int(season['seasonNumber']), season['id']))
             except:
                 logger.error('Unable to parse season number')
                 continue
+        return infos, seasons
+
+    # ================================================================
+    #   _get_seasons_episodes()
+    # ================================================================
+
+    def _get_seasons_episodes(self, seasons: List[Tuple[int, str]], version: str, profile: str = DEFAULT_QUERY_PROFILE) -> List[List[Dict[str, Any]]]:
+        '''
+        Fetches the episodes of several seasons, max_batch_size seasons per request
+            Args:
+                seasons (List[Tuple[int, str]]): The (number, ID) of the seasons
+                version (str): The targeted version (french or english)
+                profile (str): The query profile
+            Returns:
+                List[List[Dict]]: The episodes of each season, None on failure
+        '''
+        if self.max_batch_size <= 1 or len(seasons) <= 1:
+            return self._map_concurrent(
+                lambda season: self._get_season_episodes(season[1], season[0], version, profile), seasons)
+        batches = [seasons[index:index + self.max_batch_size]
+                   for index in range(0, len(seasons), self.max_batch_size)]
+        batches_episodes = self._map_concurrent(
+            lambda batch: self._get_season_batch(batch, version, profile), batches)
+        return [episodes for batch_episodes in batches_episodes for episodes in batch_episodes]
+
+    # ================================================================
+    #   _get_season_batch()
+    # ================================================================
 
-            # Season Request
-            # ================
-            payload = deepcopy(SEASON_PAYLOAD)
-            payload['variables']['id'] = season['id']
-            logger.debug('Making a GraphQL request for season {} ({})...'.format(
-                str(season_num), version))
-            langs = {'fr': 'FRENCH', 'en': 'ENGLISH'}
+    def _get_season_batch(self, seasons: List[Tuple[int, str]], version: str, profile: str) -> List[List[Dict[str, Any]]]:
+        '''
+        Fetches the episodes of several seasons in one request, the seasons
+        missing from the response are requested one by one
+            Args:
+                seasons (List[Tuple[int, str]]): The (number, ID) of the seasons
+                version (str): The targeted version (french or english)
+                profile (str): The query profile
+            Returns:
+                List[List[Dict]]: The episodes of each season, None on failure
+        '''
+        template = make_batch_template(SEASON_TEMPLATES[profile], 'axisSeason', len(seasons))
+        logger.debug('Making a GraphQL request for seasons {} ({})...'.format(
+            ', '.join(str(season_num) for season_num, _ in seasons), version))
+        try:
             response = self._make_request(
-                payload, playback_language=langs[version])
-            if response.status_code != 200:
-                logger.error('Bad response ({})'.format(response.status_code))
-                continue
+                template, batch_variables([season_id for _, season_id in seasons]),
+                playback_language=PLAYBACK_LANGUAGES[version])
+            results = split_batch_response(response.status_code, response.content, len(seasons))
+        except requests.RequestException as e:
+            logger.warning('Batch request failed ({}), requesting the seasons one by one'.format(e))
+            results = [None] * len(seasons)
+        seasons_episodes = [None if result is None else result.get('episodes') for result in results]
+        # the missing seasons are requested concurrently
+        missing = [index for index, episodes in enumerate(seasons_episodes) if episodes is None]
+        missing_episodes = self._map_concurrent(
+            lambda index: self._get_season_episodes(seasons[index][1], seasons[index][0], version, profile), missing)
+        for index, episodes in zip(missing, missing_episodes):
+            seasons_episodes[index] = episodes
+        return seasons_episodes
+
+    # ================================================================
+    #   _get_season_episodes()
+    # ================================================================
+
+    def _get_season_episodes(self, season_id: str, season_num: int, version: str, profile: str = DEFAULT_QUERY_PROFILE) -> List[Dict[str, Any]]:
+        '''
+        Fetches the episodes of a season
+            Args:
+                season_id (str): The season ID
+                season_num (int): The season number
+                version (str): The targeted version (french or english)
+                profile (str): The query profile
+            Returns:
+                List[Dict]: The season episodes, None on failure
+        '''
+        logger.debug('Making a GraphQL request for season {} ({})...'.format(
+            str(season_num), version))
+        response = self._make_request(
+            SEASON_TEMPLATES[profile], {'id': season_id}, playback_language=PLAYBACK_LANGUAGES[version])
+        return self._parse_season_response(response)
+
+    # ================================================================
+    #   _parse_season_response()
+    # ================================================================
 
-            # Parse episodes
-            # ================
+    def _parse_season_response(self, response: requests.Response) -> List[Dict[str, Any]]:
+        '''
+        Extracts the episodes from a season response
+            Args:
+                response (Response): The season response
+            Returns:
+                List[Dict]: The season episodes, None on failure
+        '''
+        if response.status_code != 200:
+            logger.error('Bad response ({})'.format(response.status_code))
+            return None
+        try:
+            return response_json(response)[
+                'data']['axisSeason']['episodes']
+        except:
+            logger.error('Error while parsing response')
+            return None
+
+    # ================================================================
+    #   _parse_season_episodes()
+    # ================================================================
+
+    def _parse_season_episodes(self, infos: SerieResultInfo, episodes: List[Dict[str, Any]], season_num: int, version: str) -> None:
+        '''
+        Parses the episodes of a season into the serie infos
+            Args:
+                infos (SerieResultInfo): The serie infos to fill
+                episodes (List[Dict]): The season episodes
+                season_num (int): The season number
+                version (str): The targeted version (french or english)
+        '''
+        durations = content_durations(episodes)
+        for episode, duration in zip(episodes, durations):
+
+            # Episode metadata
+            # ==================
             try:
-                episodes = json.loads(response.text)[
-                    'data']['axisSeason']['episodes']
+                episode_num = int(episode['episodeNumber'])
+                episode_tag = format_episode_number(
+                    season_num, episode_num)
             except:
-                logger.error('Error while parsing response')
+                logger.error('Weird error while parsing an episode')
                 continue
-            for episode in episodes:
 
-                # Episode metadata
-                # ==================
-                try:
-                    episode_num = int(episode['episodeNumber'])
-                    episode_tag = format_episode_number(
-                        season_num, episode_num)
-                except:
-                    logger.error('Weird error while parsing an episode')
+            try:
+
+                # Episode language check
+                # ========================
+                dest_code = None
+                playback_languages = []
+                for lang in episode['axisPlaybackLanguages']:
+                    if lang['language'].lower() == version:
+                        dest_code = lang['destinationCode']
+                        playback_languages.append(lang['language'].lower())
+                if dest_code == None:
+                    logger.debug(
+                        'Playback language does not fit request language ({})'.format(episode_tag))
                     continue
 
-                try:
+                # Access check
+                # ==============
+                temp_episode = MediaEpisode()
+                temp_episode.has_access = False
+                if len(episode['authConstraints']) == 0:
+                    temp_episode.has_access = True
+                else:
+                    for constraint in episode['authConstraints']:
+                        if constraint['language'].lower() == version:
+                            if constraint['packageName'] in self.packages:
+                                temp_episode.has_access = True
+                                break
+
+                # Episode infos
+                # ===============
+
+                # Episode
+                temp_episode.season = season_num
+                temp_episode.episode = episode_num
+                temp_episode.episode_tag = episode_tag
+                # Title
+                temp_episode.title = episode['title']
+                # Image
+                for image in episode.get('images', []):
+                    if image['format'] == 'THUMBNAIL':
+                        temp_episode.image = image['url']
+                        break
+                temp_episode.play_id = str(episode['axisId'])
+                # Summary
+                temp_episode.summary = episode.get('summary', '')
+                # Description
+                temp_episode.description = episode.get('description', '')
+                # Play ID
+                temp_episode.play_id = str(episode['axisId'])
+                # Duration
+                if duration is not None:
+                    temp_episode.duration = duration
+                # Playback Language
+                temp_episode.playback_languages = deepcopy(
+                    playback_languages)
+                # Destination code
+                temp_episode.additionnal_infos['destination'] = dest_code
+                # Add episode
+                infos.medias[episode_tag] = temp_episode
+            except:
+                logger.warn('Unable to parse version {} of {}'.format(
+                    version, episode_tag))
+                continue
 
-                    # Episode language check
-                    # ========================
-                    dest_code = None
-                    playback_languages = []
-                    for lang in episode['axisPlaybackLanguages']:
-                        if lang['language'].lower() == version:
-                            dest_code = lang['destinationCode']
-                            playback_languages.append(lang['language'].lower())
-                    if dest_code == None:
-                        logger.debug(
-                            'Playback language does not fit request language ({})'.format(episode_tag))
-                        continue
+    # ================================================================
+    #   _map_concurrent()
+    # ================================================================
 
-                    # Access check
-                    # ==============
-                    temp_episode = MediaEpisode()
-                    temp_episode.has_access = False
-                    if len(episode['authConstraints']) == 0:
-                        temp_episode.has_access = True
-                    else:
-                        for constraint in episode['authConstraints']:
-                            if constraint['language'].lower() == version:
-                                if constraint['packageName'] in self.packages:
-                                    temp_episode.has_access = True
-                                    break
-
-                    # Episode infos
-                    # ===============
-
-                    # Episode
-                    temp_episode.season = season_num
-                    temp_episode.episode = episode_num
-                    temp_episode.episode_tag = episode_tag
-                    # Title
-                    temp_episode.title = episode['title']
-                    # Image
-                    for image in episode['images']:
-                        if image['format'] == 'THUMBNAIL':
-                            temp_episode.image = image['url']
-                            break
-                    temp_episode.play_id = str(episode['axisId'])
-                    # Summary
-                    temp_episode.summary = episode['summary']
-                    # Description
-                    temp_episode.description = episode['description']
-                    # Play ID
-                    temp_episode.play_id = str(episode['axisId'])
-                    # Duration
-                    try:
-                        duration_str = episode['duration']
-                        duration = 0
-                        if 'h' in duration_str:
-                            index = duration_str.index('h')
-                            value = duration_str[:index]
-                            duration_str = duration_str[index+1:]
-                            duration += int(value.strip()) * 3600
-                        if 'm' in duration_str:
-                            index = duration_str.index('m')
-                            value = duration_str[:index]
-                            duration_str = duration_str[index+1:]
-                            duration += int(value.strip()) * 60
-                        if 's' in duration_str:
-                            index = duration_str.index('s')
-                            value = duration_str[:index]
-                            duration_str = duration_str[index+1:]
-                            duration += int(value.strip())
-                        temp_episode.duration = duration
-                    except:
-                        pass
-                    # Playback Language
-                    temp_episode.playback_languages = deepcopy(
-                        playback_languages)
-                    # Destination code
-                    temp_episode.additionnal_infos['destination'] = dest_code
-                    # Add episode
-                    infos.medias[episode_tag] = temp_episode
-                except:
-                    logger.warn('Unable to parse version {} of {}'.format(
-                        version, episode_tag))
-                    continue
-        return infos
+    def _map_concurrent(self, func: Callable[[Any], Any], items: Iterable[Any]) -> List[Any]:
+        '''
+        Applies a function to every item using a bounded worker pool
+            Args:
+                func (Callable): The function to apply
+                items (Iterable): The items
+            Returns:
+                List: The results, in the same order as the items
+        '''
+        items = list(items)
+        if len(items) <= 1 or self.max_workers <= 1:
+            return [func(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(items))) as executor:
+            return list(executor.map(func, items))
 
     # ================================================================
     #   _make_request()
     # ================================================================
 
-    def _make_request(self, partial_data: Dict[str, Any], playback_language: str = 'FRENCH') -> requests.Response:
-        data = deepcopy(partial_data)
-        data['variables']['subscriptions'] = self.subscriptions
-        data['variables']['language'] = self.metadata_language
-        data['variables']['playbackLanguage'] = playback_language
-        return self.session.post(url=self.url, headers=HEADERS, json=data)
+    def _make_request(self, template: QueryTemplate, variables: Dict[str, Any] = None, playback_language: str = 'FRENCH') -> requests.Response:
+        data = self._build_request_data(template, variables, playback_language)
+        cache_key, response = self._get_cached_response(data)
+        if response is not None:
+            return response
+        with self._request_slots:
+            response = self._post(template, data['variables'])
+        self._cache_response(data, cache_key, response)
+        return response
+
+    # ================================================================
+    #   _post()
+    # ================================================================
+
+    def _post(self, template: QueryTemplate, variables: Dict[str, Any]) -> requests.Response:
+        '''
+        Sends a request, as a persisted query if enabled
+            Args:
+                template (QueryTemplate): The query
+                variables (Dict): All the variables of the request
+            Returns:
+                requests.Response: The response
+        '''
+        if self.persisted_queries:
+            response = self.session.post(
+                url=self.url, headers=HEADERS, data=template.body(variables, persisted=True))
+            if not self._check_persisted_query(response):
+                return response
+        return self.session.post(
+            url=self.url, headers=HEADERS, data=template.body(variables, register=self.persisted_queries))
+
+    # ================================================================
+    #   _check_persisted_query()
+    # ================================================================
+
+    def _check_persisted_query(self, response: requests.Response) -> bool:
+        '''
+        Checks the response of a persisted query
+            Args:
+                response (Response): The response
+            Returns:
+                bool: True if the query must be sent again with its text
+        '''
+        if is_persisted_query_unsupported(response.content):
+            logger.warning('Persisted queries are not supported, disabling them')
+            self.persisted_queries = False
+            return True
+        return is_persisted_query_missing(response.content)
+
+    # ================================================================
+    #   _get_cached_response()
+    # ================================================================
+
+    def _get_cached_response(self, data: Dict[str, Any]) -> Tuple[str, CachedResponse]:
+        '''
+        Looks up a request in the response cache
+            Args:
+                data (Dict): The full request data
+            Returns:
+                Tuple[str, CachedResponse]: The cache key (None if the operation is not cached) and the cached response, if any
+        '''
+        if self.cache is None or self.cache_ttls.get(data['operationName'], 0) <= 0:
+            return None, None
+        cache_key = make_cache_key(data)
+        if _revalidating.get():
+            return cache_key, None
+        content = self.cache.get(cache_key)
+        if content is None:
+            return cache_key, None
+        logger.debug('Cache hit for {}'.format(data['operationName']))
+        return cache_key, CachedResponse(content)
+
+    # ================================================================
+    #   _cache_response()
+    # ================================================================
+
+    def _cache_response(self, data: Dict[str, Any], cache_key: str, response: requests.Response) -> None:
+        # GraphQL errors are returned with a 200 status and must not be cached
+        if cache_key is None or response.status_code != 200 or b'"errors":' in response.content:
+            return
+        self.cache.set(cache_key, response.content,
+                       self.cache_ttls[data['operationName']])
+
+    # ================================================================
+    #   _build_request_data()
+    # ================================================================
+
+    def _build_request_data(self, template: QueryTemplate, variables: Dict[str, Any] = None, playback_language: str = 'FRENCH') -> Dict[str, Any]:
+        # Only the variables are built per request, the template is shared
+        request_variables = dict(template.variables)
+        if variables is not None:
+            request_variables.update(variables)
+        request_variables['subscriptions'] = self.subscriptions
+        request_variables['language'] = self.metadata_language
+        request_variables['playbackLanguage'] = playback_language
+        return {
+            'operationName': template.operation_name,
+            'variables': request_variables,
+            'query': template.query
+        }
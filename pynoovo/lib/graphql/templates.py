@@ -0,0 +1,108 @@
+from types import MappingProxyType
+from typing import Any, Dict, Mapping
+import hashlib
+import json
+
+from .consts import ROOT_SCREEN_PAYLOAD, SCREEN_PAYLOAD, COLLECTION_PAYLOAD, GRID_PAYLOAD, SEARCH_PAYLOAD, MEDIA_PAYLOADS, SEASON_PAYLOADS
+
+
+# ===================================================================
+#
+#   QUERY TEMPLATES
+#
+# ===================================================================
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+def _freeze(value: Any) -> Any:
+    # Default variables are shared by every request and must never be modified,
+    # nested objects stay dicts so they can be serialized
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return {key: _freeze(item) for key, item in value.items()}
+    return value
+
+
+class QueryTemplate():
+    '''
+    Immutable GraphQL document. Everything but the variables is serialized
+    once, a request body is the pre-serialized head followed by the
+    variables of the call.
+    '''
+    __slots__ = ('operation_name', 'query', 'variables', 'query_hash',
+                 '_query_head', '_hash_head', '_register_head')
+
+    # ================================================================
+    #   __init__()
+    # ================================================================
+    def __init__(self, operation_name: str, query: str, variables: Mapping[str, Any] = None):
+        self.operation_name: str = operation_name
+        self.query: str = query
+        self.variables: Mapping[str, Any] = MappingProxyType(_freeze(dict(variables or {})))
+        self.query_hash: str = hashlib.sha256(query.encode('utf-8')).hexdigest()
+        operation = '{"operationName":' + _dumps(operation_name)
+        extensions = ',"extensions":{"persistedQuery":{"version":1,"sha256Hash":"' + self.query_hash + '"}}'
+        query = ',"query":' + _dumps(query)
+        self._query_head: bytes = (operation + query + ',"variables":').encode('utf-8')
+        self._hash_head: bytes = (operation + extensions + ',"variables":').encode('utf-8')
+        self._register_head: bytes = (operation + query + extensions + ',"variables":').encode('utf-8')
+
+    # ================================================================
+    #   from_payload()
+    # ================================================================
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> 'QueryTemplate':
+        return cls(payload['operationName'], payload['query'], payload['variables'])
+
+    # ================================================================
+    #   body()
+    # ================================================================
+
+    def body(self, variables: Dict[str, Any], persisted: bool = False, register: bool = False) -> bytes:
+        '''
+        Serializes a request
+            Args:
+                variables (Dict): All the variables of the request
+                persisted (bool): Send the query hash instead of the query (persisted query)
+                register (bool): Send both, to register a persisted query
+            Returns:
+                bytes: The JSON body
+        '''
+        if register:
+            head = self._register_head
+        elif persisted:
+            head = self._hash_head
+        else:
+            head = self._query_head
+        return head + _dumps(variables).encode('utf-8') + b'}'
+
+
+# ================================================================
+#   Persisted queries errors
+# ================================================================
+
+def is_persisted_query_missing(content: bytes) -> bool:
+    return b'PersistedQueryNotFound' in content or b'PERSISTED_QUERY_NOT_FOUND' in content
+
+
+def is_persisted_query_unsupported(content: bytes) -> bool:
+    return b'PersistedQueryNotSupported' in content or b'PERSISTED_QUERY_NOT_SUPPORTED' in content
+
+
+# ===================================================================
+#
+#   TEMPLATES
+#
+# ===================================================================
+
+ROOT_SCREEN_TEMPLATE = QueryTemplate.from_payload(ROOT_SCREEN_PAYLOAD)
+SCREEN_TEMPLATE = QueryTemplate.from_payload(SCREEN_PAYLOAD)
+COLLECTION_TEMPLATE = QueryTemplate.from_payload(COLLECTION_PAYLOAD)
+GRID_TEMPLATE = QueryTemplate.from_payload(GRID_PAYLOAD)
+SEARCH_TEMPLATE = QueryTemplate.from_payload(SEARCH_PAYLOAD)
+MEDIA_TEMPLATES = {profile: QueryTemplate.from_payload(payload) for profile, payload in MEDIA_PAYLOADS.items()}
+SEASON_TEMPLATES = {profile: QueryTemplate.from_payload(payload) for profile, payload in SEASON_PAYLOADS.items()}
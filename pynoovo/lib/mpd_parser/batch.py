@@ -0,0 +1,83 @@
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable, Iterator, List, NamedTuple, Tuple, Union
+
+from .mpd_content_parser import MPDPaser
+from .utils.links import Links
+
+
+class TrackSummary(NamedTuple):
+    key: str
+    codecs: str
+    bandwidth: float
+    duration: float
+    lang: str
+    resolution: str
+    suffix: str
+    url_count: int  # initialization included
+    urls: List[str]  # None unless requested
+
+
+class ManifestSummary(NamedTuple):
+    basename: str
+    tracks: List[TrackSummary]
+    error: str  # None when the manifest was parsed
+
+
+Manifest = Union[str, Path, Tuple[str, str]]
+
+
+def summarize(links: Links, with_urls: bool = False) -> TrackSummary:
+    return TrackSummary(
+        key=links.key,
+        codecs=links.codecs,
+        bandwidth=links.bandwidth,
+        duration=links.duration,
+        lang=links.lang,
+        resolution=links.resolution,
+        suffix=links.suffix,
+        url_count=sum(len(source) for source in links.sources),
+        urls=links.urls if with_urls else None)
+
+
+def parse_manifest(manifest: Manifest, split: bool = False, baseurl: str = '', with_urls: bool = False) -> ManifestSummary:
+    '''
+    Parses a (basename, xmlraw) pair or a mpd file path
+    '''
+    if isinstance(manifest, tuple):
+        basename, xmlraw = manifest
+    else:
+        xmlpath = Path(manifest).resolve()
+        basename = xmlpath.stem
+    try:
+        if not isinstance(manifest, tuple):
+            xmlraw = xmlpath.read_text(encoding="utf-8")
+        parser = MPDPaser(basename, xmlraw, split)
+        parser.work()
+        tracks = parser.parse(baseurl)
+        return ManifestSummary(basename, [summarize(links, with_urls) for links in tracks.values()], None)
+    except Exception as e:
+        return ManifestSummary(basename, [], f"{type(e).__name__}: {e}")
+
+
+def _parse_manifest_job(job: tuple) -> ManifestSummary:
+    return parse_manifest(*job)
+
+
+def parse_manifests(manifests: Iterable[Manifest],
+                    split: bool = False,
+                    baseurl: str = '',
+                    with_urls: bool = False,
+                    jobs: int = None,
+                    chunksize: int = 1) -> Iterator[ManifestSummary]:
+    '''
+    Parses many manifests with a process pool, summaries are yielded in
+    input order. File paths are read by the workers. jobs defaults to the
+    number of cores, jobs=1 parses in the current process.
+    '''
+    job_args = ((manifest, split, baseurl, with_urls) for manifest in manifests)
+    if jobs == 1:
+        yield from map(_parse_manifest_job, job_args)
+        return
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        yield from executor.map(_parse_manifest_job, job_args, chunksize=chunksize)
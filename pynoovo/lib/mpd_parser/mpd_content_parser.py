@@ -16,6 +16,10 @@ import os
 
 from .utils.mpd import MPD
 from .utils.links import Links
+from .utils.segments import TemplateSegments
+from .utils.template import compile_template
+from .utils.resolver import URLResolver, get_resolver
+from .utils.mpditem import MPDItem
 from .utils.funcs import tree, find_child, dump, match_duration,getMpdFromUrl
 
 from .utils.childs.adaptationset import AdaptationSet
@@ -25,7 +29,6 @@ from .utils.childs.contentprotection import ContentProtection
 from .utils.childs.period import Period
 from .utils.childs.representation import Representation
 from .utils.childs.role import Role
-from .utils.childs.s import S
 from .utils.childs.segmenttemplate import SegmentTemplate
 from .utils.childs.segmenttimeline import SegmentTimeline
 
@@ -49,7 +52,6 @@ class MPDPaser(object):
             "SegmentTemplate": SegmentTemplate,
             "SegmentTimeline": SegmentTimeline,
             "Role": Role,
-            "S": S,
             "ContentProtection": ContentProtection,
             "cenc:pssh": CencPssh,
         }
@@ -69,11 +71,14 @@ class MPDPaser(object):
             self.obj.addattrs(attrs)
             self.stack.append(self.obj)
         else:
+            if tag == "S" and isinstance(self.obj, SegmentTimeline):
+                self.obj.add_s(attrs)
+                return
             if self.objs.get(tag) is None:
                 return
             child = self.objs[tag](tag)
             child.addattrs(attrs)
-            self.obj.childs.append(child)
+            self.obj.add_child(child)
             self.obj = child
             self.stack.append(child)
 
@@ -89,46 +94,76 @@ class MPDPaser(object):
             self.obj.innertext = texts
 
     def parse(self, _baseurl: str):
-        mediaPresentationDuration = self.obj.__dict__.get("mediaPresentationDuration")
-        self.mediaPresentationDuration = match_duration(mediaPresentationDuration)
-        if _baseurl == '':
-            BaseURLs = find_child("BaseURL", self.obj)
-            baseurl = None if len(BaseURLs) == 0 else BaseURLs[0].innertext
-        else:
-            baseurl = _baseurl
+        self.prepare_mpd()
+        # _baseurl is the location of the manifest, BaseURLs are resolved against it
+        document = None if _baseurl == '' else get_resolver(_baseurl)
+        mpd_resolver = self.join_baseurl(document, self.obj)
         Periods = find_child("Period", self.obj)
         for _Period in Periods:
             _Period: Period
-            if isinstance(_Period.start, str):
-                _Period.start = match_duration(_Period.duration)
-            if isinstance(_Period.duration, str):
-                _Period.duration = match_duration(_Period.duration)
+            self.prepare_period(_Period)
+            period_resolver = self.join_baseurl(mpd_resolver, _Period)
             AdaptationSets = find_child("AdaptationSet", _Period)
             for _AdaptationSet in AdaptationSets:
                 _AdaptationSet: AdaptationSet
-                if baseurl is None:
-                    BaseURLs = find_child("BaseURL", _AdaptationSet)
-                    baseurl = None if len(BaseURLs) == 0 else BaseURLs[0].innertext
+                resolver = self.join_baseurl(period_resolver, _AdaptationSet)
                 Representations = find_child("Representation", _AdaptationSet)
-                SegmentTemplates = find_child("SegmentTemplate", _AdaptationSet)
                 for _Representation in Representations:
                     _Representation: Representation
-                    R_SegmentTemplates = find_child("SegmentTemplate", _AdaptationSet)
-                    if len(SegmentTemplates) == 0:
-                        self.generate(baseurl, _Period, _AdaptationSet, _Representation)
-                    if len(R_SegmentTemplates) == 1:
-                        self.generate(baseurl, _Period, _AdaptationSet, _Representation)
-                    else:
-                        # SegmentTemplate和Representation同一级的话，解析不一样
-                        self.generate(baseurl,
-                                      _Period,
-                                      _AdaptationSet,
-                                      _Representation,
-                                      isInnerSeg=False)
+                    self.generate_representation(resolver, _Period, _AdaptationSet, _Representation)
         return self.tracks
 
+    @staticmethod
+    def join_baseurl(resolver: URLResolver, node: MPDItem) -> URLResolver:
+        '''
+        Returns the resolver of the BaseURL of a node, nested in its parent's one
+        '''
+        BaseURLs = find_child("BaseURL", node)
+        if len(BaseURLs) == 0 or BaseURLs[0].innertext is None:
+            return resolver
+        baseurl = BaseURLs[0].innertext.strip()
+        if resolver is None:
+            return get_resolver(baseurl)
+        return resolver.join(baseurl)
+
+    def prepare_mpd(self):
+        self.mediaPresentationDuration = match_duration(self.obj.mediaPresentationDuration)
+
+    def prepare_period(self, _Period: Period):
+        if isinstance(_Period.start, str):
+            _Period.start = match_duration(_Period.start)
+        if isinstance(_Period.duration, str):
+            _Period.duration = match_duration(_Period.duration)
+        if not _Period.duration:
+            # missing, zero or invalid, the end of the period is unknown
+            _Period.duration = None
+
+    def generate_representation(self,
+                                resolver: URLResolver,
+                                _Period: Period,
+                                _AdaptationSet: AdaptationSet,
+                                _Representation: Representation):
+        '''
+        Generates the links of a Representation, returns the updated tracks
+        '''
+        tracks = []
+        resolver = self.join_baseurl(resolver, _Representation)
+        SegmentTemplates = find_child("SegmentTemplate", _AdaptationSet)
+        if len(SegmentTemplates) == 0:
+            tracks.append(self.generate(resolver, _Period, _AdaptationSet, _Representation))
+        if len(SegmentTemplates) == 1:
+            tracks.append(self.generate(resolver, _Period, _AdaptationSet, _Representation))
+        else:
+            # SegmentTemplate和Representation同一级的话，解析不一样
+            tracks.append(self.generate(resolver,
+                                        _Period,
+                                        _AdaptationSet,
+                                        _Representation,
+                                        isInnerSeg=False))
+        return [links for links in tracks if links is not None]
+
     def generate(self,
-                 baseurl: str,
+                 resolver: URLResolver,
                  _Period: Period,
                  _AdaptationSet: AdaptationSet,
                  _Representation: Representation,
@@ -154,7 +189,7 @@ class MPDPaser(object):
             key = f"{_Representation.id}-{_contentType}"
         if self.split and _Period.id is not None:
             key = f"{_Period.id}-" + key
-        if _Period.duration == 0.0 and self.mediaPresentationDuration is not None:
+        if _Period.duration is None and self.mediaPresentationDuration:
             _Period.duration = self.mediaPresentationDuration
         key = key.replace("/", "_")
         links = Links(self.basename, _Period.duration, key, _Representation.bandwidth, _codecs)
@@ -176,14 +211,15 @@ class MPDPaser(object):
             SegmentTemplates = find_child("SegmentTemplate", _AdaptationSet)
         for _SegmentTemplate in SegmentTemplates:
             _SegmentTemplate: SegmentTemplate
-            start_number = int(_SegmentTemplate.startNumber)  # type: int
+            start_number = _SegmentTemplate.startNumber  # type: int
+            identifiers = dict(RepresentationID=_Representation.id, Bandwidth=_Representation.bandwidth)
             if self.tracks.get(links.key) is None:
-                _initialization = _SegmentTemplate.get_initialization()
-                if "$RepresentationID$" in _initialization:
-                    _initialization = _initialization.replace("$RepresentationID$", _Representation.id)
-                if baseurl is not None:
-                    _initialization = fix_url(baseurl, _initialization)
-                links.urls.append(_initialization)
+                _initialization = compile_template(_SegmentTemplate.initialization).bind(
+                    Number=start_number, Time=_SegmentTemplate.presentationTimeOffset or 0, SubNumber=1,
+                    **identifiers).render()
+                if resolver is not None:
+                    _initialization = resolver.resolve(_initialization)
+                links.add_urls([_initialization])
                 self.tracks[links.key] = links
             else:
                 if self.split is True:
@@ -191,61 +227,46 @@ class MPDPaser(object):
                 else:
                     self.tracks[links.key].update(
                         _Period.duration, _Representation.bandwidth)
+            media = compile_template(_SegmentTemplate.media).bind(**identifiers)
+            if resolver is not None:
+                # Number and Time are digits, the template can be resolved once for every segment
+                media = compile_template(resolver.resolve(media.source))
             SegmentTimelines = find_child("SegmentTimeline", _SegmentTemplate)
-            urls = []
             if len(SegmentTimelines) == 0:
                 if _SegmentTemplate.presentationTimeOffset is None:
                     _Segment_duration = _Period.duration
                 else:
                     _Segment_duration = _Period.duration
-                interval_duration = int(_SegmentTemplate.duration) / int(_SegmentTemplate.timescale)
-                repeat = int(round(_Segment_duration / interval_duration))
-                for number in range(start_number, repeat + start_number):
-                    _media = _SegmentTemplate.get_media()
-                    if "$Number$" in _media:
-                        _media = _media.replace("$Number$", str(number))
-                    if "$RepresentationID$" in _media:
-                        _media = _media.replace("$RepresentationID$", _Representation.id)
-                    _url = _media
-                    if baseurl is not None:
-                        _url = fix_url(baseurl, _url)
-                    urls.append(_url)
+                interval_duration = _SegmentTemplate.duration / _SegmentTemplate.timescale
+                # without a period duration, the number of segments is unknown
+                repeat = 0 if _Segment_duration is None else int(round(_Segment_duration / interval_duration))
+                segments = TemplateSegments(media,
+                                            start_number,
+                                            count=repeat,
+                                            duration=_SegmentTemplate.duration,
+                                            offset=_SegmentTemplate.presentationTimeOffset or 0)
+                self.tracks[links.key].add_urls(segments)
             else:
+                timescale = _SegmentTemplate.timescale or 1
+                offset = _SegmentTemplate.presentationTimeOffset or 0
+                # without a period duration, a trailing negative S@r has no end
+                end = None if _Period.duration is None else offset + int(round(_Period.duration * timescale))
                 for _SegmentTimeline in SegmentTimelines:
                     _SegmentTimeline: SegmentTimeline
-                    # repeat = 0
-                    _last_time_offset = 0  # _Period.start
-                    SS = find_child("S", _SegmentTimeline)
-                    for _S in SS:
-                        _S: S
-                        repeat = 1 if _S.r is None else int(_S.r) + 1
-                        for offset in range(repeat):
-                            _media = _SegmentTemplate.get_media()
-                            if "$Number$" in _media:
-                                _media = _media.replace("$Number$", str(start_number))
-                                start_number += 1
-                            if "$RepresentationID$" in _media:
-                                _media = _media.replace("$RepresentationID$", _Representation.id)
-                            if "$Time$" in _media:
-                                _media = _media.replace("$Time$", str(_last_time_offset))
-                                _last_time_offset += int(_S.d)
-                            _url = _media
-                            if baseurl is not None:
-                                _url = fix_url(baseurl, _url)
-                            urls.append(_url)
-            self.tracks[links.key].urls.extend(urls)
-            if self.split is True:
-                self.tracks[links.key].dump_urls()
-
+                    timeline = _SegmentTimeline.expand(end)
+                    segments = TemplateSegments(media,
+                                                start_number,
+                                                timeline=timeline)
+                    # the numbering continues across the timelines
+                    start_number += len(segments)
+                    self.tracks[links.key].add_urls(segments)
+        return self.tracks.get(links.key)
 
 def fix_url(base_url: str, url: str) -> str:
-    home_url = '/'.join(base_url.split('/', maxsplit=3)[:-1])
-    if url.startswith('http://') or url.startswith('https://') or url.startswith('ftp://'):
-        return url
-    elif url.startswith('/'):
-        return f'{home_url}{url}'
-    else:
-        return f'{base_url}/{url}'
+    # compatibility, see URLResolver. base_url is a directory, with or without a trailing "/"
+    if not base_url.endswith("/"):
+        base_url += "/"
+    return get_resolver(base_url).resolve(url)
 
 
 def main():
@@ -254,21 +275,24 @@ def main():
         description=("Mpd Content Parser, "
                      "generate all tracks download links easily. "
                      "Report bug to vvtoolbox.dev@gmail.com"))
-    command.add_argument("-p", "--path", help="mpd file path.")
+    command.add_argument("-p", "--path", nargs="+", help="mpd file path(s).")
     command.add_argument("-s", "--split", action="store_true", help="generate links for each Period.")
     command.add_argument("-tree", "--tree", action="store_true", help="print mpd tree.")
-    command.add_argument("-baseurl", "--baseurl", default="", help="set mpd base url.")
+    command.add_argument("-baseurl", "--baseurl", default="", help="set mpd base url, a directory must end with '/' (defaults to --url).")
     command.add_argument("-url", "--url", default=None, help="url to fetch link from ")
     command.add_argument("-o", "--out", default=None, help="output directory to store all text files")
+    command.add_argument("-idx", "--index", action="store_true", help="store all tracks links in one indexed binary file.")
+    command.add_argument("-j", "--jobs", type=int, default=None, help="parse the mpd files with a process pool and print a summary of the tracks.")
     args = command.parse_args()
     # print(args)
     if args.url is None and args.path is None:
         print("Please specify the path using --path value")
         command.print_help()
-        args.path = input("paste mpd file path plz:\n")
+        args.path = [input("paste mpd file path plz:\n")]
     if args.url is not None:
         if args.baseurl == '':
-            args.baseurl = args.url.split('?')[0][::-1].split('/', maxsplit=1)[-1][::-1]
+            # the urls are resolved against the location of the manifest
+            args.baseurl = args.url
         xmlpath = getMpdFromUrl(url=args.url)
         xmlraw = xmlpath.read_text(encoding='utf-8')
         parser = MPDPaser(xmlpath.stem, xmlraw, args.split)
@@ -279,11 +303,24 @@ def main():
         if args.out is not None:
             os.mkdir(Path(args.out).resolve())
             os.chdir(args.out)
-            dump(tracks)
+            dump(tracks, args.index)
         else:
-            dump(tracks)
+            dump(tracks, args.index)
+    elif args.jobs is not None or len(args.path) > 1:
+        # imported here, batch imports this module
+        from .batch import parse_manifests
+        for summary in parse_manifests(args.path, args.split, args.baseurl, jobs=args.jobs):
+            if summary.error is not None:
+                print(f"{summary.basename}: {summary.error}")
+                continue
+            for track in summary.tracks:
+                # @bandwidth may be missing and the period duration unknown
+                bandwidth = "?" if track.bandwidth is None else f"{track.bandwidth/1000:.2f}"
+                duration = "?" if track.duration is None else f"{track.duration:.2f}"
+                print(f"{summary.basename}\t{track.key}\t{track.codecs}\t{bandwidth}kbps\t"
+                      f"{duration}s\t{track.url_count}")
     else:
-        xmlpath = Path(args.path).resolve()
+        xmlpath = Path(args.path[0]).resolve()
         if xmlpath.exists():
             xmlraw = xmlpath.read_text(encoding="utf-8")
             parser = MPDPaser(xmlpath.stem, xmlraw, args.split)
@@ -294,16 +331,12 @@ def main():
             if args.out is not None:
                 os.mkdir(Path(args.out).resolve())
                 os.chdir(args.out)
-                dump(tracks)
+                dump(tracks, args.index)
             else:
-                dump(tracks)
+                dump(tracks, args.index)
         else:
             print(f"{str(xmlpath)} is not exists!")
 
 
-if __name__ == "__main__":
-    main()
-
-
 if __name__ == "__main__":
     main()
\ No newline at end of file
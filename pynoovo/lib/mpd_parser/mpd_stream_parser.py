@@ -0,0 +1,107 @@
+from typing import Iterable, Iterator, List, Union
+from xml.parsers.expat import ParserCreate
+import requests
+
+from .mpd_content_parser import MPDPaser
+from .utils.links import Links
+from .utils.resolver import get_resolver
+
+from .utils.childs.adaptationset import AdaptationSet
+from .utils.childs.period import Period
+from .utils.childs.representation import Representation
+
+
+class MPDStreamParser(MPDPaser):
+    '''
+    Single-pass parser: the links of a Representation are generated as soon
+    as its closing tag is read, so no second walk of the object tree is
+    needed and work can start before the whole manifest has arrived.
+
+    The manifest can be fed in chunks with feed()/close(), or read from an
+    iterable of chunks (e.g. requests' iter_content) with iter_tracks().
+    A track is yielded every time one of its Representations closes; without
+    split, a track spanning several Periods is yielded once per Period.
+    Finished Representations are dropped from the object tree.
+    '''
+    def __init__(self, basename: str, split: bool, baseurl: str = '', xmlraw: str = ''):
+        super(MPDStreamParser, self).__init__(basename, xmlraw, split)
+        self.document = None if baseurl == '' else get_resolver(baseurl)
+        self.finished = []  # type: List[Links]
+        self.texts = []  # type: List[str]
+        self.parser = ParserCreate()
+        self.parser.buffer_text = True
+        self.parser.StartElementHandler = self.handle_start_element
+        self.parser.EndElementHandler = self.handle_end_element
+        self.parser.CharacterDataHandler = self.handle_character_data
+
+    def work(self):
+        self.feed(self.xmlraw)
+        self.close()
+
+    def parse(self, _baseurl: str = ''):
+        # tracks are already generated while parsing
+        return self.tracks
+
+    def feed(self, data: Union[str, bytes]) -> List[Links]:
+        '''
+        Parses a chunk, returns the tracks updated by the Representations it closed
+        '''
+        self.parser.Parse(data, False)
+        return self._pop_finished()
+
+    def close(self) -> List[Links]:
+        self.parser.Parse(b"", True)
+        return self._pop_finished()
+
+    def iter_tracks(self, chunks: Iterable[Union[str, bytes]]) -> Iterator[Links]:
+        for chunk in chunks:
+            yield from self.feed(chunk)
+        yield from self.close()
+
+    def handle_start_element(self, tag, attrs):
+        self.texts = []
+        super(MPDStreamParser, self).handle_start_element(tag, attrs)
+        if tag == "MPD":
+            self.prepare_mpd()
+
+    def handle_end_element(self, tag):
+        self.texts = []
+        if tag == "Representation" and len(self.stack) >= 4:
+            _Period, _AdaptationSet, _Representation = self.stack[-3:]
+            if isinstance(_Period, Period) and isinstance(_AdaptationSet, AdaptationSet):
+                self.generate_stream(_Period, _AdaptationSet, _Representation)
+        super(MPDStreamParser, self).handle_end_element(tag)
+
+    def handle_character_data(self, texts):
+        # a text (e.g. BaseURL) may be split between two chunks
+        self.texts.append(texts)
+        super(MPDStreamParser, self).handle_character_data("".join(self.texts))
+
+    def generate_stream(self,
+                        _Period: Period,
+                        _AdaptationSet: AdaptationSet,
+                        _Representation: Representation):
+        resolver = self.document
+        for node in (self.stack[0], _Period, _AdaptationSet):
+            resolver = self.join_baseurl(resolver, node)
+        self.prepare_period(_Period)
+        self.finished.extend(self.generate_representation(
+            resolver, _Period, _AdaptationSet, _Representation))
+        _AdaptationSet.remove_child(_Representation)
+
+    def _pop_finished(self) -> List[Links]:
+        finished, self.finished = self.finished, []
+        return finished
+
+
+def iter_tracks_from_url(url: str, basename: str, split: bool, baseurl: str = '', chunk_size: int = 64 * 1024) -> Iterator[Links]:
+    '''
+    Downloads and parses a manifest at the same time
+    '''
+    if baseurl == '':
+        # the urls are resolved against the location of the manifest
+        baseurl = url
+    parser = MPDStreamParser(basename, split, baseurl=baseurl)
+    with requests.get(url, stream=True) as response:
+        response.raise_for_status()
+        yield from parser.iter_tracks(response.iter_content(chunk_size))
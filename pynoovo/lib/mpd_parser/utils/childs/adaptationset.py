@@ -9,18 +9,16 @@ from ..mpditem import MPDItem
 
 
 class AdaptationSet(MPDItem):
+    __slots__ = ("id", "contentType", "lang", "width", "height", "mimeType", "codecs")
+    converters = {"width": int, "height": int}
+
     def __init__(self, name: str):
         super(AdaptationSet, self).__init__(name)
         self.id = None
         self.contentType = None # type: str
         self.lang = None
-        self.segmentAlignment = None
-        self.maxWidth = None
-        self.maxHeight = None
-        self.frameRate = None
-        self.par = None
-        self.width = None
-        self.height = None
+        self.width = None # type: int
+        self.height = None # type: int
         self.mimeType = None
         self.codecs = None
 
@@ -34,4 +32,4 @@ class AdaptationSet(MPDItem):
         return f"{self.width}x{self.height}p"
 
     def get_suffix(self):
-        return '.' + self.mimeType.split('/')[0].split('-')[-1]
\ No newline at end of file
+        return '.' + self.mimeType.split('/')[0].split('-')[-1]
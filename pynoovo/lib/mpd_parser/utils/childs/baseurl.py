@@ -9,6 +9,7 @@ from ..mpditem import MPDItem
 
 
 class BaseURL(MPDItem):
+    __slots__ = ()
+
     def __init__(self, name: str):
         super(BaseURL, self).__init__(name)
-        self.innertext = None
\ No newline at end of file
@@ -9,5 +9,7 @@ from ..mpditem import MPDItem
 
 
 class CencPssh(MPDItem):
+    __slots__ = ()
+
     def __init__(self, name: str):
-        super(CencPssh, self).__init__(name)
\ No newline at end of file
+        super(CencPssh, self).__init__(name)
@@ -9,8 +9,10 @@ from ..mpditem import MPDItem
 
 
 class ContentProtection(MPDItem):
+    __slots__ = ("value", "schemeIdUri", "cenc_default_KID")
+
     def __init__(self, name: str):
         super(ContentProtection, self).__init__(name)
         self.value = None
         self.schemeIdUri = None
-        self.cenc_default_KID = None
\ No newline at end of file
+        self.cenc_default_KID = None
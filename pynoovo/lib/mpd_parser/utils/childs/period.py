@@ -9,8 +9,10 @@ from ..mpditem import MPDItem
 
 
 class Period(MPDItem):
+    __slots__ = ("id", "start", "duration")
+
     def __init__(self, name: str):
         super(Period, self).__init__(name)
         self.id = None
         self.start = 0
-        self.duration = 0.0
\ No newline at end of file
+        self.duration = 0.0
@@ -9,16 +9,17 @@ from ..mpditem import MPDItem
 
 
 class Representation(MPDItem):
+    __slots__ = ("id", "bandwidth", "codecs", "mimeType", "width", "height")
+    converters = {"bandwidth": int, "width": int, "height": int}
+
     def __init__(self, name: str):
         super(Representation, self).__init__(name)
         self.id = None
-        self.bandwidth = None
+        self.bandwidth = None # type: int
         self.codecs = None
         self.mimeType = None
-        self.sar = None
-        self.width = None
-        self.height = None
-        self.audioSamplingRate = None
+        self.width = None # type: int
+        self.height = None # type: int
 
     def get_contenttype(self):
         if self.mimeType is not None:
@@ -28,4 +29,4 @@ class Representation(MPDItem):
         return f"{self.width}x{self.height}p"
 
     def get_suffix(self):
-        return '.' + self.mimeType.split('/')[0].split('-')[-1]
\ No newline at end of file
+        return '.' + self.mimeType.split('/')[0].split('-')[-1]
@@ -9,7 +9,9 @@ from ..mpditem import MPDItem
 
 
 class Role(MPDItem):
+    __slots__ = ("schemeIdUri", "value")
+
     def __init__(self, name: str):
         super(Role, self).__init__(name)
         self.schemeIdUri = None
-        self.value = None
\ No newline at end of file
+        self.value = None
@@ -9,12 +9,15 @@ from ..mpditem import MPDItem
 
 
 class SegmentTemplate(MPDItem):
+    __slots__ = ("timescale", "duration", "presentationTimeOffset", "initialization", "media", "startNumber")
+    converters = {"timescale": int, "duration": int, "presentationTimeOffset": int, "startNumber": int}
+
     def __init__(self, name: str):
         super(SegmentTemplate, self).__init__(name)
         # SegmentTemplate没有duration的话 timescale好像没什么用
-        self.timescale = None
-        self.duration = None
-        self.presentationTimeOffset = None
+        self.timescale = None # type: int
+        self.duration = None # type: int
+        self.presentationTimeOffset = None # type: int
         self.initialization = None # type: str
         self.media = None # type: str
         self.startNumber = 1
@@ -5,10 +5,49 @@
 一个人的命运啊,当然要靠自我奋斗,但是...
 '''
 
+from array import array
+from typing import Tuple
+
 from ..mpditem import MPDItem
 
 
 class SegmentTimeline(MPDItem):
     # 5.3.9.6 Segment timeline
+    # S elements are stored in arrays instead of child nodes
+    __slots__ = ("t", "d", "r")
+
     def __init__(self, name: str):
-        super(SegmentTimeline, self).__init__(name)
\ No newline at end of file
+        super(SegmentTimeline, self).__init__(name)
+        self.t = array('q')  # S@t, -1 when absent
+        self.d = array('q')  # S@d
+        self.r = array('q')  # S@r, 0 when absent
+
+    def add_s(self, attrs: dict):
+        self.t.append(int(attrs.get("t", -1)))
+        self.d.append(int(attrs["d"]))
+        self.r.append(int(attrs.get("r", 0)))
+
+    def expand(self, end: int = None) -> Tuple[array, array, array]:
+        '''
+        Returns the start time, duration and segment count of every S element.
+        A negative S@r repeats until the next S@t, or until end (timescale
+        units) for the last element.
+        '''
+        starts = array('q')
+        counts = array('q')
+        time = 0
+        size = len(self.d)
+        for i in range(size):
+            if self.t[i] >= 0:
+                time = self.t[i]
+            count = self.r[i] + 1
+            if count <= 0:
+                next_time = self.t[i + 1] if i + 1 < size and self.t[i + 1] >= 0 else end
+                if next_time is None or self.d[i] <= 0:
+                    count = 0
+                else:
+                    count = max(0, -((time - next_time) // self.d[i]))
+            starts.append(time)
+            counts.append(count)
+            time += count * self.d[i]
+        return starts, self.d, counts
@@ -5,13 +5,14 @@
 一个人的命运啊,当然要靠自我奋斗,但是...
 '''
 
-import re
 import os
 import requests
 from pathlib import Path
 from typing import Dict
 
 from ..utils.links import Links
+from ..utils.urlindex import URLIndexWriter
+from ....common.duration import parse_iso_duration
 
 
 def tree(obj, step: int = 0):
@@ -25,12 +26,22 @@ def tree(obj, step: int = 0):
 
 
 def find_child(name: str, parent):
-    return [child for child in parent.childs if child.name == name]
+    # the returned list is the parent's index, it must not be modified
+    return parent.get_childs(name)
 
 
-def dump(tracks: Dict[str, Links]):
-    for track_key, links in tracks.items():
-        links.dump_urls()
+def dump(tracks: Dict[str, Links], indexed: bool = False):
+    if indexed is False:
+        for track_key, links in tracks.items():
+            links.dump_urls()
+        return
+    if len(tracks) == 0:
+        return
+    # all the tracks in one file, see URLIndex
+    basename = next(iter(tracks.values())).basename
+    with URLIndexWriter(Path(f"{basename}.idx").resolve()) as writer:
+        for track_key, links in tracks.items():
+            writer.add_track(track_key, links.iter_urls())
 
 def getMpdFromUrl(url):
     response = requests.get(url).text
@@ -41,13 +52,5 @@ def getMpdFromUrl(url):
 def match_duration(_duration):
     if isinstance(_duration, str) is False:
         return
-
-    duration = re.match(r"PT(\d+)(\.?\d+)S", _duration)
-    if duration is not None:
-        return float(duration.group(1)) if duration else 0.0
-    # P0Y0M0DT0H3M30.000S
-    duration = re.match(r"PT(\d+)H(\d+)M(\d+)(\.?\d+)S",
-                        _duration.replace('0Y0M0D', ''))
-    if duration is not None:
-        _h, _m, _s, _ss = duration.groups()
-        return int(_h) * 60 * 60 + int(_m) * 60 + int(_s) + float("0" + _ss)
+    # P0Y0M0DT0H3M30.000S, PT1M30S, P1DT2H...
+    return parse_iso_duration(_duration)
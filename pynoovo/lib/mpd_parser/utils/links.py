@@ -7,7 +7,9 @@
 
 import re
 from pathlib import Path
+from typing import Iterable, Iterator, List
 from .maps.audiomap import AUDIOMAP
+from .urlindex import URLIndexWriter, write_url_list
 
 
 class Links(object):
@@ -16,12 +18,14 @@ class Links(object):
         self.basename: str = basename
         self.duration: float = duration
         self.key: str = key
-        self.bandwidth: float = float(bandwidth)
+        # Representation@bandwidth is mandatory but some manifests omit it
+        self.bandwidth: float = None if bandwidth is None else float(bandwidth)
         self.codecs: str = self.get_codecs(codecs)
         self.suffix: str = ".unkonwn"  # aria2c下载的文件名后缀
         self.lang: str = ""
         self.resolution: str = ""
-        self.urls: list = []
+        # segment url sources (lists or TemplateSegments), expanded on demand
+        self.sources: list = []
 
     def get_codecs(self, codecs: str):
         # https://chromium.googlesource.com/chromium/src/media/+/master/base/mime_util_internal.cc
@@ -39,13 +43,38 @@ class Links(object):
             codecs = "AAC" if "AAC" in AUDIOMAP[codecs] else AUDIOMAP[codecs]
         return codecs
 
+    @property
+    def urls(self) -> List[str]:
+        # compatibility, builds the full list of urls
+        return list(self.iter_urls())
+
+    def add_urls(self, urls: Iterable[str]):
+        self.sources.append(urls)
+
+    def iter_urls(self) -> Iterator[str]:
+        for source in self.sources:
+            yield from source
+
     def update(self, duration: float, bandwidth: str):
+        if bandwidth is None or self.bandwidth is None:
+            # the known bandwidth, if any, is kept
+            if self.bandwidth is None and bandwidth is not None:
+                self.bandwidth = float(bandwidth)
+            self.duration = None if duration is None or self.duration is None else self.duration + duration
+            return
         _bandwidth = float(bandwidth)
+        if duration is None or self.duration is None:
+            # the periods can't be weighted, the total duration is unknown
+            self.bandwidth = (_bandwidth + self.bandwidth) / 2
+            self.duration = None
+            return
         self.bandwidth = (duration * _bandwidth + self.duration * self.bandwidth) / (self.duration + duration)
         self.duration += duration
 
     def get_path(self) -> Path:
-        filename = f"{self.basename}-{self.key}-{self.codecs}-{self.bandwidth/1000:.2f}kbps"
+        filename = f"{self.basename}-{self.key}-{self.codecs}"
+        if self.bandwidth is not None:
+            filename += f"-{self.bandwidth/1000:.2f}kbps"
         if self.lang != "":
             filename += f".{self.lang}"
         if self.resolution != "":
@@ -53,11 +82,14 @@ class Links(object):
         #print(filename)
         return Path(filename + ".txt").resolve()
 
-    '''
-    def dump_urls(self):
+    def dump_urls(self) -> Path:
         filepath = self.get_path()
-        filepath.write_text("\n".join(self.urls), encoding="utf-8")
-    '''
+        write_url_list(filepath, self.iter_urls())
+        return filepath
 
-    def dump_urls(self):
-        pass
\ No newline at end of file
+    def dump_index(self) -> Path:
+        # indexed binary file, see URLIndex
+        filepath = self.get_path().with_suffix(".idx")
+        with URLIndexWriter(filepath) as writer:
+            writer.add_track(self.key, self.iter_urls())
+        return filepath
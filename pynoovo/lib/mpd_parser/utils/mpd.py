@@ -9,5 +9,8 @@ from .mpditem import MPDItem
 
 
 class MPD(MPDItem):
+    __slots__ = ("mediaPresentationDuration",)
+
     def __init__(self, name: str):
-        super(MPD, self).__init__(name)
\ No newline at end of file
+        super(MPD, self).__init__(name)
+        self.mediaPresentationDuration = None
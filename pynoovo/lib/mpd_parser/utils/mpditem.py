@@ -9,16 +9,60 @@
 class MPDItem:
     '''
     所有节点的父类
+    Attributes with a slot are converted and set by addattrs, the others
+    are kept in extras.
     '''
+    __slots__ = ("name", "childs", "childs_by_name", "innertext", "extras")
+    # attribute name -> converter of the numeric attributes
+    converters = {}
+
     def __init__(self, name: str = "MPDItem"):
         self.name = name
         self.childs = list()
+        # tag -> children with that tag, in document order
+        self.childs_by_name = None
+        self.innertext = None
+        # attributes without a slot, created on first use
+        self.extras = None
+
+    def __getattr__(self, name: str):
+        # only called when there is no slot, looks up the unknown attributes
+        extras = object.__getattribute__(self, "extras")
+        if extras is None or name not in extras:
+            raise AttributeError(name)
+        return extras[name]
+
+    def add_child(self, child: "MPDItem"):
+        self.childs.append(child)
+        if self.childs_by_name is None:
+            self.childs_by_name = dict()
+        self.childs_by_name.setdefault(child.name, []).append(child)
+
+    def remove_child(self, child: "MPDItem"):
+        self.childs.remove(child)
+        self.childs_by_name[child.name].remove(child)
+
+    def get_childs(self, name: str) -> list:
+        if self.childs_by_name is None:
+            return []
+        return self.childs_by_name.get(name, [])
 
     def addattr(self, name: str, value):
-        self.__setattr__(name, value)
+        converter = self.converters.get(name)
+        if converter is not None:
+            try:
+                value = converter(value)
+            except ValueError:
+                pass
+        try:
+            setattr(self, name, value)
+        except AttributeError:
+            if self.extras is None:
+                self.extras = dict()
+            self.extras[name] = value
 
     def addattrs(self, attrs: dict):
         for attr_name, attr_value in attrs.items():
             attr_name: str
             attr_name = attr_name.replace(":", "_")
-            self.addattr(attr_name, attr_value)
\ No newline at end of file
+            self.addattr(attr_name, attr_value)
@@ -0,0 +1,85 @@
+from functools import lru_cache
+from urllib.parse import urlsplit
+import re
+
+ABSOLUTE_URL = re.compile(r"[a-zA-Z][a-zA-Z0-9+.-]*:")
+
+
+def remove_dot_segments(path: str) -> str:
+    # RFC 3986 5.2.4
+    output = []
+    segments = path.split("/")
+    for index, segment in enumerate(segments):
+        last = index == len(segments) - 1
+        if segment == ".":
+            if last:
+                output.append("")
+        elif segment == "..":
+            if len(output) > 1 or (len(output) == 1 and output[0] != ""):
+                output.pop()
+            if last:
+                output.append("")
+        else:
+            output.append(segment)
+    if path.startswith("/") and (len(output) == 0 or output[0] != ""):
+        output.insert(0, "")
+    return "/".join(output)
+
+
+class URLResolver(object):
+    '''
+    Resolves relative urls against a BaseURL (RFC 3986 5.2). The base is
+    split once, relative paths are merged with its directory: everything
+    up to the last "/" (5.2.3).
+    '''
+    __slots__ = ("base", "scheme", "origin", "path", "directory", "query")
+
+    def __init__(self, base: str):
+        scheme, authority, path, query, _ = urlsplit(base)
+        self.scheme = scheme
+        self.origin = f"{scheme}://{authority}" if scheme != "" else ""
+        self.path = path
+        if path == "" and authority != "":
+            self.directory = "/"
+        else:
+            self.directory = path[:path.rfind("/") + 1]
+        self.query = query
+        self.base = self.origin + path + ("?" + query if query != "" else "")
+
+    def resolve(self, url: str) -> str:
+        if ABSOLUTE_URL.match(url):
+            return url
+        if url.startswith("//"):
+            return f"{self.scheme}:{url}"
+        if url == "":
+            return self.base
+        if url[0] == "#":
+            return self.base + url
+        if url[0] == "?":
+            return self.origin + self.path + url
+        if url[0] == "/":
+            path = url
+        else:
+            path = self.directory + url
+        if "/." in path or path.startswith("."):
+            path, separator, rest = self._split_query(path)
+            path = remove_dot_segments(path) + separator + rest
+        return self.origin + path
+
+    def join(self, url: str) -> "URLResolver":
+        '''
+        Returns the resolver of a nested BaseURL
+        '''
+        return get_resolver(self.resolve(url))
+
+    @staticmethod
+    def _split_query(url: str):
+        for index, char in enumerate(url):
+            if char in "?#":
+                return url[:index], char, url[index + 1:]
+        return url, "", ""
+
+
+@lru_cache(maxsize=256)
+def get_resolver(base: str) -> URLResolver:
+    return URLResolver(base)
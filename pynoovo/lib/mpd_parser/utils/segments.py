@@ -0,0 +1,53 @@
+from array import array
+from itertools import accumulate, repeat
+from typing import Iterator, Tuple
+
+from .template import SegmentURLTemplate
+
+
+class TemplateSegments(object):
+    '''
+    Lazily expands the segment urls of a SegmentTemplate. Only the template
+    and the timeline are stored, so memory does not grow with the manifest
+    length. Can be iterated several times.
+    '''
+    def __init__(self,
+                 template: SegmentURLTemplate,
+                 start_number: int,
+                 count: int = 0,
+                 duration: int = 0,
+                 offset: int = 0,
+                 timeline: Tuple[array, array, array] = None):
+        # resolved media template, with the identifiers of the Representation already bound
+        self.template = template
+        self.start_number = start_number
+        # count, duration and offset of $Number$ templates
+        self.count = count
+        self.duration = duration
+        self.offset = offset
+        # start, d and count arrays of the S elements, None for $Number$ templates
+        self.timeline = timeline
+
+    def __len__(self) -> int:
+        if self.timeline is None:
+            return self.count
+        return sum(self.timeline[2])
+
+    def __iter__(self) -> Iterator[str]:
+        for numbers, times in self._iter_ranges():
+            yield from self.template.render_segments(numbers, times)
+
+    def _iter_ranges(self) -> Iterator[Tuple[range, range]]:
+        '''
+        Yields the segment numbers and times of every run of segments
+        '''
+        if self.timeline is None:
+            end = self.offset + self.count * self.duration
+            yield (range(self.start_number, self.count + self.start_number),
+                   range(self.offset, end, self.duration) if self.duration > 0 else repeat(self.offset, self.count))
+            return
+        starts, durations, counts = self.timeline
+        # first segment number of every S element
+        numbers = accumulate(counts, initial=self.start_number)
+        for start, d, count, number in zip(starts, durations, counts, numbers):
+            yield range(number, number + count), range(start, start + count * d, d)
@@ -0,0 +1,107 @@
+from functools import lru_cache
+from itertools import repeat
+from typing import Iterable, Iterator, List, Tuple, Union
+import re
+
+# 5.3.9.4.4 Template-based Segment URL construction
+# $<Identifier>[%0<width>d]$, $$ is an escaped $
+TEMPLATE_TOKEN = re.compile(r"\$(RepresentationID|Number|Bandwidth|Time|SubNumber)(?:%0(\d+)d)?\$|\$\$")
+
+
+class SegmentURLTemplate(object):
+    '''
+    SegmentTemplate@media/@initialization parsed once into literal and
+    placeholder parts, and compiled to a printf-style pattern so a url is
+    rendered with a single formatting operation.
+    '''
+    __slots__ = ("parts", "pattern", "identifiers")
+
+    def __init__(self, parts: List[Union[str, Tuple[str, int]]]):
+        # literals are str, placeholders are (identifier, width) pairs
+        self.parts = parts
+        self.pattern = "".join(self._compile_part(part) for part in parts)
+        self.identifiers = tuple(part[0] for part in parts if isinstance(part, tuple))
+
+    @classmethod
+    def parse(cls, template: str) -> "SegmentURLTemplate":
+        parts = []
+        position = 0
+        for match in TEMPLATE_TOKEN.finditer(template):
+            parts.append(template[position:match.start()])
+            if match.group(1) is None:
+                parts.append("$")
+            else:
+                width = match.group(2)
+                parts.append((match.group(1), 0 if width is None else int(width)))
+            position = match.end()
+        parts.append(template[position:])
+        return cls(cls._merge([part for part in parts if part != ""]))
+
+    def bind(self, **values) -> "SegmentURLTemplate":
+        '''
+        Substitutes the identifiers that are the same for every segment
+        (RepresentationID, Bandwidth). Identifiers bound to None are kept as
+        they were written.
+        '''
+        parts = []
+        for part in self.parts:
+            if isinstance(part, tuple) and part[0] in values:
+                value = values[part[0]]
+                if value is None:
+                    part = f"${part[0]}$"
+                elif isinstance(value, int):
+                    part = self._compile_part(part) % value
+                else:
+                    part = str(value)
+            parts.append(part)
+        return SegmentURLTemplate(self._merge(parts))
+
+    @property
+    def source(self) -> str:
+        '''
+        The template as written in a manifest
+        '''
+        return "".join(
+            part.replace("$", "$$") if isinstance(part, str) else
+            f"${part[0]}$" if part[1] == 0 else f"${part[0]}%0{part[1]}d$"
+            for part in self.parts)
+
+    def render(self, **values) -> str:
+        return self.pattern % tuple(values[identifier] for identifier in self.identifiers)
+
+    def render_segments(self, numbers: range, times: Iterable[int]) -> Iterator[str]:
+        '''
+        Renders the urls of a run of segments. Identifiers other than
+        Number, Time and SubNumber must have been bound.
+        '''
+        if len(self.identifiers) == 0:
+            return repeat(self.pattern, len(numbers))
+        values = {"Number": numbers, "Time": times, "SubNumber": repeat(1, len(numbers))}
+        return map(self.pattern.__mod__, zip(*[values[x] for x in self.identifiers]))
+
+    @staticmethod
+    def _compile_part(part: Union[str, Tuple[str, int]]) -> str:
+        if isinstance(part, str):
+            return part.replace("%", "%%")
+        identifier, width = part
+        if identifier == "RepresentationID":
+            return "%s"
+        if width == 0:
+            return "%d"
+        return "%%0%dd" % width
+
+    @staticmethod
+    def _merge(parts: List[Union[str, Tuple[str, int]]]) -> List[Union[str, Tuple[str, int]]]:
+        merged = []
+        for part in parts:
+            if isinstance(part, str) and len(merged) > 0 and isinstance(merged[-1], str):
+                merged[-1] += part
+            else:
+                merged.append(part)
+        return merged
+
+
+@lru_cache(maxsize=256)
+def compile_template(template: str) -> SegmentURLTemplate:
+    # the same SegmentTemplate is shared by every Representation of an AdaptationSet
+    return SegmentURLTemplate.parse(template)
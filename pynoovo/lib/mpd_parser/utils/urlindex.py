@@ -0,0 +1,139 @@
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Union
+import mmap
+import struct
+import sys
+
+# header: magic, url count, track count, offset of the index
+# data:   the utf-8 urls back to back
+# index:  url_count + 1 offsets into the data, then for each track
+#         its first url, url count and utf-8 key
+MAGIC = b"MPDURLS1"
+HEADER = struct.Struct("<8sQQQ")
+OFFSET = struct.Struct("<Q")
+TRACK = struct.Struct("<QQH")
+BUFFER_SIZE = 1 << 20
+
+
+def write_url_list(path: Union[str, Path], urls: Iterable[str]) -> int:
+    '''
+    Writes one url per line without joining them in memory first
+
+    Returns:
+        int: number of urls written
+    '''
+    count = 0
+    with open(path, "w", encoding="utf-8", newline="\n", buffering=BUFFER_SIZE) as f:
+        for url in urls:
+            f.write(url)
+            f.write("\n")
+            count += 1
+    return count
+
+
+class URLIndexWriter(object):
+    '''
+    Streams the urls of one or several tracks to an indexed binary file,
+    only the offsets (8 bytes per url) are kept in memory.
+    '''
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self.file = open(self.path, "wb", buffering=BUFFER_SIZE)
+        self.file.write(HEADER.pack(MAGIC, 0, 0, 0))
+        self.position = HEADER.size
+        self.offsets = array("Q")
+        self.tracks = []  # (key, start, count)
+
+    def add_track(self, key: str, urls: Iterable[str]) -> int:
+        start = len(self.offsets)
+        write = self.file.write
+        offsets = self.offsets
+        position = self.position
+        for url in urls:
+            data = url.encode("utf-8")
+            offsets.append(position)
+            write(data)
+            position += len(data)
+        self.position = position
+        count = len(self.offsets) - start
+        self.tracks.append((key, start, count))
+        return count
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.offsets.append(self.position)
+        if sys.byteorder != "little":
+            self.offsets.byteswap()
+        self.offsets.tofile(self.file)
+        for key, start, count in self.tracks:
+            data = key.encode("utf-8")
+            self.file.write(TRACK.pack(start, count, len(data)))
+            self.file.write(data)
+        self.file.seek(0)
+        self.file.write(HEADER.pack(MAGIC, len(self.offsets) - 1, len(self.tracks), self.position))
+        self.file.close()
+
+    def __enter__(self) -> "URLIndexWriter":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class URLIndex(object):
+    '''
+    Memory-mapped reader of a file written by URLIndexWriter, a url is
+    looked up without reading the others:
+
+        index = URLIndex(path)
+        url = index[index.track(key)[n]]
+    '''
+    def __init__(self, path: Union[str, Path]):
+        with open(path, "rb") as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count, track_count, self.index_offset = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC:
+            self.mm.close()
+            raise ValueError(f"{path} is not an url index")
+        self.tracks: Dict[str, range] = {}
+        position = self.index_offset + (self.count + 1) * OFFSET.size
+        for _ in range(track_count):
+            start, count, size = TRACK.unpack_from(self.mm, position)
+            position += TRACK.size
+            key = self.mm[position:position + size].decode("utf-8")
+            position += size
+            self.tracks[key] = range(start, start + count)
+
+    def track(self, key: str) -> range:
+        '''
+        Returns the positions of the urls of a track
+        '''
+        return self.tracks[key]
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, n: int) -> str:
+        if n < 0:
+            n += self.count
+        if not 0 <= n < self.count:
+            raise IndexError("url index out of range")
+        position = self.index_offset + n * OFFSET.size
+        start, = OFFSET.unpack_from(self.mm, position)
+        end, = OFFSET.unpack_from(self.mm, position + OFFSET.size)
+        return self.mm[start:end].decode("utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        for n in range(self.count):
+            yield self[n]
+
+    def close(self):
+        self.mm.close()
+
+    def __enter__(self) -> "URLIndex":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
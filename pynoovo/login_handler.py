@@ -1,10 +1,11 @@
-import json, logging
+import logging
 from typing import Dict, List
 from datetime import datetime, timedelta
 import base64
 from copy import deepcopy
 
 from .common.login_handler import LoginHandler
+from .common.json_backend import response_json
 from .consts import *
 
 # Logger
@@ -110,7 +111,7 @@ class NoovoLoginHandler(LoginHandler):
                 logger.debug('Trying username/password login...')
                 base_response = self._make_login_request()
                 if base_response.status_code == 200:
-                    base_access_token = json.loads(base_response.text)['access_token']
+                    base_access_token = response_json(base_response)['access_token']
                     # generate magic token
                     magic_response = self._make_magic_request(base_access_token)
                     if magic_response.status_code == 200 or magic_response.status_code == 201:
@@ -139,7 +140,7 @@ class NoovoLoginHandler(LoginHandler):
         # Parse refresh/login response
         #===========================================================
         try:
-            response_parsed = json.loads(response.text)
+            response_parsed = response_json(response)
             self.access_token = response_parsed['access_token']
             self.refresh_token = response_parsed['refresh_token']
             self.profile_id = response_parsed['profile_id'] if 'profile_id' in response_parsed else None
@@ -147,7 +148,7 @@ class NoovoLoginHandler(LoginHandler):
             # Profile ID
             if self.profile_id is None:
                 profile_response = self._make_profile_request()
-                self.profile_id = json.loads(profile_response.text)[0]['id']
+                self.profile_id = response_json(profile_response)[0]['id']
             # Scopes
             scopes = response_parsed['scope'].split(' ')
             for scope in scopes:
@@ -1,6 +1,5 @@
 # External stuff
 from copy import copy
-import json
 import logging
 from pynoovo.common.category import Category
 
@@ -13,16 +12,22 @@ from .common.result_info import SerieResultInfo, MovieResultInfo
 from .common.search_result import SearchResult
 from .common.account import Account
 from .common.platform import Platform
+from .common.search_index import SearchIndex
 from .common.utils import format_episode_number
+from .common.json_backend import response_json
+from .common.transport import DEFAULT_TIMEOUT, DEFAULT_MAX_RETRIES
 
 # Crave stuff
 from .login_handler import NoovoLoginHandler
 from .consts import *
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, List, Tuple, Union
 
 # Internal libs
 from .lib.graphql.graphql import GraphQL
+from .common.cache import ResponseCache
+from .lib.graphql.cache import StaleWhileRevalidateCache
 from .lib.capi.capi import CAPI
+from .crawler import CatalogueCrawler, load_snapshot, save_json
 
 # Logger
 logger = logging.getLogger(__name__)
@@ -36,7 +41,7 @@ class Noovo(Platform):
     #   __init__()
     # ================================================================
 
-    def __init__(self, cache_dir: str, username: str = None, password: str = None, site: str = 'bell'):
+    def __init__(self, cache_dir: str, username: str = None, password: str = None, site: str = 'bell', max_workers: int = 8, response_cache: ResponseCache = None, disk_cache: bool = False, browse_max_age: float = None, timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT, max_retries: int = DEFAULT_MAX_RETRIES):
         '''
         Initialises the client.
             Args:
@@ -44,10 +49,25 @@ class Noovo(Platform):
                 username (str): Account username
                 password (str): Account password
                 metadata_lang (str): Language used to fetch metadata
+                max_workers (int): Maximum number of concurrent GraphQL requests
+                response_cache (ResponseCache): GraphQL response cache (None to disable, the default)
+                disk_cache (bool): Without response_cache, caches the responses in memory and in files in cache_dir
+                browse_max_age (float): Age (seconds) after which cached category trees are refreshed in the background (None to disable, the default)
+                timeout (Union[float, Tuple[float, float]]): Default (connect, read) timeouts of the HTTP requests, in seconds
+                max_retries (int): Retries of failed connections and transient HTTP errors (0 to disable)
         '''
-        super().__init__(cache_dir)
+        # Every GraphQL worker keeps its connection alive, and only the
+        # GraphQL queries are retried among the POST requests
+        super().__init__(cache_dir, pool_sizes={'api-entpay.noovo.ca': max_workers},
+                         max_retries=max_retries, timeout=timeout, retry_post_hosts=['api-entpay.noovo.ca'])
+        if response_cache is None and disk_cache:
+            response_cache = self._create_response_cache(disk_cache)
+        browse_cache = None
+        if browse_max_age is not None:
+            browse_cache = StaleWhileRevalidateCache(max_age=browse_max_age)
         self.graphql = GraphQL(self.session, 'https://api-entpay.noovo.ca/graace/graphql/',
-                               self.tag, metadata_language='fr')
+                               self.tag, metadata_language='fr', max_workers=max_workers,
+                               cache=response_cache, browse_cache=browse_cache)
         self.login_handler: NoovoLoginHandler = NoovoLoginHandler(
             self.cache_dir, self.session, username, password, site=site)
         self.account_infos: Account = None
@@ -87,6 +107,18 @@ class Noovo(Platform):
         '''
         return self.graphql.get_elements(category)
 
+    # ================================================================
+    #   get_browse_stats()
+    # ================================================================
+
+    def get_browse_stats(self) -> Dict[str, int]:
+        '''
+        Returns the category tree cache counters
+            Returns:
+                Dict[str, int]: The hits, misses, refreshes, refresh_errors and entries counters
+        '''
+        return self.graphql.get_browse_stats()
+
     # ===================================================================
     #
     #   SEARCH
@@ -108,6 +140,24 @@ class Noovo(Platform):
         logger.debug('Making a search for "{}"...'.format(input))
         return self.graphql.search(input)
 
+    # ================================================================
+    #   load_search_index()
+    # ================================================================
+
+    def load_search_index(self, snapshot: Union[str, Dict[str, Any]], max_age: float = 86400) -> None:
+        '''
+        Answers searches from a local index of a catalogue snapshot. searchMedia
+        is only used when the index misses or is older than max_age.
+            Args:
+                snapshot (Union[str, Dict[str, Any]]): The snapshot, or the file it was saved to
+                max_age (float): Age (seconds) after which the index is considered stale
+        '''
+        if isinstance(snapshot, str):
+            snapshot = load_snapshot(snapshot)
+        self.graphql.search_index = SearchIndex.from_snapshot(snapshot)
+        self.graphql.search_index_max_age = max_age
+        logger.debug('Indexed {} titles'.format(len(self.graphql.search_index)))
+
     # ===================================================================
     #
     #   RESULT INFOS
@@ -118,31 +168,76 @@ class Noovo(Platform):
     #   get_result_infos()
     # ================================================================
 
-    def get_result_infos(self, result: SearchResult) -> Dict[str, Union[MovieResultInfo, SerieResultInfo]]:
+    def get_result_infos(self, result: SearchResult, profile: str = None) -> Dict[str, Union[MovieResultInfo, SerieResultInfo]]:
         '''
         Get more infos about a specific search result
             Args:
                 result (SearchResult): The search result
+                profile (str): The query profile (minimal, playback or full), defaults to the GraphQL query_profile
             Returns:
                 Dict[str, Union[MovieResultInfo, SerieResultInfo]]: A dictionary of all the versions available (french/english) and corresponding infos
         '''
         logger.debug('Getting infos for "{}"...'.format(result.title))
-        return self.graphql.get_result_infos(result)
+        return self.graphql.get_result_infos(result, profile)
 
     # ================================================================
     #   get_result_infos_id()
     # ================================================================
 
-    def get_result_infos_id(self, content_id: str) -> Dict[str, Union[MovieResultInfo, SerieResultInfo]]:
+    def get_result_infos_id(self, content_id: str, profile: str = None) -> Dict[str, Union[MovieResultInfo, SerieResultInfo]]:
         '''
         Get more infos about a specific search result
             Args:
                 id (str): The Content ID
+                profile (str): The query profile (minimal, playback or full), defaults to the GraphQL query_profile
             Returns:
                 Dict[str, Union[MovieResultInfo, SerieResultInfo]]: A dictionary of all the versions available (french/english) and corresponding infos
         '''
         logger.debug('Getting infos for "{}"...'.format(content_id))
-        return self.graphql.get_result_infos_id(content_id)
+        return self.graphql.get_result_infos_id(content_id, profile)
+
+    # ================================================================
+    #   get_results_infos_ids()
+    # ================================================================
+
+    def get_results_infos_ids(self, content_ids: List[str], profile: str = None) -> Dict[str, Dict[str, Union[MovieResultInfo, SerieResultInfo]]]:
+        '''
+        Get more infos about several search results, in batched requests
+            Args:
+                content_ids (List[str]): The Content IDs
+                profile (str): The query profile (minimal, playback or full), defaults to the GraphQL query_profile
+            Returns:
+                Dict[str, Dict[str, Union[MovieResultInfo, SerieResultInfo]]]: The versions of each result, as returned by get_result_infos_id()
+        '''
+        logger.debug('Getting infos for {} results...'.format(len(content_ids)))
+        return self.graphql.get_results_infos_ids(content_ids, profile)
+
+    # ===================================================================
+    #
+    #   CATALOGUE
+    #
+    # ===================================================================
+
+    # ================================================================
+    #   crawl_catalogue()
+    # ================================================================
+
+    def crawl_catalogue(self, snapshot_file: str = None, checkpoint_file: str = None, max_workers: int = 8) -> Dict[str, Any]:
+        '''
+        Crawls the whole catalogue. An interrupted crawl resumes from its checkpoint.
+            Args:
+                snapshot_file (str): File where the snapshot is written (optional)
+                checkpoint_file (str): File storing the crawl progress (defaults to <cache_dir>/crawl.json)
+                max_workers (int): Maximum number of categories/titles fetched at the same time
+            Returns:
+                Dict[str, Any]: The catalogue snapshot
+        '''
+        snapshot = CatalogueCrawler(
+            self, checkpoint_file=checkpoint_file, max_workers=max_workers).crawl()
+        if snapshot_file is not None:
+            save_json(snapshot_file, snapshot)
+        self.load_search_index(snapshot, max_age=self.graphql.search_index_max_age)
+        return snapshot
 
     # ===================================================================
     #
@@ -251,7 +346,7 @@ class Noovo(Platform):
         '''
         if not self.ensure_login():
             return None
-        return CAPI.get_play_infos(destination, id, language, token=self.login_handler.access_token, filter='0x14')
+        return CAPI.get_play_infos(destination, id, language, token=self.login_handler.access_token, filter='0x14', session=self.session)
 
     # ===================================================================
     #
@@ -300,7 +395,7 @@ class Noovo(Platform):
             self.graphql.packages = self.login_handler.packages
             self.account_infos = Account()
             response = self.login_handler._make_profile_request()
-            response_parsed = json.loads(response.text)
+            response_parsed = response_json(response)
             self.account_infos.name = response_parsed[0]['nickname']
             self.account_infos.picture = response_parsed[0]['avatarUrl']
             return self.account_infos
@@ -0,0 +1,33 @@
+from pynoovo.lib.mpd_parser.batch import parse_manifest
+from pynoovo.lib.mpd_parser.utils.links import Links
+
+MANIFEST = '''<?xml version="1.0" encoding="UTF-8"?>
+<MPD xmlns="urn:mpeg:dash:schema:mpd:2011" type="static" mediaPresentationDuration="PT10S">
+  <BaseURL>https://cdn.example.com/vod/</BaseURL>
+  <Period id="p0">
+    <AdaptationSet id="1" contentType="audio" mimeType="audio/mp4" lang="fr">
+      <SegmentTemplate timescale="1000" duration="2000" initialization="$RepresentationID$/init.mp4" media="$RepresentationID$/$Number$.m4s" startNumber="1"/>
+      <Representation id="a" codecs="mp4a.40.2"/>
+      <Representation id="b" bandwidth="128000" codecs="mp4a.40.2"/>
+    </AdaptationSet>
+  </Period>
+</MPD>
+'''
+
+
+def test_summary_without_bandwidth():
+    summary = parse_manifest(('test', MANIFEST))
+    assert summary.error is None
+    tracks = {track.key: track for track in summary.tracks}
+    assert tracks['1-a-audio'].bandwidth is None
+    assert tracks['1-a-audio'].url_count == 6
+    assert tracks['1-b-audio'].bandwidth == 128000
+
+
+def test_links_without_bandwidth():
+    links = Links('test', 10.0, 'a', None, 'mp4a.40.2')
+    assert links.get_path().name == 'test-a-AAC.txt'
+    links.update(10.0, None)
+    assert links.bandwidth is None and links.duration == 20.0
+    links.update(10.0, '128000')
+    assert links.bandwidth == 128000 and links.duration == 30.0
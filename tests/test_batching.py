@@ -0,0 +1,92 @@
+import json
+import threading
+
+import pytest
+import requests
+
+from pynoovo.lib.graphql.batching import batch_alias, batch_variables, make_batch_query, split_batch_response
+from pynoovo.lib.graphql.cache import CachedResponse
+from pynoovo.lib.graphql.consts import MEDIA_PAYLOADS, SEASON_PAYLOADS, QUERY_PROFILES
+from pynoovo.lib.graphql.graphql import GraphQL
+
+QUERIES = [(payloads[profile]['query'], field, profile)
+           for payloads, field in ((MEDIA_PAYLOADS, 'axisMedia'), (SEASON_PAYLOADS, 'axisSeason'))
+           for profile in QUERY_PROFILES]
+
+
+def lookup(query, field, alias, index):
+    # returns the selection set of an aliased lookup
+    start = query.index('{}: {}(id: $id{}) '.format(alias, field, index))
+    depth, end = 0, query.index('{', start)
+    while True:
+        depth += {'{': 1, '}': -1}.get(query[end], 0)
+        if depth == 0:
+            return query[query.index('{', start):end + 1]
+        end += 1
+
+
+@pytest.mark.parametrize('query,field,profile', QUERIES)
+def test_single_lookup_is_unchanged(query, field, profile):
+    batch = make_batch_query(query, field, 1)
+    assert batch.replace('b0: ', '', 1).replace('$id0', '$id') == query
+
+
+@pytest.mark.parametrize('query,field,profile', QUERIES)
+def test_batch_query(query, field, profile):
+    count = 3
+    batch = make_batch_query(query, field, count)
+    selection = lookup(make_batch_query(query, field, 1), field, batch_alias(0), 0)
+    assert '$id: ID!' not in batch
+    assert '(id: $id)' not in batch
+    assert ', '.join('$id{}: ID!'.format(index) for index in range(count)) in batch
+    assert batch.count('{}(id: '.format(field)) == count
+    assert batch.count('{') == batch.count('}')
+    for index in range(count):
+        assert lookup(batch, field, batch_alias(index), index) == selection
+    # the fragments follow the lookups unchanged
+    fragments = query[query.index('fragment'):] if 'fragment' in query else ''
+    assert batch.endswith(fragments)
+
+
+def test_batch_variables():
+    assert batch_variables(['a', 'b']) == {'id0': 'a', 'id1': 'b'}
+
+
+def test_split_batch_response():
+    content = json.dumps({'data': {'b0': {'id': 'a'}, 'b1': None, 'b3': {'id': 'd'}}}).encode('utf-8')
+    assert split_batch_response(200, content, 4) == [{'id': 'a'}, None, None, {'id': 'd'}]
+
+
+def test_split_batch_response_without_data():
+    content = json.dumps({'data': None, 'errors': [{'message': 'error'}]}).encode('utf-8')
+    assert split_batch_response(200, content, 2) == [None, None]
+
+
+def test_split_batch_response_errors():
+    assert split_batch_response(500, b'{"data":{"b0":{}}}', 2) == [None, None]
+    assert split_batch_response(200, b'not json', 2) == [None, None]
+
+
+class FailingBatchGraphQL(GraphQL):
+    '''
+    Batch requests raise, single requests wait for each other so a serial
+    fallback would time out
+    '''
+
+    def __init__(self, singles):
+        super().__init__(None, '', '')
+        self.barrier = threading.Barrier(singles, timeout=5)
+
+    def _make_request(self, template, variables=None, playback_language='FRENCH'):
+        if 'id0' in variables:
+            raise requests.ConnectionError('connection reset')
+        self.barrier.wait()
+        episodes = [{'id': variables['id']}]
+        return CachedResponse(json.dumps({'data': {'axisSeason': {'episodes': episodes}}}).encode('utf-8'))
+
+
+def test_failed_batch_falls_back_to_concurrent_requests():
+    seasons = [(number, 'season-{}'.format(number)) for number in range(1, 5)]
+    graphql = FailingBatchGraphQL(len(seasons))
+    episodes = graphql._get_season_batch(seasons, 'fr', 'minimal')
+    assert episodes == [[{'id': season_id}] for _, season_id in seasons]
@@ -0,0 +1,69 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from pynoovo.lib.graphql.cache import StaleWhileRevalidateCache
+
+
+class Loader():
+    '''
+    Counts its calls, slow enough for concurrent misses to overlap
+    '''
+
+    def __init__(self):
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+        time.sleep(0.05)
+        return [{'id': 'category'}]
+
+    async def load_async(self):
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return [{'id': 'category'}]
+
+
+def test_concurrent_misses_share_one_load():
+    cache, loader = StaleWhileRevalidateCache(), Loader()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        values = list(executor.map(lambda _: cache.get('root', loader), range(8)))
+    assert loader.calls == 1
+    assert values == [[{'id': 'category'}]] * 8
+
+
+def test_concurrent_async_misses_share_one_load():
+    cache, loader = StaleWhileRevalidateCache(), Loader()
+
+    async def main():
+        return await asyncio.gather(*[cache.get_async('root', loader.load_async) for _ in range(8)])
+
+    values = asyncio.run(main())
+    assert loader.calls == 1
+    assert values == [[{'id': 'category'}]] * 8
+
+
+def test_values_are_deep_copies():
+    cache = StaleWhileRevalidateCache()
+    cache.get('root', lambda: [{'id': 'category'}])[0]['id'] = 'changed'
+    cache.get('root', lambda: None)[0]['id'] = 'changed'
+    assert cache.get('root', lambda: None) == [{'id': 'category'}]
+
+
+def test_async_refresh_task_is_kept_until_done():
+    cache, loader = StaleWhileRevalidateCache(max_age=0), Loader()
+
+    async def main():
+        await cache.get_async('root', loader.load_async)
+        await cache.get_async('root', loader.load_async)
+        assert len(cache._tasks) == 1
+        await asyncio.gather(*cache._tasks)
+        await asyncio.sleep(0)
+        assert not cache._tasks
+
+    asyncio.run(main())
+    assert loader.calls == 2
+    assert cache.stats()['refreshes'] == 1
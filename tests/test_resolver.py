@@ -0,0 +1,53 @@
+from urllib.parse import urljoin
+
+import pytest
+
+from pynoovo.lib.mpd_parser.mpd_content_parser import fix_url
+from pynoovo.lib.mpd_parser.utils.resolver import URLResolver, get_resolver
+
+# RFC 3986 5.4.1 and 5.4.2
+RFC_BASE = 'http://a/b/c/d;p?q'
+RFC_REFERENCES = [
+    'g:h', 'g', './g', 'g/', '/g', '//g', '?y', 'g?y', '#s', 'g#s', 'g?y#s', ';x', 'g;x',
+    'g;x?y#s', '', '.', './', '..', '../', '../g', '../..', '../../', '../../g',
+    '../../../g', '../../../../g', '/./g', '/../g', 'g.', '.g', 'g..', '..g',
+    './../g', './g/.', 'g/./h', 'g/../h', 'g;x=1/./y', 'g;x=1/../y',
+    'g?y/./x', 'g?y/../x', 'g#s/./x', 'g#s/../x',
+]
+BASES = [
+    RFC_BASE,
+    'https://cdn.example.com/a/b/manifest.mpd',
+    'https://cdn.example.com/a/b/manifest.mpd?token=1',
+    'https://cdn.example.com/a/b/',
+    'https://cdn.example.com/a/b',
+    'https://cdn.example.com',
+    'https://cdn.example.com/',
+]
+REFERENCES = ['seg.mp4', 'video/seg.mp4', '../seg.mp4', '/seg.mp4', '?v=2', '#t=1', '',
+              'https://other.example.com/seg.mp4', '//other.example.com/seg.mp4']
+
+
+@pytest.mark.parametrize('url', RFC_REFERENCES)
+def test_rfc_examples(url):
+    assert URLResolver(RFC_BASE).resolve(url) == urljoin(RFC_BASE, url)
+
+
+@pytest.mark.parametrize('base', BASES)
+@pytest.mark.parametrize('url', REFERENCES)
+def test_matches_urljoin(base, url):
+    assert URLResolver(base).resolve(url) == urljoin(base, url)
+
+
+def test_base_path_is_merged_up_to_its_last_segment():
+    assert URLResolver('https://cdn.x/a/b/manifest.mpd').resolve('seg.mp4') == 'https://cdn.x/a/b/seg.mp4'
+    assert URLResolver('https://cdn.x/a/b').resolve('seg.mp4') == 'https://cdn.x/a/seg.mp4'
+
+
+def test_nested_base():
+    resolver = get_resolver('https://cdn.x/vod/manifest.mpd').join('video/').join('720p/')
+    assert resolver.resolve('seg.mp4') == 'https://cdn.x/vod/video/720p/seg.mp4'
+
+
+def test_fix_url_base_is_a_directory():
+    assert fix_url('https://cdn.x/a/b', 'seg.mp4') == 'https://cdn.x/a/b/seg.mp4'
+    assert fix_url('https://cdn.x/a/b/', 'seg.mp4') == 'https://cdn.x/a/b/seg.mp4'
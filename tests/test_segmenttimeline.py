@@ -0,0 +1,103 @@
+from pynoovo.lib.mpd_parser.mpd_content_parser import MPDPaser
+from pynoovo.lib.mpd_parser.utils.childs.segmenttimeline import SegmentTimeline
+
+MANIFEST = '''<?xml version="1.0" encoding="UTF-8"?>
+<MPD xmlns="urn:mpeg:dash:schema:mpd:2011" type="static"{mpd_duration}>
+  <BaseURL>https://cdn.example.com/vod/</BaseURL>
+  <Period id="p0" start="PT0S"{duration}>
+    <AdaptationSet id="1" contentType="video" mimeType="video/mp4">
+      <SegmentTemplate timescale="10" initialization="$RepresentationID$/init.mp4" media="$RepresentationID$/$Time$.m4s">
+        <SegmentTimeline>
+          <S t="0" d="20" r="-1"/>
+          <S t="100" d="20" r="1"/>
+          <S d="30" r="-1"/>
+        </SegmentTimeline>
+      </SegmentTemplate>
+      <Representation id="v" bandwidth="1000000" codecs="avc1.640028" width="1280" height="720"/>
+    </AdaptationSet>
+  </Period>
+</MPD>
+'''
+
+
+def make_timeline(*elements):
+    timeline = SegmentTimeline('SegmentTimeline')
+    for attrs in elements:
+        timeline.add_s(attrs)
+    return timeline
+
+
+def parse_tracks(duration=None, mpd_duration=None, periods=1):
+    def attribute(name, value):
+        return '' if value is None else ' {}="{}"'.format(name, value)
+
+    manifest = MANIFEST.format(duration=attribute('duration', duration),
+                               mpd_duration=attribute('mediaPresentationDuration', mpd_duration))
+    if periods > 1:
+        start, end = manifest.index('  <Period'), manifest.index('</MPD>')
+        manifest = manifest[:start] + manifest[start:end] * periods + manifest[end:]
+    parser = MPDPaser('test', manifest, False)
+    parser.work()
+    return parser.parse('')
+
+
+def parse(duration=None, mpd_duration=None):
+    tracks = parse_tracks(duration, mpd_duration)
+    assert len(tracks) == 1
+    return [url.rsplit('/', 1)[-1] for url in list(tracks.values())[0].urls]
+
+
+def test_negative_repeat_until_next_time_and_period_end():
+    starts, durations, counts = make_timeline(
+        {'t': '0', 'd': '20', 'r': '-1'}, {'t': '100', 'd': '20', 'r': '1'}, {'d': '30', 'r': '-1'}).expand(200)
+    assert list(starts) == [0, 100, 140]
+    assert list(durations) == [20, 20, 30]
+    assert list(counts) == [5, 2, 2]
+
+
+def test_negative_repeat_without_end():
+    _, _, counts = make_timeline({'t': '0', 'd': '20', 'r': '-1'}, {'d': '30', 'r': '-1'}).expand(None)
+    assert list(counts) == [0, 0]
+
+
+def test_negative_repeat_zero_duration():
+    _, _, counts = make_timeline({'t': '0', 'd': '0', 'r': '-1'}, {'t': '50', 'd': '10'}).expand(100)
+    assert list(counts) == [0, 1]
+
+
+def test_manifest_with_period_duration():
+    urls = parse('PT20S')
+    assert urls[0] == 'init.mp4'
+    assert urls[1:] == ['0.m4s', '20.m4s', '40.m4s', '60.m4s', '80.m4s',
+                        '100.m4s', '120.m4s', '140.m4s', '170.m4s']
+
+
+def test_manifest_without_period_duration():
+    # the trailing negative S@r has no end, the other elements are still listed
+    assert parse()[1:] == ['0.m4s', '20.m4s', '40.m4s', '60.m4s', '80.m4s', '100.m4s', '120.m4s']
+
+
+def test_manifest_with_invalid_period_duration():
+    assert parse('bogus')[1:] == ['0.m4s', '20.m4s', '40.m4s', '60.m4s', '80.m4s', '100.m4s', '120.m4s']
+
+
+def test_manifest_with_zero_period_duration():
+    assert parse('PT0S') == parse()
+
+
+def test_period_without_duration_uses_presentation_duration():
+    assert parse(mpd_duration='PT20S') == parse('PT20S')
+
+
+def test_period_without_duration_has_unknown_duration():
+    tracks = parse_tracks()
+    assert list(tracks.values())[0].duration is None
+
+
+def test_periods_without_duration_are_merged():
+    tracks = parse_tracks(periods=2)
+    assert len(tracks) == 1
+    links = list(tracks.values())[0]
+    assert links.duration is None
+    assert links.bandwidth == 1000000
+    assert len(links.urls) == 1 + 2 * 7